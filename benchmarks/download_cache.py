@@ -0,0 +1,173 @@
+"""
+Benchmark of the download cache against a local HTTP server standing in for
+the database.
+
+Run with:
+    python benchmarks/download_cache.py -- [options]
+    blender --background --factory-startup --python-exit-code 1 --python benchmarks/download_cache.py -- [options]
+
+The cache only uses the standard library and is loaded from its file, so
+Blender is not required. The server sends ETag and Last-Modified headers,
+answers conditional requests with 304 Not Modified and is throttled to a
+given bandwidth. Times a cold download, a revalidation of an unchanged file,
+a download after the file changed on the server, a URL without file suffix
+and the offline fallback once the server is stopped. Also checks the
+eviction of the least recently used files. Every check failing exits with
+code 1.
+
+Options:
+    --size FLOAT        Size of the served file in MB. Default: 20
+    --rate FLOAT        Bandwidth of the server in MB/s, 0 for unlimited. Default: 50
+"""
+
+import argparse
+import importlib.util
+import sys
+import threading
+from email.utils import formatdate
+from hashlib import sha256
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter, sleep, time
+
+ROOT = Path(__file__).resolve().parent.parent
+spec = importlib.util.spec_from_file_location(
+    "cache", ROOT / "blentom" / "src" / "io" / "cache.py"
+)
+cache = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(cache)
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, rate):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.rate = rate * 2**20
+        self.files = {}
+        self.requests = {"200": 0, "304": 0}
+
+    def publish(self, path, content):
+        self.files[path] = {
+            "content": content,
+            "etag": f'"{sha256(content).hexdigest()[:16]}"',
+            "modified": formatdate(time(), usegmt=True),
+        }
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server_address[1]}{path}"
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        file = self.server.files.get(self.path)
+        if file is None:
+            self.send_error(404)
+            return
+
+        if self.headers.get("If-None-Match") == file["etag"]:
+            self.server.requests["304"] += 1
+            self.send_response(304)
+            self.send_header("ETag", file["etag"])
+            self.end_headers()
+            return
+
+        self.server.requests["200"] += 1
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(file["content"])))
+        self.send_header("ETag", file["etag"])
+        self.send_header("Last-Modified", file["modified"])
+        self.end_headers()
+        chunk = 2**16
+        for start in range(0, len(file["content"]), chunk):
+            self.wfile.write(file["content"][start : start + chunk])
+            if self.server.rate:
+                sleep(chunk / self.server.rate)
+
+    def log_message(self, *args):
+        pass
+
+
+def content(size, seed):
+    line = f" {seed:>12.5E}" * 6 + "\n"
+    return ("blentom\n benchmark\n" + line * int(size * 2**20 / len(line))).encode()
+
+
+def timed(function):
+    start = perf_counter()
+    result = function()
+    return perf_counter() - start, result
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="download_cache.py")
+    parser.add_argument("--size", type=float, default=20)
+    parser.add_argument("--rate", type=float, default=50)
+    args = parser.parse_args(argv)
+
+    server = Server(args.rate)
+    server.publish("/cubefiles/orbital.cube", content(args.size, 1))
+    server.publish("/download?id=7", content(args.size / 10, 2))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = server.url("/cubefiles/orbital.cube")
+
+    failed = []
+
+    def check(condition, message):
+        if not condition:
+            failed.append(message)
+
+    with TemporaryDirectory() as directory:
+        downloads = cache.DownloadCache(directory)
+
+        elapsed, path = timed(lambda: downloads.get(url))
+        print(f"{'cold download':<24}{elapsed:>9.3f}s")
+        check(
+            path.read_bytes() == server.files["/cubefiles/orbital.cube"]["content"],
+            "content differs",
+        )
+        check(path.suffix == ".cube", "suffix of the cached file lost")
+
+        elapsed, _ = timed(lambda: downloads.get(url))
+        print(f"{'revalidation (304)':<24}{elapsed:>9.3f}s")
+        check(server.requests["304"] == 1, "unchanged file downloaded again")
+
+        server.publish("/cubefiles/orbital.cube", content(args.size, 3))
+        elapsed, path = timed(lambda: downloads.get(url))
+        print(f"{'changed on server':<24}{elapsed:>9.3f}s")
+        check(
+            path.read_bytes() == server.files["/cubefiles/orbital.cube"]["content"],
+            "changed file not downloaded",
+        )
+
+        elapsed, path = timed(lambda: downloads.get(server.url("/download?id=7")))
+        print(f"{'URL without suffix':<24}{elapsed:>9.3f}s")
+        check(path.is_file(), "file of a URL without suffix missing")
+
+        server.shutdown()
+        server.server_close()
+        elapsed, path = timed(lambda: downloads.get(url, timeout=1))
+        print(f"{'offline fallback':<24}{elapsed:>9.3f}s")
+        check(path.is_file(), "no offline fallback")
+
+        # Only the most recently used file fits
+        limited = cache.DownloadCache(directory, max_size=args.size * 1.05)
+        limited.get(url)
+        check(url in limited, "most recently used file evicted")
+        check(
+            server.url("/download?id=7") not in limited, "least recently used file kept"
+        )
+        print(f"{'cache size':<24}{limited.size / 2**20:>8.1f}MB")
+
+    print(
+        f"requests: {server.requests['200']} downloads, {server.requests['304']} not modified"
+    )
+    for message in failed:
+        print(f"FAILED: {message}")
+
+    return int(bool(failed))
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []))
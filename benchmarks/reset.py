@@ -0,0 +1,117 @@
+"""
+Benchmark of the scene reset.
+
+Run with:
+    blender --background --factory-startup --python-exit-code 1 --python benchmarks/reset.py -- [options]
+
+Builds a synthetic scene resembling an imported structure (mesh objects with
+their own meshes and materials, hidden empties, bond node groups, curves and
+collections) and times `reset()` against the previous implementation, which
+removed the data one by one. Also reports the data left behind by both.
+
+Options:
+    --objects INT       Number of mesh objects in the scene. Default: 10000
+    --repeat INT        Number of repetitions, the fastest is kept. Default: 3
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from time import perf_counter
+
+import bpy
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from blentom import reset  # noqa: E402
+from blentom.src.utils.lib import reset_blender, reset_frame, set_mode  # noqa: E402
+
+KINDS = ("objects", "meshes", "materials", "collections", "node_groups", "curves")
+
+
+def legacy_reset():
+    # The implementation before batch removal, kept for comparison
+    for object in bpy.data.objects:
+        if object.type == "CAMERA" and object.name != "Camera":
+            bpy.data.objects.remove(object)
+
+    set_mode("OBJECT")
+    bpy.ops.object.select_all(action="DESELECT")
+    for object in bpy.context.scene.objects:
+        if object.type == "MESH":
+            bpy.data.objects.remove(object)
+    for mesh in bpy.data.meshes:
+        bpy.data.meshes.remove(mesh)
+
+    for collection in bpy.data.collections:
+        if collection.name != "Collection":
+            bpy.data.collections.remove(collection)
+    reset_frame()
+    for material in bpy.data.materials:
+        bpy.data.materials.remove(material)
+
+    reset_blender()
+
+
+def build_scene(count):
+    collection = bpy.data.collections.new("Atoms")
+    bpy.context.scene.collection.children.link(collection)
+    materials = [bpy.data.materials.new(f"Material {i}") for i in range(20)]
+
+    for i in range(count):
+        mesh = bpy.data.meshes.new(f"Mesh {i}")
+        mesh.from_pydata([(0, 0, 0), (1, 0, 0), (0, 1, 0)], [], [(0, 1, 2)])
+        mesh.materials.append(materials[i % len(materials)])
+        object = bpy.data.objects.new(f"Object {i}", mesh)
+        collection.objects.link(object)
+        if i % 2:
+            # Per-bond node group as created by older versions
+            modifier = object.modifiers.new("Bond Logic", "NODES")
+            modifier.node_group = bpy.data.node_groups.new(
+                f"Bond {i}", "GeometryNodeTree"
+            )
+
+    for i in range(count // 10):
+        # Periodic images of atoms
+        collection.objects.link(bpy.data.objects.new(f"Empty {i}", None))
+        curve = bpy.data.curves.new(f"Curve {i}", "CURVE")
+        collection.objects.link(bpy.data.objects.new(f"Curve {i}", curve))
+
+
+def counts():
+    return {kind: len(getattr(bpy.data, kind)) for kind in KINDS}
+
+
+def measure(function, count, repeat):
+    best = None
+    for _ in range(repeat):
+        build_scene(count)
+        start = perf_counter()
+        function()
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        left = counts()
+        # Start every repetition from the same state
+        reset()
+
+    return best, left
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="reset.py")
+    parser.add_argument("--objects", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    reset()
+    print(f"{'':<10}{'Time':>10}  Left behind")
+    for name, function in (("legacy", legacy_reset), ("reset", reset)):
+        elapsed, left = measure(function, args.objects, args.repeat)
+        left = ", ".join(f"{kind}: {number}" for kind, number in left.items())
+        print(f"{name:<10}{elapsed:>9.3f}s  {left}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []))
@@ -0,0 +1,175 @@
+"""
+Stage-level benchmark of the import and render pipeline.
+
+Run with:
+    blender --background --python-exit-code 1 --python benchmarks/stages.py -- [options]
+
+Every file in demo/data is timed per stage: parsing, material loading, atom
+creation, bond creation, isosurface extraction (density files only) and a
+low-sample render. The results are written as JSON and compared against a
+baseline. The exit code is 1 if any stage regressed by more than the
+threshold.
+
+Options:
+    --output FILE       Where to write the results. Default: benchmarks/results.json
+    --baseline FILE     Baseline to compare against. Default: benchmarks/baseline.json
+    --threshold FLOAT   Allowed relative slowdown per stage. Default: 0.25
+    --min-time FLOAT    Stages faster than this (seconds) are never regressions. Default: 0.05
+    --repeat INT        Number of repetitions, the fastest is kept. Default: 1
+    --quality STR       Quality preset used for rendering. Default: low
+    --update-baseline   Write the results to the baseline file as well.
+    --files FILE ...    Only benchmark these files.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+import bpy
+from ase.io import read as aread
+
+from blentom import Atom, Atoms, Camera, Material, Preset, Wavefunction, reset
+from blentom.src.utils.periodic_table import PeriodicTable
+
+ROOT = Path(__file__).parent.parent
+DATA = ROOT / "demo" / "data"
+FILES = (
+    "6y76.pdb",
+    "POSCAR",
+    "PTCDA.xyz",
+    "XDATCAR",
+    "benzene_HOMO-6.cube",
+    "fhiaims.in",
+)
+FORMATS = {"XDATCAR": "vasp-xdatcar", "fhiaims.in": "aims"}
+DENSITIES = (".cube",)
+
+
+class Timer:
+    def __init__(self):
+        self.stages = {}
+
+    def __call__(self, stage, function, *args, **kwargs):
+        start = perf_counter()
+        result = function(*args, **kwargs)
+        self.stages[stage] = perf_counter() - start
+
+        return result
+
+
+def parse(filename):
+    format = FORMATS.get(filename.name)
+    if format == "vasp-xdatcar":
+        return aread(str(filename), format=format, index=":")[0]
+
+    return aread(str(filename), format=format)
+
+
+def load_materials(structure):
+    for symbol in set(structure.get_chemical_symbols()):
+        Material(
+            f"{PeriodicTable.get(symbol).name} - {Atom._get_preset('material', symbol)}"
+        )
+
+
+def create_atoms(structure, name):
+    atoms = Atoms(name)
+    atoms.unit_cell = structure.cell[:]
+    for atom in structure:
+        atoms += Atom.ase(atom)
+
+    return atoms
+
+
+def render(quality):
+    camera = Camera()
+    camera.resolution = (256, 256)
+    with tempfile.TemporaryDirectory() as directory:
+        camera.render(Path(directory) / "render.png", quality=quality, show=False)
+
+
+def benchmark(filename, quality):
+    reset(keep_materials=False)
+    timer = Timer()
+
+    structure = timer("parse", parse, filename)
+    timer("materials", load_materials, structure)
+    atoms = timer("atoms", create_atoms, structure, filename.stem)
+    timer("bonds", atoms.create_bonds)
+    if filename.suffix in DENSITIES:
+        timer("isosurface", Wavefunction.read, str(filename))
+    timer("render", render, quality)
+
+    return timer.stages
+
+
+def compare(results, baseline, threshold, min_time):
+    regressions = []
+    for filename, stages in results.items():
+        for stage, duration in stages.items():
+            reference = baseline.get(filename, {}).get(stage)
+            if reference is None:
+                continue
+
+            change = (duration - reference) / reference if reference else 0
+            regressed = change > threshold and duration - reference > min_time
+            flag = "REGRESSION" if regressed else ""
+            print(
+                f"{filename:<24}{stage:<12}{reference:>10.3f}{duration:>10.3f}"
+                f"{change:>+10.1%}  {flag}"
+            )
+            if regressed:
+                regressions.append((filename, stage))
+
+    return regressions
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="stages.py")
+    parser.add_argument(
+        "--output", type=Path, default=ROOT / "benchmarks" / "results.json"
+    )
+    parser.add_argument(
+        "--baseline", type=Path, default=ROOT / "benchmarks" / "baseline.json"
+    )
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--min-time", type=float, default=0.05)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--quality", default="low")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--files", nargs="+", default=FILES)
+    args = parser.parse_args(argv)
+
+    Preset.preset = "default"
+    results = {}
+    for name in args.files:
+        runs = [benchmark(DATA / name, args.quality) for _ in range(args.repeat)]
+        results[name] = {stage: min(run[stage] for run in runs) for stage in runs[0]}
+        print(name, ", ".join(f"{s}: {t:.3f}s" for s, t in results[name].items()))
+
+    output = {"blender": bpy.app.version_string, "results": results}
+    args.output.write_text(json.dumps(output, indent=4))
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(output, indent=4))
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}, run with --update-baseline first.")
+        return 0
+
+    print(f"\n{'file':<24}{'stage':<12}{'baseline':>10}{'current':>10}{'change':>10}")
+    baseline = json.loads(args.baseline.read_text())["results"]
+    regressions = compare(results, baseline, args.threshold, args.min_time)
+    if regressions:
+        print(
+            f"\n{len(regressions)} stage(s) slower by more than {args.threshold:.0%}."
+        )
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []))
@@ -0,0 +1,106 @@
+"""
+Startup-time benchmark of the add-on registration.
+
+Run with:
+    blender --background --factory-startup --python-exit-code 1 --python benchmarks/startup.py -- [options]
+
+Every repetition starts a fresh Blender process, so that no module is cached,
+and times the import of blentom and its register(). Additionally reports which
+of the heavy scientific dependencies were imported during registration. They
+should only be imported on first use.
+
+Options:
+    --repeat INT        Number of fresh Blender processes. Default: 5
+    --max-time FLOAT    Exit code 1 if the fastest import and registration takes longer (seconds).
+    --strict            Exit code 1 if any heavy dependency is imported during registration.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from time import perf_counter
+
+import bpy
+
+HEAVY = ("skimage", "scipy", "ase", "_console_python", "openvdb", "pyopenvdb")
+PREFIX = "STARTUP "
+
+
+def measure():
+    before = set(sys.modules)
+    start = perf_counter()
+    import blentom
+
+    imported = perf_counter()
+    blentom.register()
+    registered = perf_counter()
+
+    loaded = sorted(name for name in set(sys.modules) - before if name in HEAVY)
+    blentom.unregister()
+
+    return {
+        "import": imported - start,
+        "register": registered - imported,
+        "total": registered - start,
+        "heavy": loaded,
+    }
+
+
+def run_child():
+    result = subprocess.run(
+        [
+            bpy.app.binary_path,
+            "--background",
+            "--factory-startup",
+            "--python",
+            str(Path(__file__).resolve()),
+            "--",
+            "--child",
+        ],
+        capture_output=True,
+        text=True,
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith(PREFIX):
+            return json.loads(line[len(PREFIX) :])
+
+    raise RuntimeError(f"Benchmark process failed:\n{result.stdout}\n{result.stderr}")
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="startup.py")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-time", type=float, default=None)
+    parser.add_argument("--strict", action="store_true")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(PREFIX + json.dumps(measure()))
+        return 0
+
+    runs = [run_child() for _ in range(args.repeat)]
+    print(f"{'run':<6}{'import':>10}{'register':>10}{'total':>10}")
+    for i, run in enumerate(runs):
+        print(
+            f"{i:<6}{run['import']:>10.3f}{run['register']:>10.3f}{run['total']:>10.3f}"
+        )
+
+    fastest = min(run["total"] for run in runs)
+    heavy = sorted(set(name for run in runs for name in run["heavy"]))
+    print(f"\nFastest: {fastest:.3f}s")
+    print(f"Heavy modules imported on registration: {', '.join(heavy) or 'none'}")
+
+    if args.max_time is not None and fastest > args.max_time:
+        print(f"Registration slower than {args.max_time:.3f}s.")
+        return 1
+    if args.strict and heavy:
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []))
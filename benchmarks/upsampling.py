@@ -0,0 +1,103 @@
+"""
+Quality versus speed of the density upsampling methods.
+
+Run with:
+    blender --background --python benchmarks/upsampling.py -- [file.cube]
+
+The non-periodic benchmark drops every second grid point of a cube file
+(default: demo/data/benzene_HOMO-6.cube) and interpolates it back onto the
+original grid. The periodic benchmark uses an analytic periodic density.
+"""
+
+import sys
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+
+from blentom.src.utils.interpolation import upsample
+from blentom.src.utils.lib import read_cube
+
+ROOT = Path(__file__).parent.parent
+METHODS = (
+    ("quintic", {"method": "quintic"}),
+    ("spline (order 3)", {"method": "spline", "order": 3}),
+    ("spline (order 5)", {"method": "spline", "order": 5}),
+    ("fft", {"method": "fft"}),
+)
+
+
+def measure(coarse, shape, reference, **kwargs):
+    start = perf_counter()
+    fine = upsample(coarse, shape, **kwargs)
+    duration = perf_counter() - start
+    error = np.abs(fine - reference) / np.abs(reference).max()
+
+    return duration, error.max(), np.sqrt(np.mean(error**2))
+
+
+def report(title, results):
+    print(f"\n{title}")
+    print(
+        f"{'method':<20}{'time [s]':>10}{'speedup':>10}{'max err':>12}{'rms err':>12}"
+    )
+    reference = results[0][1]
+    for name, duration, max_error, rms_error in results:
+        print(
+            f"{name:<20}{duration:>10.3f}{reference / duration:>10.1f}"
+            f"{max_error:>12.2e}{rms_error:>12.2e}"
+        )
+
+
+def non_periodic(filename):
+    density, *_ = read_cube(filename)
+    # Odd number of points so that the coarse grid shares the corners
+    density = density[tuple(slice(0, n - (n + 1) % 2) for n in density.shape)]
+    coarse = density[::2, ::2, ::2]
+
+    results = []
+    for name, kwargs in METHODS:
+        if kwargs["method"] == "fft":
+            continue
+        results.append((name, *measure(coarse, density.shape, density, **kwargs)))
+
+    report(
+        f"Non-periodic: {Path(filename).name} {coarse.shape} -> {density.shape}",
+        results,
+    )
+
+
+def periodic(size=40):
+    def density(n):
+        x = np.arange(n) / n
+        x, y, z = np.meshgrid(x, x, x, indexing="ij")
+        return np.exp(
+            np.cos(2 * np.pi * x) + np.sin(2 * np.pi * (y - z)) * np.cos(2 * np.pi * z)
+        )
+
+    coarse, reference = density(size), density(2 * size)
+    # Non-periodic methods get the periodic image of the first plane appended
+    # and the last plane of the result dropped
+    closed = np.pad(coarse, ((0, 1),) * 3, mode="wrap")
+    shape = (2 * size + 1,) * 3
+
+    results = []
+    for name, kwargs in METHODS:
+        if kwargs["method"] == "fft":
+            results.append(
+                (name, *measure(coarse, reference.shape, reference, **kwargs))
+            )
+        else:
+            start = perf_counter()
+            fine = upsample(closed, shape, **kwargs)[:-1, :-1, :-1]
+            duration = perf_counter() - start
+            error = np.abs(fine - reference) / np.abs(reference).max()
+            results.append((name, duration, error.max(), np.sqrt(np.mean(error**2))))
+
+    report(f"Periodic: {coarse.shape} -> {reference.shape}", results)
+
+
+if __name__ == "__main__":
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+    non_periodic(argv[0] if argv else ROOT / "demo" / "data" / "benzene_HOMO-6.cube")
+    periodic()
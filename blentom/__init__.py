@@ -6,6 +6,7 @@ from bpy.utils import register_class, unregister_class
 from .src import *  # noqa: F403
 from .src.io import *  # noqa: F403
 from .src.gui import *  # noqa: F403
+from .src.object.isosurface import register_handlers, unregister_handlers
 
 importhelper = [
     CubeImport,
@@ -56,6 +57,7 @@ def register():
         TOPBAR_MT_file_import.append(cls)  # noqa: F405
 
     Scene.item_panel_isosurfaces = CollectionProperty(type=IsosurfaceLevelItem)
+    register_handlers()
 
 
 def unregister():
@@ -69,3 +71,4 @@ def unregister():
         unregister_class(cls)
     for cls in menu_items:
         TOPBAR_MT_file_import.remove(cls)  # noqa: F405
+    unregister_handlers()
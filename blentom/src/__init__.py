@@ -11,3 +11,5 @@ __user_directory__ = Path(
 # Expose functionality
 from .object import *  # noqa: F403
 from .utils import *  # noqa: F403
+from .utils.batch import run_batch
+from .utils.render_pool import render_pool, work
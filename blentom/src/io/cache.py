@@ -0,0 +1,177 @@
+import os
+import threading
+from hashlib import sha256
+from json import dump as jdump
+from json import load as jload
+from pathlib import Path
+from time import time
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlparse
+from urllib.request import Request, urlopen
+from uuid import uuid4
+
+
+class DownloadCache:
+    """
+    Persistent on-disk cache of downloaded files keyed by their URL. Cached
+    files are revalidated with the server (ETag / Last-Modified) and only
+    downloaded again if they changed. The least recently used files are
+    removed once the cache exceeds its size limit. Only uses the standard
+    library and does not access Blender, so it can be used from any thread.
+
+    Attributes:
+        directory (Path): The directory of the cache.
+        max_size (float | None): The size limit in MB. None for no limit.
+    """
+
+    chunk_size = 2**16
+
+    def __init__(self, directory, max_size=None):
+        """
+        Opens the cache, creating its directory if necessary.
+
+        Args:
+            directory (str | Path): The directory of the cache.
+            max_size (float | None): The size limit in MB. Default: None. No limit.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self._lock = threading.Lock()
+
+    def get(self, url, progress=None, timeout=30):
+        """
+        Returns the cached file of a URL, downloading it if it is not cached
+        or changed on the server. If the server cannot be reached, the cached
+        file is used as is.
+
+        Args:
+            url (str): The URL.
+            progress (callable | None): Called as progress(received, total) while downloading. total is 0 if unknown. Default: None.
+            timeout (float): Timeout (s) of the connection. Default: 30.
+
+        Returns:
+            Path: The cached file.
+        """
+        key = self._key(url)
+        with self._lock:
+            entry = self._index().get(key)
+        path = self.directory / key
+        if entry is not None and not path.is_file():
+            entry = None
+
+        request = Request(url)
+        if entry is not None:
+            if entry.get("etag"):
+                request.add_header("If-None-Match", entry["etag"])
+            if entry.get("last_modified"):
+                request.add_header("If-Modified-Since", entry["last_modified"])
+
+        try:
+            with urlopen(request, timeout=timeout) as response:
+                size = self._download(response, path, progress)
+                entry = {
+                    "url": url,
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "size": size,
+                }
+        except HTTPError as error:
+            # 304 Not Modified
+            if error.code != 304 or entry is None:
+                raise
+        except URLError:
+            # Offline, fall back on the cached file
+            if entry is None:
+                raise
+
+        entry["used"] = time()
+        with self._lock:
+            index = self._index()
+            index[key] = entry
+            self._evict(index, keep=key)
+            self._write_index(index)
+
+        return path
+
+    def __contains__(self, url):
+        return self._key(url) in self._index()
+
+    @property
+    def size(self):
+        """
+        The size of all cached files.
+
+        Returns:
+            int: The size in bytes.
+        """
+        return sum(entry["size"] for entry in self._index().values())
+
+    def clear(self):
+        """
+        Removes all cached files.
+        """
+        with self._lock:
+            for key in self._index():
+                (self.directory / key).unlink(missing_ok=True)
+            self._write_index({})
+
+    def _key(self, url):
+        # The suffix is kept since readers guess the format from it
+        suffix = Path(urlparse(url).path).suffix
+
+        return f"{sha256(url.encode()).hexdigest()}{suffix}"
+
+    def _download(self, response, path, progress):
+        """
+        Streams a response into a file.
+
+        Returns:
+            int: The size of the file in bytes.
+        """
+        total = int(response.headers.get("Content-Length") or 0)
+        received = 0
+        # Written next to the file and moved, so no file is ever seen half written
+        temporary = self.directory / f".{uuid4().hex}.tmp"
+        try:
+            with open(temporary, "wb") as file:
+                while chunk := response.read(self.chunk_size):
+                    file.write(chunk)
+                    received += len(chunk)
+                    if progress is not None:
+                        progress(received, total)
+            os.replace(temporary, path)
+        finally:
+            temporary.unlink(missing_ok=True)
+
+        return received
+
+    def _evict(self, index, keep=None):
+        """
+        Removes the least recently used files until the cache fits its size
+        limit. The file 'keep' is never removed.
+        """
+        if self.max_size is None:
+            return
+
+        size = sum(entry["size"] for entry in index.values())
+        for key in sorted(index, key=lambda key: index[key]["used"]):
+            if size <= self.max_size * 2**20:
+                break
+            if key == keep:
+                continue
+            (self.directory / key).unlink(missing_ok=True)
+            size -= index.pop(key)["size"]
+
+    def _index(self):
+        try:
+            with open(self.directory / "index.json") as file:
+                return jload(file)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_index(self, index):
+        temporary = self.directory / f".{uuid4().hex}.tmp"
+        with open(temporary, "w") as file:
+            jdump(index, file, indent=4)
+        os.replace(temporary, self.directory / "index.json")
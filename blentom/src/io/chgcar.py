@@ -1,11 +1,20 @@
+from pathlib import Path
+
 from bpy.types import Operator
 from bpy_extras.io_utils import ImportHelper
 
-from ..object.atom import Atoms
-from ..object.isosurface import ChargeDensity
+from .modal import (
+    ModalImport,
+    create_atoms,
+    create_charge_density,
+    part,
+    part_steps,
+    prepare_atoms,
+    prepare_charge_density,
+)
 
 
-class CHGCARImport(Operator, ImportHelper):
+class CHGCARImport(ModalImport, Operator, ImportHelper):
     """
     Operator class for importing CHGCAR files.
     """
@@ -13,15 +22,28 @@ class CHGCARImport(Operator, ImportHelper):
     bl_idname = "import.chgcar"
     bl_label = "Import CHGCAR"
 
-    def execute(self, context):
+    def arguments(self):
+        return {"filename": self.filepath}
+
+    def prepare(self, progress, filename):
+        """
+        Reads the file, searches the bonds and extracts the isosurface in the
+        background.
+        """
+        atoms = prepare_atoms(part(progress, 0.0, 0.3), filename)
+        density = prepare_charge_density(
+            part(progress, 0.3, 1.0), filename, Path(filename).stem
+        )
+
+        return atoms, density
+
+    def create(self, data):
         """
-        Executes the import operation for CHGCAR files.
-        Reads the file using the Atoms and ChargeDensity classes.
-        Returns a dictionary indicating the operation is finished.
+        Creates the atoms, bonds and the isosurface.
         """
-        Atoms.read(self.filepath)
-        ChargeDensity.read(self.filepath)
-        return {"FINISHED"}
+        atoms, density = data
+        yield from part_steps(create_atoms(atoms, Path(self.filepath).stem), 0, 0.9)
+        yield from part_steps(create_charge_density(density), 0.9, 1.0)
 
 
 def menu_func_import_chgcar(self, *args, **kwargs):
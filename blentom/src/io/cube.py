@@ -1,12 +1,13 @@
+from pathlib import Path
+
 from bpy.props import StringProperty, BoolProperty, FloatProperty
 from bpy.types import Operator
 from bpy_extras.io_utils import ImportHelper
 
-from ..object.atom import Atoms
-from ..object.isosurface import Wavefunction
+from .modal import ModalImport, create_cube, prepare_cube
 
 
-class CubeImport(Operator, ImportHelper):
+class CubeImport(ModalImport, Operator, ImportHelper):
     """
     Import a Gaussian .cube file.
     """
@@ -34,7 +35,7 @@ class CubeImport(Operator, ImportHelper):
     )
     scale: FloatProperty(
         name="Interpolation",
-        description="Interpolates density onto finer grid before creating isosurface mesh. Yields better mesh results at cost of loading times. Rendering performance not changed due to remesh modifier. Set to 1 to disable.",
+        description="Interpolates density onto finer grid before creating isosurface mesh. Yields better mesh results at cost of loading times. Rendering performance not changed as the mesh is decimated to the triangle budget. Set to 1 to disable.",
         precision=1,
         min=1,
         max=5,
@@ -42,6 +43,11 @@ class CubeImport(Operator, ImportHelper):
         step=0.5,
         default=2,
     )
+    adaptive: BoolProperty(
+        name="Adaptive",
+        description="Only interpolate the density around the isosurface. Faster for large interpolation factors.",
+        default=False,
+    )
     level: FloatProperty(
         name="Level",
         description="Isovalue.",
@@ -52,22 +58,33 @@ class CubeImport(Operator, ImportHelper):
         default=0.1,
     )
 
-    def execute(self, _):
+    def arguments(self):
+        density = {"level": self.level}
+        if self.scale != 1:
+            density.update(scale=self.scale, adaptive=self.adaptive)
+
+        return {
+            "filename": self.filepath,
+            "load_atoms": self.load_atoms,
+            "density": density if self.load_density else None,
+        }
+
+    def prepare(self, progress, filename, load_atoms, density):
         """
-        Executes the import operation for .cube files.
-        Reads the file using the Atoms and Wavefunction classes.
-        Returns a dictionary indicating the operation is finished.
+        Reads the file, searches the bonds and extracts the isosurfaces in the
+        background.
         """
-        if self.load_atoms:
-            Atoms.read(self.filepath, double_bonds=self.show_double_bonds)
-
-        if self.load_density:
-            if self.scale != 1:
-                Wavefunction.read(self.filepath, scale=self.scale, level=self.level)
-            else:
-                Wavefunction.read(self.filepath, level=self.level)
+        return prepare_cube(
+            progress, filename, Path(filename).stem, load_atoms, density
+        )
 
-        return {"FINISHED"}
+    def create(self, data):
+        """
+        Creates the atoms, bonds and isosurfaces.
+        """
+        yield from create_cube(
+            data, Path(self.filepath).stem, double_bonds=self.show_double_bonds
+        )
 
     def draw(self, context):
         layout = self.layout
@@ -83,6 +100,7 @@ class CubeImport(Operator, ImportHelper):
         box = self.layout.box()
         box.prop(self, "load_density", text="Load", toggle=False)
         box.prop(self, "scale")
+        box.prop(self, "adaptive")
         box.prop(self, "level")
 
 
@@ -1,16 +1,16 @@
-from os import unlink
-from urllib import request
-from tempfile import NamedTemporaryFile
+from pathlib import Path
+from tempfile import gettempdir
 
 import bpy
 from bpy.types import Operator
 from bpy.props import StringProperty, BoolProperty, FloatProperty
 
-from ..object.atom import Atoms
-from ..object.isosurface import Wavefunction
+from .cache import DownloadCache
+from .modal import ModalImport, create_cube, part, prepare_cube
+from ..utils.preset import Preset
 
 
-class DatabaseImport(Operator):
+class DatabaseImport(ModalImport, Operator):
     bl_label = "Download .cube from physikmdb.uni-graz.at"
     bl_idname = "wm.databaseimport"
 
@@ -27,7 +27,7 @@ class DatabaseImport(Operator):
     )
     scale: FloatProperty(
         name="Interpolation",
-        description="Interpolates density onto finer grid before creating isosurface mesh. Yields better mesh results at cost of loading times. Rendering performance not changed due to remesh modifier. Set to 1 to disable.",
+        description="Interpolates density onto finer grid before creating isosurface mesh. Yields better mesh results at cost of loading times. Rendering performance not changed as the mesh is decimated to the triangle budget. Set to 1 to disable.",
         precision=1,
         min=1,
         max=5,
@@ -69,40 +69,76 @@ class DatabaseImport(Operator):
                 {"ERROR"},
                 "Internet access not allowed. Change under 'Preferences -> System -> Network -> Allow Online Access'.",
             )
-        else:
-            try:
-                with request.urlopen(self.url) as response:
-                    content = response.read().decode("utf-8")
-
-                mock_file = NamedTemporaryFile(mode="w", suffix=".cube", delete=False)
-                mock_file.write(content)
-                name_start = content.find("\n") + 2
-                name_end = content.find("\n", name_start)
-
-            except Exception:
-                return {"CANCELLED"}
-
-        if self.load_atoms:
-            Atoms.read(mock_file.name, name=content[name_start:name_end], format="cube")
-
-        if self.load_density:
-            scale = self.scale if float(self.scale) != 1.0 else None
-            Wavefunction.read(
-                mock_file.name,
-                name=content[name_start:name_end],
-                format=".cube",
-                scale=scale,
-                level=self.level,
-            )
-
-        mock_file.close()
-        unlink(mock_file.name)
-        return {"FINISHED"}
+            return {"CANCELLED"}
+
+        return super().execute(context)
+
+    def arguments(self):
+        # The cached file has no suffix if the URL does not end with one
+        density = {"level": self.level, "format": ".cube"}
+        if float(self.scale) != 1.0:
+            density["scale"] = self.scale
+
+        url = self.url if "://" in self.url else f"https://{self.url}"
+        return {
+            "url": url,
+            "cache": DownloadCache(
+                cache_directory(), max_size=Preset.get("download.cache_size")
+            ),
+            "load_atoms": self.load_atoms,
+            "density": density if self.load_density else None,
+        }
+
+    def prepare(self, progress, url, cache, load_atoms, density):
+        """
+        Downloads the file (or revalidates the cached one), searches the bonds
+        and extracts the isosurfaces in the background.
+        """
+        download = part(progress, 0.0, 0.1)
+        filename = cache.get(
+            url,
+            progress=lambda received, total: download(
+                received / total if total else 0.0,
+                f"Downloading {received / 2**20:.1f} MB",
+            ),
+        )
+        with open(filename) as file:
+            file.readline()
+            name = file.readline()[1:].rstrip("\n")
+
+        data = prepare_cube(
+            part(progress, 0.1, 1.0), str(filename), name, load_atoms, density
+        )
+
+        return name, data
+
+    def create(self, data):
+        """
+        Creates the atoms, bonds and isosurfaces.
+        """
+        name, data = data
+        yield from create_cube(data, name)
 
     def invoke(self, context, event):
         return context.window_manager.invoke_props_dialog(self)
 
 
+def cache_directory():
+    """
+    The directory of the download cache, in the user directory of the
+    extension if available.
+
+    Returns:
+        Path: The directory.
+    """
+    package = __package__.rsplit(".src", 1)[0]
+    try:
+        return Path(bpy.utils.extension_path_user(package, path="cache", create=True))
+    except (AttributeError, ValueError):
+        # Not installed as an extension
+        return Path(gettempdir()) / "blentom_cache"
+
+
 def menu_func_import_database(self, *args, **kwargs):
     """
     Menu function for importing .cube files from the database.
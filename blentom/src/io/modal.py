@@ -0,0 +1,457 @@
+import logging
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+
+import bpy
+
+from ..object.atom import Atom, Atoms, _bond_pairs, _periodic_cell
+from ..object.isosurface import (
+    ChargeDensity,
+    Isosurface,
+    VaspIsosurface,
+    Wavefunction,
+)
+from ..utils.animation import Animation
+from ..utils.bulk import bulk_edit
+from ..utils.periodic_table import PeriodicTable
+from ..utils.preset import Preset
+
+
+class Cancelled(Exception):
+    """
+    Raised in the background thread of a modal import after it was cancelled.
+    """
+
+
+class ModalImport:
+    """
+    Mixin making an import operator modal. The file is parsed and all heavy
+    computations (bond search, marching cubes) are done in a background
+    thread, while the Blender objects are created on the main thread in
+    batches of bounded duration per timer tick. The progress and an estimate
+    of the remaining time are shown in the status bar. Esc cancels the import
+    and removes everything created so far. Every batch runs in a bulk-edit
+    session and the finished import is a single undo step, pushed by Blender
+    for the operator. Without a window, e.g. in scripts run in background
+    mode, the import runs to completion right away.
+
+    Subclasses implement:
+        arguments(): Collects the operator properties on the main thread.
+        prepare(progress, **arguments): Runs in the background thread and must
+            not access Blender. Calls progress(fraction, text), which raises
+            Cancelled once the import is cancelled. Returns the prepared data.
+        create(data): Generator creating the Blender objects on the main
+            thread. Yields (fraction, text) after every object.
+    """
+
+    bl_options = {"UNDO"}
+
+    # Duration (s) of a batch of object creations per timer tick
+    budget = 0.05
+    interval = 0.1
+
+    def arguments(self):
+        return {}
+
+    def cleanup(self):
+        """
+        Called once the import finished or was cancelled.
+        """
+
+    def execute(self, context):
+        self._job = _Job()
+        self._steps = None
+        self._timer = None
+        self._start = perf_counter()
+        self._created = _Created()
+
+        arguments = self.arguments()
+        if bpy.app.background or context.window is None:
+            # No timer events without a window
+            return self._execute_inline(context, arguments)
+
+        self._thread = threading.Thread(
+            target=self._job.run, args=(self.prepare, arguments), daemon=True
+        )
+        self._thread.start()
+
+        window_manager = context.window_manager
+        self._timer = window_manager.event_timer_add(
+            self.interval, window=context.window
+        )
+        window_manager.modal_handler_add(self)
+        window_manager.progress_begin(0, 100)
+
+        return {"RUNNING_MODAL"}
+
+    def modal(self, context, event):
+        if event.type == "ESC" and event.value == "PRESS":
+            self.report({"WARNING"}, "Import cancelled.")
+            return self._cancel(context)
+        if event.type != "TIMER":
+            return {"PASS_THROUGH"}
+
+        if self._thread.is_alive():
+            self._show(context)
+            return {"RUNNING_MODAL"}
+
+        if self._job.error is not None:
+            self.report({"ERROR"}, f"Import failed: {self._job.error}")
+            return self._cancel(context)
+
+        if self._steps is None:
+            self._steps = self.create(self._job.result)
+
+        deadline = perf_counter() + self.budget
+        try:
+            # Scoped to the batch, edits of the user in between stay undoable
+            with self._created.track(), bulk_edit(None):
+                while perf_counter() < deadline:
+                    fraction, text = next(self._steps)
+                    self._job.progress = (0.5 + 0.5 * fraction, text)
+        except StopIteration:
+            self._finish(context)
+            logging.info(f"Import done in {perf_counter() - self._start:.2f}s.")
+            return {"FINISHED"}
+        except Exception as error:
+            logging.exception("Import failed.")
+            self.report({"ERROR"}, f"Import failed: {error}")
+            return self._cancel(context)
+
+        self._show(context)
+        return {"RUNNING_MODAL"}
+
+    def _execute_inline(self, context, arguments):
+        self._job.run(self.prepare, arguments)
+        if self._job.error is None:
+            try:
+                with self._created.track(), bulk_edit(None):
+                    for _ in self.create(self._job.result):
+                        pass
+            except Exception as error:
+                logging.exception("Import failed.")
+                self._job.error = error
+
+        if self._job.error is not None:
+            self.report({"ERROR"}, f"Import failed: {self._job.error}")
+            return self._cancel(context)
+
+        self._finish(context)
+        logging.info(f"Import done in {perf_counter() - self._start:.2f}s.")
+        return {"FINISHED"}
+
+    def cancel(self, context):
+        # Called if the modal handler is removed, e.g. on file load or quit
+        self._cancel(context)
+
+    def _show(self, context):
+        fraction, text = self._job.progress
+        context.window_manager.progress_update(int(100 * fraction))
+
+        status = f"{text}: {fraction:.0%}"
+        if fraction > 0.02:
+            elapsed = perf_counter() - self._start
+            status += f", {elapsed * (1 - fraction) / fraction:.0f}s left"
+        context.workspace.status_text_set(f"{status} (Esc to cancel)")
+
+    def _cancel(self, context):
+        # The thread cannot be interrupted inside a computation, it stops at
+        # its next progress report and its result is discarded
+        self._job.cancelled.set()
+        self._steps = None
+        self._created.remove()
+        self._finish(context)
+
+        return {"CANCELLED"}
+
+    def _finish(self, context):
+        if self._timer is not None:
+            context.window_manager.event_timer_remove(self._timer)
+            context.window_manager.progress_end()
+            context.workspace.status_text_set(None)
+            self._timer = None
+        self.cleanup()
+
+
+class _Job:
+    """
+    State shared between the operator and its background thread.
+
+    Attributes:
+        progress (tuple[float, str]): The overall progress and the current stage.
+        result (any): The return value of the preparation.
+        error (Exception | None): The exception raised by the preparation.
+        cancelled (threading.Event): Set once the import is cancelled.
+    """
+
+    def __init__(self):
+        self.progress = (0.0, "Reading")
+        self.result = None
+        self.error = None
+        self.cancelled = threading.Event()
+
+    def run(self, prepare, arguments):
+        try:
+            self.result = prepare(self.report, **arguments)
+        except Cancelled:
+            pass
+        except Exception as error:
+            logging.exception("Import failed.")
+            self.error = error
+
+    def report(self, fraction, text):
+        if self.cancelled.is_set():
+            raise Cancelled()
+        # The preparation is the first half of the progress
+        self.progress = (0.5 * fraction, text)
+
+
+class _Created:
+    """
+    Everything the batches of an import created. Objects the user creates
+    between two batches are not part of it and survive a cancellation.
+
+    Attributes:
+        ids (list[bpy.types.ID]): The created objects, meshes and collections.
+        atoms (list[Atom]): The created entries of the atom registry.
+        isosurfaces (list[Isosurface]): The created entries of the isosurface registry.
+    """
+
+    kinds = ("objects", "meshes", "collections")
+
+    def __init__(self):
+        self.ids = []
+        self.atoms = []
+        self.isosurfaces = []
+
+    @contextmanager
+    def track(self):
+        """
+        Records what is created inside the context. The batches run on the
+        main thread, so the user cannot create anything meanwhile.
+        """
+        before = {kind: set(getattr(bpy.data, kind)) for kind in self.kinds}
+        atoms, isosurfaces = len(Atom._atoms), len(Isosurface.items)
+        try:
+            yield
+        finally:
+            for kind, ids in before.items():
+                self.ids.extend(
+                    block for block in getattr(bpy.data, kind) if block not in ids
+                )
+            self.atoms.extend(Atom._atoms[atoms:])
+            self.isosurfaces.extend(Isosurface.items[isosurfaces:])
+
+    def remove(self):
+        """
+        Removes everything recorded that still exists.
+        """
+        ids = []
+        for block in self.ids:
+            try:
+                block.name
+            except ReferenceError:
+                # Already deleted by the user
+                continue
+            ids.append(block)
+        bpy.data.batch_remove(ids)
+
+        atoms = {id(atom) for atom in self.atoms}
+        Atom._atoms[:] = [atom for atom in Atom._atoms if id(atom) not in atoms]
+        isosurfaces = {id(item) for item in self.isosurfaces}
+        Isosurface.items[:] = [
+            item for item in Isosurface.items if id(item) not in isosurfaces
+        ]
+        self.ids, self.atoms, self.isosurfaces = [], [], []
+
+
+def part(progress, start, end):
+    """
+    Maps the progress of a part of the preparation onto [start, end].
+    """
+    return lambda fraction, text: progress(start + (end - start) * fraction, text)
+
+
+def part_steps(steps, start, end):
+    """
+    Maps the progress of a part of the creation onto [start, end].
+    """
+    for fraction, text in steps:
+        yield start + (end - start) * fraction, text
+
+
+def prepare_atoms(progress, filename, format=None):
+    """
+    Parses a structure and searches its bonds.
+
+    Args:
+        progress (callable): Reports the progress of the preparation.
+        filename (str): The path to the file.
+        format (str | None): The file format. Default: None. Guess format.
+
+    Returns:
+        dict: The frames, whether they form a trajectory and the bonded pairs.
+    """
+    progress(0.0, "Reading structure")
+    frames, trajectory = Atoms._parse(filename, format)
+
+    progress(0.5, "Searching bonds")
+    structure = frames[0]
+    symbols = structure.get_chemical_symbols()
+    pairs = _bond_pairs(
+        structure.positions,
+        [PeriodicTable.get(symbol).covalent_radius for symbol in symbols],
+        symbols,
+        cell=_periodic_cell(structure.cell[:]),
+    )
+
+    return {"frames": frames, "trajectory": trajectory, "pairs": pairs}
+
+
+def create_atoms(data, name, double_bonds=False):
+    """
+    Creates the atoms, bonds and keyframes prepared by `prepare_atoms`.
+
+    Args:
+        data (dict): The prepared structure.
+        name (str): The name of the atoms collection.
+        double_bonds (bool): Whether to display double and triple bonds.
+
+    Yields:
+        tuple[float, str]: The progress and the current stage.
+    """
+    frames, pairs = data["frames"], data["pairs"]
+    keyframes = frames if data["trajectory"] else []
+    total = len(frames[0]) + len(pairs) + len(keyframes)
+
+    atoms = Atoms(name)
+    atoms.unit_cell = frames[0].cell[:]
+    for i, atom in enumerate(frames[0]):
+        atoms += Atom.ase(atom)
+        yield (i + 1) / total, "Creating atoms"
+
+    created = list(atoms.get("all"))
+    for i, (a, b, shift) in enumerate(pairs):
+        atoms._add_bond(created[a], created[b], shift, double_bonds=double_bonds)
+        yield (len(created) + i + 1) / total, "Creating bonds"
+
+    multiplier = Preset.get("animation.frame_multiplier")
+    for i, frame in enumerate(keyframes):
+        Animation().current_frame = i * multiplier
+        atoms.insert_keyframe(frame.positions)
+        yield (total - len(keyframes) + i + 1) / total, "Inserting keyframes"
+    if keyframes:
+        Animation().final_frame = (len(keyframes) - 1) * multiplier
+
+
+def prepare_wavefunction(progress, filename, name, **kwargs):
+    """
+    Extracts the positive and negative isosurfaces of a .cube file.
+
+    Args:
+        progress (callable): Reports the progress of the preparation.
+        filename (str): The path to the file.
+        name (str): The name of the wavefunction.
+        **kwargs: Arguments of `Isosurface.read`.
+
+    Returns:
+        list[tuple]: The isosurfaces and their vertices and faces.
+    """
+    progress(0.0, "Reading density")
+
+    return Wavefunction._extract(
+        filename,
+        name,
+        progress=lambda fraction: progress(fraction, "Extracting isosurfaces"),
+        **kwargs,
+    )
+
+
+def create_wavefunction(surfaces, name):
+    """
+    Creates the wavefunction prepared by `prepare_wavefunction`.
+
+    Yields:
+        tuple[float, str]: The progress and the current stage.
+    """
+    isosurfaces = []
+    for i, (isosurface, surface) in enumerate(surfaces):
+        isosurface.blender_object = isosurface._create_mesh(surface)
+        isosurfaces.append(Isosurface(isosurface))
+        yield (i + 1) / (len(surfaces) + 1), "Creating isosurfaces"
+
+    Wavefunction._from_isosurfaces(name, *isosurfaces)
+    yield 1.0, "Creating isosurfaces"
+
+
+def prepare_charge_density(progress, filename, name, **kwargs):
+    """
+    Extracts the isosurface of a CHGCAR file.
+
+    Returns:
+        tuple: The isosurface and its vertices and faces.
+    """
+    progress(0.0, "Reading density")
+    isosurface = VaspIsosurface(filename, name, create=False, **kwargs)
+
+    return isosurface, isosurface.compute(
+        lambda fraction: progress(fraction, "Extracting isosurface")
+    )
+
+
+def create_charge_density(data):
+    """
+    Creates the charge density prepared by `prepare_charge_density`.
+
+    Yields:
+        tuple[float, str]: The progress and the current stage.
+    """
+    isosurface, surface = data
+    isosurface.blender_object = isosurface._create_mesh(surface)
+    ChargeDensity._from_isosurface(Isosurface(isosurface))
+    yield 1.0, "Creating isosurface"
+
+
+def prepare_cube(progress, filename, name, load_atoms=True, density=None):
+    """
+    Prepares the structure and the wavefunction of a .cube file.
+
+    Args:
+        progress (callable): Reports the progress of the preparation.
+        filename (str): The path to the file.
+        name (str): The name of the wavefunction.
+        load_atoms (bool): Whether to prepare the structure.
+        density (dict | None): Arguments of `CubeIsosurface` or None to skip the wavefunction.
+
+    Returns:
+        tuple: The prepared structure and isosurfaces, None if skipped.
+    """
+    atoms, surfaces = None, None
+    if load_atoms:
+        end = 0.2 if density is not None else 1.0
+        atoms = prepare_atoms(part(progress, 0.0, end), filename, format="cube")
+    if density is not None:
+        start = 0.2 if load_atoms else 0.0
+        surfaces = prepare_wavefunction(
+            part(progress, start, 1.0), filename, name, **density
+        )
+
+    return atoms, surfaces
+
+
+def create_cube(data, name, double_bonds=False):
+    """
+    Creates the structure and the wavefunction prepared by `prepare_cube`.
+
+    Yields:
+        tuple[float, str]: The progress and the current stage.
+    """
+    atoms, surfaces = data
+    if atoms is not None:
+        end = 0.9 if surfaces is not None else 1.0
+        steps = create_atoms(atoms, name, double_bonds=double_bonds)
+        yield from part_steps(steps, 0.0, end)
+    if surfaces is not None:
+        start = 0.9 if atoms is not None else 0.0
+        yield from part_steps(create_wavefunction(surfaces, name), start, 1.0)
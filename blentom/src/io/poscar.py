@@ -1,10 +1,12 @@
+from pathlib import Path
+
 from bpy.types import Operator
 from bpy_extras.io_utils import ImportHelper
 
-from ..object.atom import Atoms
+from .modal import ModalImport, create_atoms, prepare_atoms
 
 
-class POSCARImport(Operator, ImportHelper):
+class POSCARImport(ModalImport, Operator, ImportHelper):
     """
     Operator class for importing POSCAR files.
     """
@@ -12,14 +14,20 @@ class POSCARImport(Operator, ImportHelper):
     bl_idname = "import.poscar"
     bl_label = "Import POSCAR"
 
-    def execute(self, context):
+    def arguments(self):
+        return {"filename": self.filepath}
+
+    def prepare(self, progress, filename):
+        """
+        Reads the file and searches the bonds in the background.
+        """
+        return prepare_atoms(progress, filename)
+
+    def create(self, data):
         """
-        Executes the import operation for POSCAR files.
-        Reads the file using the Atoms class.
-        Returns a dictionary indicating the operation is finished.
+        Creates the atoms and bonds.
         """
-        Atoms.read(self.filepath)
-        return {"FINISHED"}
+        yield from create_atoms(data, Path(self.filepath).stem)
 
 
 def menu_func_import_poscar(self, *args, **kwar):
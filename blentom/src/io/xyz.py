@@ -1,11 +1,13 @@
+from pathlib import Path
+
 from bpy.props import StringProperty
 from bpy.types import Operator
 from bpy_extras.io_utils import ImportHelper
 
-from ..object.atom import Atoms
+from .modal import ModalImport, create_atoms, prepare_atoms
 
 
-class XYZImport(Operator, ImportHelper):
+class XYZImport(ModalImport, Operator, ImportHelper):
     """
     Operator class for importing .xyz files.
     """
@@ -17,14 +19,20 @@ class XYZImport(Operator, ImportHelper):
 
     filter_glob: StringProperty(default="*.xyz", options={"HIDDEN"}, maxlen=255)
 
-    def execute(self, context):
+    def arguments(self):
+        return {"filename": self.filepath}
+
+    def prepare(self, progress, filename):
+        """
+        Reads the file and searches the bonds in the background.
+        """
+        return prepare_atoms(progress, filename)
+
+    def create(self, data):
         """
-        Executes the import operation for .xyz files.
-        Reads the file using the Atoms class.
-        Returns a dictionary indicating the operation is finished.
+        Creates the atoms and bonds.
         """
-        Atoms.read(self.filepath)
-        return {"FINISHED"}
+        yield from create_atoms(data, Path(self.filepath).stem)
 
 
 def menu_func_import_xyz(self, *args, **kwar):
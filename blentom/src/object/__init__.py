@@ -3,7 +3,9 @@ from .asset import Asset
 from .atom import Atom, Atoms
 from .bond import Bond
 from .camera import Camera
-from .isosurface import ChargeDensity, Wavefunction
+from .isosurface import ChargeDensity, IsosurfaceSequence, Wavefunction
 from .light import Light
 from .object import Object
 from .plane import Plane
+from .points import PointAtoms
+from .volume import Volume
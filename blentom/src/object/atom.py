@@ -1,11 +1,10 @@
 import logging
-from itertools import combinations, product
+from itertools import product
 from pathlib import Path
 
 import bpy
-from ase.calculators.vasp import VaspChargeDensity
-from ase.io import read as aread
 from mathutils import Vector
+import numpy as np
 from numpy import diag, ndarray
 
 from .bond import Bond
@@ -17,6 +16,8 @@ from ..utils.material import Material
 from ..utils.periodic_table import PeriodicTable
 from ..utils.preset import Preset
 from ..utils.animation import Animation
+from ..utils.bulk import bulk_edit
+from ..utils.profiling import span
 
 
 class Atom(MeshObject):
@@ -30,6 +31,7 @@ class Atom(MeshObject):
 
     _atoms = []
 
+    @span("Atom")
     def __init__(self, element="X"):
         """
         Initializes a new instance of the Atom class.
@@ -45,12 +47,16 @@ class Atom(MeshObject):
             >>> atom = Atom("H")
         """
 
+        # Delayed import to avoid circular import
+        from ..utils.lib import uv_sphere_mesh
+
         radius = PeriodicTable.get(element).radius
-        bpy.ops.mesh.primitive_uv_sphere_add(
-            segments=Atom._get_preset("quality.segments", element),
-            ring_count=Atom._get_preset("quality.rings", element),
+        mesh = uv_sphere_mesh(
+            element,
+            Atom._get_preset("quality.segments", element),
+            Atom._get_preset("quality.rings", element),
         )
-        super().__init__()
+        super().__init__(mesh)
 
         if Atom._get_preset("quality.smooth", element):
             self.make_smooth()
@@ -165,6 +171,26 @@ class Atom(MeshObject):
             other += self
             return other
 
+    def set_resolution(self, segments, rings, subdivision):
+        """
+        Rebuilds the sphere of the atom with a different resolution.
+
+        Args:
+            segments (int): Number of segments of the uv sphere.
+            rings (int): Number of rings of the uv sphere.
+            subdivision (int): Subdivision levels of the Subsurface modifier used for rendering.
+        """
+        # Delayed import to avoid circular import
+        from ..utils.lib import uv_sphere_mesh
+
+        if len(self.blender_object.data.vertices) != segments * (rings - 1) + 2:
+            self._replace_mesh(uv_sphere_mesh(self.name, segments, rings))
+
+        modifier = self.blender_object.modifiers.get("Subsurface")
+        if modifier is not None:
+            modifier.render_levels = subdivision
+            modifier.levels = min(modifier.levels, subdivision)
+
     def delete(self):
         """
         Deletes the atom.
@@ -209,6 +235,7 @@ class Atoms(MeshObject):
         """
 
         self._atoms = []
+        self._images = {}
         self._unit_cell = None
         self.copies = []
 
@@ -219,6 +246,7 @@ class Atoms(MeshObject):
         self.collection.link(self.bonds_collection)
 
     @classmethod
+    @bulk_edit("Import atoms")
     def ase(cls, atoms, name=None, double_bonds=None):
         """
         Creates an Atoms instance from an ASE Atoms object.
@@ -247,6 +275,8 @@ class Atoms(MeshObject):
         return self
 
     @classmethod
+    @span("Atoms.read")
+    @bulk_edit("Import atoms")
     def read(cls, filename, name=None, format=None, double_bonds=False):
         """
         Reads an atoms collection from a file.
@@ -268,39 +298,108 @@ class Atoms(MeshObject):
         if name is None:
             name = filename.stem
 
+        frames, trajectory = Atoms._parse(filename, format)
+        if not trajectory:
+            return Atoms.ase(frames[0], name=name, double_bonds=double_bonds)
+
+        for frame, aux in enumerate(frames):
+            frame = frame * Preset.get("animation.frame_multiplier")
+            animation = Animation()
+            if frame == 0:
+                atoms = Atoms.ase(aux, name, double_bonds=double_bonds)
+
+            animation.current_frame = frame
+            atoms.insert_keyframe(aux.positions)
+
+        animation.final_frame = frame
+        return atoms
+
+    @classmethod
+    def _parse(cls, filename, format=None):
+        """
+        Reads the structure of a file with ASE. Does not access Blender and can
+        run outside of the main thread.
+
+        Args:
+            filename (str | Path): The path to the file.
+            format (str): The file format. Default: None. Guess format.
+
+        Returns:
+            tuple[list[ase.Atoms], bool]: The frames and whether the file is a trajectory.
+        """
+        # Delayed import to keep the registration of the add-on fast
+        from ase.calculators.vasp import VaspChargeDensity
+        from ase.io import read as aread
+
+        filename = Path(filename)
         if format is not None:
             format = format.lower()
 
-        if (
-            filename.stem == "CHGCAR"
-            or format in ("chgcar", "parchg")
-            or filename.suffix == ".vasp"
-        ):
-            atoms = VaspChargeDensity(str(filename)).atoms[-1]
-            return Atoms.ase(atoms, name, double_bonds=double_bonds)
-        elif (
-            filename.stem in ("XDATCAR")
-            or format == "vasp-xdatcar"
-            or filename.suffix == ".traj"
-        ):
-            format = "" if filename.suffix == ".traj" else "vasp-xdatcar"
-            for frame, aux in enumerate(aread(str(filename), format=format, index=":")):
-                frame = frame * Preset.get("animation.frame_multiplier")
-                animation = Animation()
-                if frame == 0:
-                    atoms = Atoms.ase(aux, name, double_bonds=double_bonds)
-
-                animation.current_frame = frame
-                atoms.insert_keyframe(aux.positions)
-
-            animation.final_frame = frame
-            return atoms
+        with span("parse"):
+            if (
+                filename.stem == "CHGCAR"
+                or format in ("chgcar", "parchg")
+                or filename.suffix == ".vasp"
+            ):
+                return [VaspChargeDensity(str(filename)).atoms[-1]], False
+            elif (
+                filename.stem in ("XDATCAR")
+                or format == "vasp-xdatcar"
+                or filename.suffix == ".traj"
+            ):
+                format = "" if filename.suffix == ".traj" else "vasp-xdatcar"
+                return aread(str(filename), format=format, index=":"), True
+            else:
+                return [aread(str(filename), format=format)], False
+
+    @classmethod
+    @bulk_edit("Build region")
+    def build_region(cls, structure, region, cell=None, name=None, double_bonds=None):
+        """
+        Creates exactly the atoms of a periodic structure lying inside a
+        region, e.g. the patch of a surface seen by the camera. Unlike
+        `repeat`, the atoms are real atoms, so bonds across the boundaries of
+        the unit cells are created as well.
+
+        Args:
+            structure (ase.Atoms | str | Path): The structure or a file to read it from. Only the first frame of trajectories is used.
+            region (tuple | list): A box ((x_min, y_min, z_min), (x_max, y_max, z_max)) or a polygon [(x, y), ...] in the xy-plane extended along z over the structure.
+            cell (ndarray | None): The unit cell. Default: None. The cell of the structure.
+            name (str | None): The name of the atoms collection. Default: None. "Region".
+            double_bonds (bool): Whether to display double and triple bonds.
+
+        Returns:
+            Atoms: The created atoms collection.
+
+        Examples:
+            >>> # A 30 x 20 Å patch of a slab
+            >>> atoms = Atoms.build_region("POSCAR", ((0, 0, -5), (30, 20, 30)))
+            >>> # A hexagonal patch
+            >>> atoms = Atoms.build_region("POSCAR", [(0, 0), (20, 0), (30, 17), (20, 34), (0, 34), (-10, 17)])
+        """
+        if isinstance(structure, (str, Path)):
+            structure = Atoms._parse(structure)[0][0]
+
+        if cell is None:
+            cell = structure.cell[:]
+            periodic = np.asarray(structure.pbc, dtype=bool)
         else:
-            return Atoms.ase(
-                aread(str(filename), format=format),
-                name=name,
-                double_bonds=double_bonds,
-            )
+            periodic = np.ones(3, dtype=bool)
+        cell = np.asarray(cell, dtype=np.float64)
+        periodic &= np.linalg.norm(cell, axis=1) > 0
+
+        indices, positions = _tile_region(structure.positions, cell, periodic, region)
+        symbols = structure.get_chemical_symbols()
+
+        self = Atoms("Region" if name is None else name)
+        for index, position in zip(indices, positions):
+            atom = Atom(symbols[index])
+            atom.location = position
+            self += atom
+        # The region itself is not periodic
+        self.create_bonds(periodic=False, double_bonds=double_bonds)
+
+        return self
 
     def __add__(self, objects):
         """
@@ -535,6 +634,7 @@ class Atoms(MeshObject):
             if atom.blender_object is None:
                 self._atoms.remove(atom)
 
+    @span("create_bonds")
     def create_bonds(self, periodic=True, double_bonds=None):
         """
         Creates bonds between atoms in the atoms collection.
@@ -547,45 +647,56 @@ class Atoms(MeshObject):
             double_bonds = Preset.get("bonds.double_bonds")
         exclude_bonds = Preset.get("bonds.no_bonds")
 
-        if periodic and self.unit_cell is None:
+        cell = _periodic_cell(self.unit_cell)
+        if periodic and cell is None:
             logging.warning("Cannot do periodic bonds without unit cell.")
             periodic = False
 
-        for atom_a, atom_b in combinations(self.get("all"), 2):
-            if [atom_a.element, atom_b.element] in exclude_bonds or [
-                atom_b.element,
-                atom_a.element,
-            ] in exclude_bonds:
-                continue
-
-            if periodic:
-                for x, y, z in (p for p in product((-1, 0, 1), repeat=3)):
-                    if (x, y, z) != (0, 0, 0):
-                        shift = Vector(
-                            x * self.unit_cell[0]
-                            + y * self.unit_cell[1]
-                            + z * self.unit_cell[2]
-                        )
-                        if Bond._check_distance(atom_a, atom_b, shift):
-                            atom_b_dummy = _DummyAtom(atom_b, shift)
-                            self += atom_b_dummy
-                            self += Bond(atom_a, atom_b_dummy, double_bonds)
-                    else:
-                        self._create_bond(atom_a, atom_b, double_bonds=double_bonds)
-            else:
-                self._create_bond(atom_a, atom_b, double_bonds=double_bonds)
+        atoms = list(self.get("all"))
+        pairs = _bond_pairs(
+            [atom.position for atom in atoms],
+            [atom.covalent_radius for atom in atoms],
+            [atom.element for atom in atoms],
+            cell=cell if periodic else None,
+            exclude=exclude_bonds,
+        )
+        for a, b, shift in pairs:
+            self._add_bond(atoms[a], atoms[b], shift, double_bonds=double_bonds)
 
-    def _create_bond(self, atom_a, atom_b, double_bonds=False):
+    def _add_bond(self, atom_a, atom_b, shift=(0, 0, 0), double_bonds=False):
         """
-        Creates a bond between two atoms if there distance is smaller or equal to bonds.factor * (atom_a.covalent_radius + atom_b.covalent_radius)
+        Creates a bond between two atoms found by `_bond_pairs`. Bonds to a
+        periodic image of atom_b go to a hidden dummy atom at the image.
 
         Args:
             atom_a (Atom): The first atom.
             atom_b (Atom): The second atom.
+            shift (tuple[int, int, int]): The lattice shift of the image of atom_b.
             double_bonds (bool): Whether to display double and triple bonds.
         """
-        if Bond._check_distance(atom_a, atom_b):
-            self += Bond(atom_a, atom_b, double_bonds)
+        if any(shift):
+            atom_b = self._image(atom_b, shift)
+        self += Bond(atom_a, atom_b, double_bonds)
+
+    def _image(self, atom, shift):
+        """
+        Returns the periodic image of an atom. Every image is created only
+        once and shared by all bonds to it.
+
+        Args:
+            atom (Atom): The atom.
+            shift (tuple[int, int, int]): The lattice shift of the image.
+
+        Returns:
+            _DummyAtom: The image.
+        """
+        key = (atom, tuple(shift))
+        if key not in self._images:
+            translation = np.asarray(shift) @ np.asarray(self.unit_cell)
+            self._images[key] = _DummyAtom(atom, Vector(translation))
+            self += self._images[key]
+
+        return self._images[key]
 
     def repeat(self, repetitions):
         """
@@ -657,6 +768,153 @@ class Atoms(MeshObject):
         return instance
 
 
+def _periodic_cell(cell):
+    """
+    Returns the unit cell used for periodic bonds. Structures without a cell
+    (e.g. molecules read from .xyz files) have a zero cell in ASE.
+
+    Args:
+        cell (array_like | None): The unit cell.
+
+    Returns:
+        ndarray | None: The unit cell, None if it is missing or zero.
+    """
+    if cell is None or not np.asarray(cell).any():
+        return None
+    return np.asarray(cell)
+
+
+def _bond_pairs(positions, radii, elements, cell=None, factor=None, exclude=None):
+    """
+    Finds all pairs of atoms closer than factor times the sum of their
+    covalent radii. Works on arrays only and can run outside of the main
+    thread. The distances are computed in chunks of bounded size.
+
+    Args:
+        positions (array_like): The positions of the atoms, shape (n, 3).
+        radii (array_like): The covalent radii of the atoms.
+        elements (list[str]): The chemical symbols of the atoms.
+        cell (ndarray | None): The unit cell. If given, bonds to the images in the neighbouring cells are found as well. Default: None.
+        factor (float | None): The bond length factor. Default: None. Preset value.
+        exclude (list | None): Pairs of elements never bonded. Default: None. Preset value.
+
+    Returns:
+        list[tuple[int, int, tuple]]: The indices a < b of the bonded atoms and the lattice shift of the image of atom b.
+    """
+    if factor is None:
+        factor = Preset.get("bonds.factor")
+    if exclude is None:
+        exclude = Preset.get("bonds.no_bonds")
+
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    radii = np.asarray(radii, dtype=np.float64)
+    count = len(positions)
+    if cell is None:
+        lattice, shifts = np.zeros((1, 3), dtype=int), np.zeros((1, 3))
+    else:
+        lattice = np.array(list(product((-1, 0, 1), repeat=3)))
+        shifts = lattice @ np.asarray(cell)
+
+    kinds, codes = np.unique(np.asarray(elements, dtype=str), return_inverse=True)
+    allowed = np.ones((len(kinds), len(kinds)), dtype=bool)
+    index = {kind: i for i, kind in enumerate(kinds)}
+    for element_a, element_b in exclude:
+        if element_a in index and element_b in index:
+            allowed[index[element_a], index[element_b]] = False
+            allowed[index[element_b], index[element_a]] = False
+
+    pairs = []
+    chunk = max(1, 2**20 // max(1, count * len(shifts)))
+    for start in range(0, count, chunk):
+        rows = np.arange(start, min(count, start + chunk))
+        # Distances of shape (rows, shifts, atoms)
+        images = positions[None, None, :, :] + shifts[None, :, None, :]
+        distances = np.linalg.norm(positions[rows, None, None, :] - images, axis=-1)
+        bonded = distances <= factor * (radii[rows, None, None] + radii[None, None, :])
+        bonded &= (rows[:, None] < np.arange(count)[None, :])[:, None, :]
+        bonded &= allowed[codes[rows]][:, codes][:, None, :]
+
+        row, shift, column = np.nonzero(bonded)
+        for i in np.lexsort((shift, column, row)):
+            pairs.append(
+                (int(rows[row[i]]), int(column[i]), tuple(lattice[shift[i]].tolist()))
+            )
+
+    return pairs
+
+
+def _tile_region(positions, cell, periodic, region):
+    """
+    Tiles the atoms of a unit cell over a region and keeps the ones inside.
+
+    Args:
+        positions (ndarray): The positions of the atoms in the unit cell, shape (n, 3).
+        cell (ndarray): The unit cell.
+        periodic (ndarray): Whether the structure is periodic along each cell vector.
+        region (tuple | list): The box or polygon, see `Atoms.build_region`.
+
+    Returns:
+        tuple[ndarray, ndarray]: The indices of the atoms in the unit cell and their positions.
+    """
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    box = len(region) == 2 and len(region[0]) == 3
+    if box:
+        low, high = np.asarray(region, dtype=np.float64)
+    else:
+        polygon = np.asarray(region, dtype=np.float64)
+        z = positions[:, 2]
+        low = np.array([*polygon.min(axis=0), z.min()])
+        high = np.array([*polygon.max(axis=0), z.max()])
+
+    # Cell vectors of non-periodic directions may be zero
+    basis = np.where(periodic[:, None], cell, np.eye(3))
+    inverse = np.linalg.inv(basis)
+    fractional = positions @ inverse
+    fractional[:, periodic] %= 1.0
+
+    # Translations of the unit cell covering the bounding box of the region
+    corners = np.array(list(product(*zip(low, high)))) @ inverse
+    first = np.floor(corners.min(axis=0)).astype(int)
+    last = np.floor(corners.max(axis=0)).astype(int)
+    ranges = [
+        range(first[i], last[i] + 1) if periodic[i] else range(1) for i in range(3)
+    ]
+    translations = np.array(list(product(*ranges)), dtype=np.float64).reshape(-1, 3)
+
+    tiled = (fractional[None, :, :] + translations[:, None, :]) @ basis
+    tiled = tiled.reshape(-1, 3)
+    indices = np.tile(np.arange(len(positions)), len(translations))
+
+    # Tolerance for atoms on the boundary, lost by the fractional round trip
+    inside = np.all((tiled >= low - 1e-6) & (tiled <= high + 1e-6), axis=1)
+    if not box:
+        inside &= _in_polygon(tiled[:, :2], polygon)
+
+    return indices[inside], tiled[inside]
+
+
+def _in_polygon(points, polygon):
+    """
+    Even-odd test of points against a polygon.
+
+    Args:
+        points (ndarray): The points, shape (n, 2).
+        polygon (ndarray): The vertices of the polygon, shape (m, 2).
+
+    Returns:
+        ndarray: Whether each point is inside the polygon.
+    """
+    x, y = points[:, 0], points[:, 1]
+    inside = np.zeros(len(points), dtype=bool)
+    for (x_0, y_0), (x_1, y_1) in zip(polygon, np.roll(polygon, -1, axis=0)):
+        crosses = (y_0 > y) != (y_1 > y)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            intersection = x_0 + (y - y_0) * (x_1 - x_0) / (y_1 - y_0)
+        inside ^= crosses & (x < intersection)
+
+    return inside
+
+
 class _DummyAtom(Object):
     """
     Represents a dummy atom used for creating bonds in periodic systems.
@@ -671,10 +929,9 @@ class _DummyAtom(Object):
         """
 
         super().__init__()
-        bpy.ops.object.empty_add(
-            type="PLAIN_AXES", location=Vector(atom.position) + Vector(shift)
-        )
-        self.blender_object = bpy.context.active_object
+        self.blender_object = bpy.data.objects.new(atom.name, None)
+        self.blender_object.location = Vector(atom.position) + Vector(shift)
+        bpy.context.collection.objects.link(self.blender_object)
         self.hide(True)
         self.atom = atom
         self.shift = shift
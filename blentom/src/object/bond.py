@@ -4,7 +4,8 @@ from mathutils import Vector
 from .meshobject import MeshObject
 
 from ..utils.preset import Preset
-from ..utils.lib import append_asset
+from ..utils.lib import append_asset, bond_mesh
+from ..utils.profiling import span
 from .. import __default_directory__, __user_directory__
 
 # TODO: Go back to material indicies
@@ -19,6 +20,7 @@ class Bond(MeshObject):
         atom_b (Atom): The second atom connected by the bond.
     """
 
+    @span("Bond")
     def __init__(self, atom_a, atom_b, double_bonds=False):
         """
         Initializes a Bond object between two atoms.
@@ -33,9 +35,8 @@ class Bond(MeshObject):
         self.atom_a.bonds.append(self)
         self.atom_b.bonds.append(self)
 
-        vertices = Preset.get("bonds.sides")
-        bpy.ops.mesh.primitive_cylinder_add(vertices=vertices)
-        super().__init__()
+        # Cylinder along the y-axis from 0 to 2 with an edge loop at 1
+        super().__init__(bond_mesh("Cylinder", Preset.get("bonds.sides")))
 
         if Preset.get("bonds.smooth"):
             self.make_smooth()
@@ -79,44 +80,42 @@ class Bond(MeshObject):
         """
         return self.material
 
+    def set_resolution(self, sides):
+        """
+        Rebuilds the cylinder of the bond with a different number of sides.
+
+        Args:
+            sides (int): Number of sides of the cylinder.
+        """
+        # Three rings of vertices, the middle one splits the bond in halves
+        if len(self.blender_object.data.vertices) != 3 * sides:
+            self._replace_mesh(bond_mesh(self.name, sides))
+
     def _add_constraints(self):
         """
         Adds constraints to the bond setting its location onto one atom and makes it stretch to the other.
         """
 
-        # Stretch modifier only works along the y-axis
-        self.rotation = (90, 0, 0)
-        self.apply_transformations("rotation")
-        # Center of the bond that is fixed at atom A position needs to be the base of the cylinder
-        self.location = (0, 1, 0)
-        self.apply_transformations("location")
-
-        bpy.ops.object.constraint_add(type="COPY_LOCATION")
-        self.blender_object.constraints[
-            "Copy Location"
-        ].target = self.atom_a.blender_object
-
-        bpy.ops.object.constraint_add(type="STRETCH_TO")
-        self.blender_object.constraints[
-            "Stretch To"
-        ].target = self.atom_b.blender_object
-        self.blender_object.constraints["Stretch To"].volume = "NO_VOLUME"
-        self.blender_object.constraints["Stretch To"].keep_axis = "PLANE_X"
+        # Stretch modifier only works along the y-axis, the base of the
+        # cylinder fixed at the position of atom A is at the origin
+        constraint = self.blender_object.constraints.new(type="COPY_LOCATION")
+        constraint.target = self.atom_a.blender_object
+
+        constraint = self.blender_object.constraints.new(type="STRETCH_TO")
+        constraint.target = self.atom_b.blender_object
+        constraint.volume = "NO_VOLUME"
+        constraint.keep_axis = "PLANE_X"
         # No idea but the bonds are too long otherwise
-        self.blender_object.constraints["Stretch To"].rest_length = 2
+        constraint.rest_length = 2
 
     def _add_bond_logic(self, double_bonds):
         """
         Sets up complex geometry node logic for the bonds.
         """
 
-        self._add_loop_cut()
-
         modifier_split = self.blender_object.modifiers.new(
             name="Bond Logic", type="NODES"
         )
-        bpy.ops.node.new_geometry_node_group_assign()
-        modifier_split.node_group.name = f"Bond - {self.name}"
         if "Bond" not in bpy.data.node_groups:
             append_asset(
                 __default_directory__ / "assets.blend", "Bond", type_="NodeTree"
@@ -131,23 +130,6 @@ class Bond(MeshObject):
         modifier_split["Socket_13"] = double_bonds
         modifier_split["Socket_14"] = double_bonds
 
-    def _add_loop_cut(self):
-        """
-        Adds a loop cut around the long axis of a cylinder like object.
-        """
-        bpy.ops.object.mode_set(mode="EDIT")
-        # From Blender info window, values are trial and error
-        bpy.ops.mesh.loopcut_slide(
-            MESH_OT_loopcut={
-                "number_cuts": 1,
-                "smoothness": 0,
-                "falloff": "INVERSE_SQUARE",
-                "object_index": 0,
-                "edge_index": 3,
-            }
-        )
-        bpy.ops.object.mode_set(mode="OBJECT")
-
     def make_smooth(self):
         """
         Use the smooth shader for this object.
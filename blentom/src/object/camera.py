@@ -1,7 +1,11 @@
-from pathlib import Path
+import logging
+from contextlib import contextmanager
 from functools import wraps
+from pathlib import Path
+from time import perf_counter
 
 import bpy  # type: ignore
+import numpy as np
 
 from .object import Object
 
@@ -14,6 +18,7 @@ class Camera(Object):
     """
 
     first = True
+    _session = None
 
     def __init__(self, name=None, position=(0, 0, 10), rotation=(0, 0, 0)):
         """
@@ -282,41 +287,20 @@ class Camera(Object):
         def wrapper(self, *args, quality=None, **kwargs):
             if quality is not None:
                 self.quality = quality
-            quality_dict = self._quality_dict
 
             # Delayed import to avoid circular import
-            from .lib import (
-                get_viewport_engine,
-                set_viewport_engine,
-                set_background_transparent,
-            )
-
-            # Set render engine
-            viewport_engine = get_viewport_engine()
-            set_viewport_engine(self.engine)
+            from ..utils.lib import get_viewport_engine, set_viewport_engine
 
-            # Set transparent background
-            set_background_transparent(Preset.get("render.transparent_background"))
+            if Camera._session is not None:
+                # Settings are applied once for the whole session
+                if quality is not None and quality != Camera._session:
+                    Camera._apply_quality(self.engine, self._quality_dict)
+                    Camera._session = quality
+                render(self, *args, **kwargs)
+                return
 
-            # Set output
-            bpy.data.scenes["Scene"].render.image_settings.color_depth = str(
-                Preset.get("render.color_depth")
-            )
-            bpy.data.scenes["Scene"].render.image_settings.compression = Preset.get(
-                "render.compression"
-            )
-
-            # Quality settings
-            if bpy.context.scene.render.engine == "CYCLES":
-                bpy.data.scenes["Scene"].cycles.use_denoising = quality_dict["denoise"]
-                bpy.data.scenes["Scene"].cycles.samples = quality_dict["max_samples"]
-                bpy.data.scenes["Scene"].cycles.adaptive_threshold = quality_dict[
-                    "noise"
-                ]
-            elif bpy.context.scene.render.engine == "BLENDER_EEVEE":
-                bpy.data.scenes["Scene"].eevee.taa_render_samples = quality_dict[
-                    "max_samples"
-                ]
+            viewport_engine = get_viewport_engine()
+            Camera._apply_quality(self.engine, self._quality_dict)
 
             # Render
             render(self, *args, **kwargs)
@@ -326,6 +310,206 @@ class Camera(Object):
 
         return wrapper
 
+    @classmethod
+    def _apply_quality(cls, engine, quality_dict):
+        """
+        Sets the render engine, output and quality settings of the scene.
+
+        Args:
+            engine (str): The render engine. {"cycles", "eevee"}
+            quality_dict (dict): The settings of a quality preset.
+        """
+        # Delayed import to avoid circular import
+        from ..utils.lib import set_viewport_engine, set_background_transparent
+
+        # Set render engine
+        set_viewport_engine(engine)
+
+        # Set transparent background
+        set_background_transparent(Preset.get("render.transparent_background"))
+
+        # Set output
+        bpy.data.scenes["Scene"].render.image_settings.color_depth = str(
+            Preset.get("render.color_depth")
+        )
+        bpy.data.scenes["Scene"].render.image_settings.compression = Preset.get(
+            "render.compression"
+        )
+
+        # Quality settings
+        if bpy.context.scene.render.engine == "CYCLES":
+            bpy.data.scenes["Scene"].cycles.use_denoising = quality_dict["denoise"]
+            bpy.data.scenes["Scene"].cycles.samples = quality_dict["max_samples"]
+            bpy.data.scenes["Scene"].cycles.adaptive_threshold = quality_dict["noise"]
+        elif bpy.context.scene.render.engine in ("BLENDER_EEVEE", "BLENDER_EEVEE_NEXT"):
+            bpy.data.scenes["Scene"].eevee.taa_render_samples = quality_dict[
+                "max_samples"
+            ]
+
+    @classmethod
+    @contextmanager
+    def session(cls, quality=None):
+        """
+        Context in which all renders share the render settings. Engine, output
+        and quality settings are applied once at the beginning and Blender
+        keeps the scene data (BVH, shaders) between the renders. The viewport
+        engine is restored at the end.
+
+        Note:
+            Inside the session, the quality of the cameras is ignored unless
+            passed explicitly to `render`. Nested sessions have no effect.
+
+        Args:
+            quality (str, optional): The quality preset to use for all renders. Default: None. Quality from the preset configuration.
+
+        Raises:
+            ValueError: If the provided quality preset is unknown.
+
+        Examples:
+            >>> with Camera.session(quality="high"):
+            >>>     top.render("top.png")
+            >>>     side.render("side.png")
+        """
+        if cls._session is not None:
+            yield
+            return
+
+        # Delayed import to avoid circular import
+        from ..utils.lib import get_viewport_engine, set_viewport_engine
+
+        quality = Preset.get("camera.quality") if quality is None else quality
+        try:
+            quality_dict = Preset.get(f"camera.quality_presets.{quality}")
+        except KeyError:
+            raise ValueError(f"Quality preset {quality} not found in the preset file.")
+
+        viewport_engine = get_viewport_engine()
+        persistent_data = bpy.context.scene.render.use_persistent_data
+        cls._apply_quality(quality_dict["engine"], quality_dict)
+        bpy.context.scene.render.use_persistent_data = True
+        cls._session = quality
+        try:
+            yield
+        finally:
+            cls._session = None
+            bpy.context.scene.render.use_persistent_data = persistent_data
+            set_viewport_engine(viewport_engine)
+
+    @classmethod
+    def render_many(cls, cameras, outputs, quality=None):
+        """
+        Renders the scene from several cameras back to back in one render
+        session (see `session`), i.e. the scene data is only built once.
+
+        Args:
+            cameras (list[Camera]): The cameras to render from.
+            outputs (list[str | Path | None]): The output filename for each camera. None writes no file.
+            quality (str, optional): The quality preset to use for all renders. Default: None. Quality from the preset configuration.
+
+        Returns:
+            list[float]: The time in seconds each render took.
+
+        Raises:
+            ValueError: If the number of cameras and outputs differ.
+
+        Examples:
+            >>> top = Camera(position=(0, 0, 20))
+            >>> side = Camera(position=(0, -20, 0), rotation=(90, 0, 0))
+            >>> Camera.render_many([top, side], ["top.png", "side.png"])
+        """
+        if len(cameras) != len(outputs):
+            raise ValueError("Number of cameras and outputs differ.")
+
+        timings = []
+        with cls.session(quality=quality):
+            for camera, output in zip(cameras, outputs):
+                start = perf_counter()
+                camera.render(output, show=False)
+                timings.append(perf_counter() - start)
+                logging.info(f"Rendered {camera.name} in {timings[-1]:.2f}s.")
+
+        return timings
+
+    def cull(self, atoms=None, resolution=512):
+        """
+        Hides the atoms fully occluded by other atoms from the render, e.g.
+        the inner layers of a thick slab seen from the top. Bonds are hidden
+        if both of their atoms are. The occlusion is found with a depth buffer
+        of the atoms seen from this camera, atoms outside of the image are
+        kept. Call again after moving the camera or atoms, previously hidden
+        atoms are shown again if they became visible.
+
+        Note:
+            Hidden atoms neither cast shadows nor show up in reflections.
+
+        Args:
+            atoms (list[Atom] | Atoms | None): The atoms. Default: None. All atoms.
+            resolution (int): Resolution of the depth buffer along the longer side of the image. Default: 512.
+
+        Returns:
+            dict: The number of "hidden" and "visible" atoms.
+
+        Examples:
+            >>> slab = Atoms.read("POSCAR")
+            >>> camera = Camera(position=(0, 0, 30))
+            >>> camera.cull(slab)
+        """
+        # Delayed import to avoid circular import
+        from .atom import Atom
+        from ..utils.lib import _atom_list, occluded
+
+        atoms = _atom_list(atoms)
+        if not atoms:
+            return {"hidden": 0, "visible": 0}
+
+        scene = bpy.context.scene
+        aspect = scene.render.resolution_x / scene.render.resolution_y
+        if aspect >= 1:
+            width, height = resolution, max(1, round(resolution / aspect))
+        else:
+            width, height = max(1, round(resolution * aspect)), resolution
+        projection = np.array(
+            self.blender_object.calc_matrix_camera(
+                bpy.context.evaluated_depsgraph_get(), x=width, y=height
+            )
+        )
+        view = np.array(self.blender_object.matrix_world.inverted())
+
+        positions = np.array(
+            [atom.blender_object.matrix_world.translation for atom in atoms]
+        )
+        radii = np.array([max(atom.blender_object.scale) for atom in atoms])
+        # The camera looks along its negative z-axis
+        view_positions = np.c_[positions, np.ones(len(atoms))] @ view.T
+        clip = view_positions @ projection.T
+        front = clip[:, 3] > 0
+
+        w = clip[front, 3]
+        centers = (clip[front, :2] / w[:, None] + 1) / 2 * (width, height)
+        pixel_radii = radii[front] * projection[0, 0] / w * width / 2
+        hidden = np.zeros(len(atoms), dtype=bool)
+        hidden[front] = occluded(
+            centers,
+            -view_positions[front, 2],
+            radii[front],
+            pixel_radii,
+            (height, width),
+        )
+
+        for atom, hide in zip(atoms, hidden):
+            atom.blender_object.hide_render = bool(hide)
+        for bond in {id(bond): bond for atom in atoms for bond in atom.bonds}.values():
+            # Bonds to periodic images are kept
+            bond.blender_object.hide_render = all(
+                isinstance(atom, Atom) and atom.blender_object.hide_render
+                for atom in (bond.atom_a, bond.atom_b)
+            )
+
+        report = {"hidden": int(hidden.sum()), "visible": int((~hidden).sum())}
+        logging.info(f"Culled {report['hidden']} of {len(atoms)} atoms.")
+
+        return report
+
     @_apply_render_settings
     def render(self, filename=None, quality=None, show=None):
         """
@@ -1,19 +1,32 @@
 import bpy
+import re
+import threading
+from bpy.app.handlers import persistent
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
+from glob import glob
 from math import radians
 
 
 from pathlib import Path
-from numpy import diag, tile, max
-from ase.calculators.vasp import VaspChargeDensity
+from numpy import diag, float32, tile, unique
 
 from .meshobject import MeshObject
 from ..utils.lib import (
+    decimate_surface,
+    dissolve_planar,
     flip_normals,
-    marching_cubes_gaussian,
-    marching_cubes_VASP,
+    isosurface_gaussian,
+    isosurface_VASP,
+    isosurfaces_gaussian,
+    isosurfaces_VASP,
+    mesh_object,
+    outward_mesh,
     read_cube,
     scale_density,
 )
+from ..utils.bulk import bulk_edit
 from ..utils.collection import Collection
 from ..utils.material import Material
 from ..utils.preset import Preset
@@ -40,11 +53,17 @@ class Isosurface(MeshObject):
         if Preset.get("isosurface.remesh"):
             self.remesh()
 
-        bpy.ops.blentom.add_isosurface_item(name=self.name, level=self.level / self.max)
+        # Only registered together with the user interface. Recorded in the
+        # undo step of the creation, not in one of its own
+        if hasattr(bpy.context.scene, "item_panel_isosurfaces"):
+            bpy.ops.blentom.add_isosurface_item(
+                "EXEC_DEFAULT", False, name=self.name, level=self.level / self.max
+            )
         Isosurface.items.append(self)
 
     @classmethod
-    def read(cls, filename, name=None, level=None, format=None, scale=1):
+    @bulk_edit("Import isosurface")
+    def read(cls, filename, name=None, level=None, format=None, scale=1, adaptive=None):
         """
         Reads an isosurface from a file.
 
@@ -54,10 +73,38 @@ class Isosurface(MeshObject):
             level (float, optional): The isosurface level.
             format (str, optional): The file format.
             scale (float, optional): Increase density grid.
+            adaptive (bool, optional): Only increase the density grid around the isosurface (.cube only). Default: Preset value.
 
         Returns:
             Isosurface: The created Isosurface object.
 
+        Raises:
+            ValueError: If the file format is not supported.
+        """
+        return Isosurface(
+            Isosurface._open(filename, name, level, format, scale, adaptive)
+        )
+
+    @classmethod
+    def _open(
+        cls,
+        filename,
+        name=None,
+        level=None,
+        format=None,
+        scale=1,
+        adaptive=None,
+        create=True,
+    ):
+        """
+        Reads the density of an isosurface, see `read`.
+
+        Args:
+            create (bool, optional): Whether to create the mesh right away.
+
+        Returns:
+            CubeIsosurface | VaspIsosurface: The density and, if created, its mesh.
+
         Raises:
             ValueError: If the file format is not supported.
         """
@@ -69,9 +116,11 @@ class Isosurface(MeshObject):
             format = filename.suffix if filename.suffix else filename.stem
 
         if format == ".cube":
-            return Isosurface(CubeIsosurface(filename, name, level, scale=scale))
+            return CubeIsosurface(
+                filename, name, level, scale=scale, adaptive=adaptive, create=create
+            )
         elif format.lower() in ("parchg", "chgcar", "vasp", ".vasp"):
-            return Isosurface(VaspIsosurface(filename, name, level, scale=scale))
+            return VaspIsosurface(filename, name, level, scale=scale, create=create)
         else:
             raise ValueError(f"Unsupported file format: {format}")
 
@@ -146,10 +195,30 @@ class Isosurface(MeshObject):
         """
         self._isosurface_object.blender_object.name = name
 
-    def remesh(self):
+    def remesh(self, triangle_budget=None):
         """
-        Remeshes the isosurface object.
+        Decimates the isosurface object once. The mesh is collapsed down to
+        the triangle budget and planar regions are dissolved. The decimated
+        mesh replaces the original one, so no modifiers are evaluated on
+        viewport updates or renders.
+
+        Args:
+            triangle_budget (int, optional): The maximum number of triangles. Default: Preset value.
         """
+        if triangle_budget is None:
+            triangle_budget = Preset.get("isosurface.remesh.triangle_budget")
+
+        modifiers = []
+        # Marching cubes creates triangles only
+        triangles = len(self.blender_object.data.polygons)
+        if Preset.get("isosurface.remesh.collapse") and triangles > triangle_budget:
+            collapse_modifier = self.blender_object.modifiers.new(
+                name="Collapse", type="DECIMATE"
+            )
+            collapse_modifier.decimate_type = "COLLAPSE"
+            collapse_modifier.ratio = triangle_budget / triangles
+            modifiers.append(collapse_modifier)
+
         if Preset.get("isosurface.remesh.planar"):
             planar_decimate_modifier = self.blender_object.modifiers.new(
                 name="Decimate", type="DECIMATE"
@@ -158,16 +227,29 @@ class Isosurface(MeshObject):
             planar_decimate_modifier.angle_limit = radians(
                 Preset.get("isosurface.remesh.planar_angle")
             )
+            modifiers.append(planar_decimate_modifier)
 
-        if Preset.get("isosurface.remesh.collapse"):
-            collapse_modifier = self.blender_object.modifiers.new(
-                name="Collapse", type="DECIMATE"
-            )
-            collapse_modifier.decimate_type = "COLLAPSE"
-            collapse_modifier.ratio = Preset.get("isosurface.remesh.collapse_ratio")
-
+        if modifiers:
+            self._apply_modifiers(modifiers)
         self.make_smooth()
 
+    def _apply_modifiers(self, modifiers):
+        """
+        Replaces the mesh by the evaluated one and removes the modifiers.
+
+        Args:
+            modifiers (list): The modifiers to apply.
+        """
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        mesh = bpy.data.meshes.new_from_object(
+            self.blender_object.evaluated_get(depsgraph)
+        )
+        for modifier in modifiers:
+            self.blender_object.modifiers.remove(modifier)
+        # Taken over from the original mesh
+        mesh.materials.clear()
+        self._replace_mesh(mesh)
+
     def repeat(self, repetitions):
         """
         Repeats the isosurface object.
@@ -179,10 +261,89 @@ class Isosurface(MeshObject):
         self.update()
         self._isosurface_object.repetitions = (0, 0, 0)
 
+    @bulk_edit("Isovalue sweep")
+    def sweep(self, levels, start=None, workers=None):
+        """
+        Animates the isosurface level. The isosurfaces of all levels are
+        extracted once, in a process pool, and stored as meshes. On every frame
+        change the mesh of the current frame is swapped in, so playback and
+        rendering need no extraction.
+
+        Args:
+            levels (list[float] | dict[int, float]): One level per frame starting at 'start', or the levels at some frames, each held until the next one.
+            start (int, optional): The first frame if 'levels' is a list. Default: The start of the scene.
+            workers (int, optional): Number of worker processes. Default: Preset value.
+
+        Examples:
+            >>> charge_density.sweep(numpy.linspace(0.01, 0.1, 60))
+        """
+        start, unique, indices = _schedule(levels, start)
+        self._animate(self._isosurface_object.sweep(unique, workers), start, indices)
+
+    def _animate(self, surfaces, start, indices):
+        """
+        Stores the meshes of a sweep and swaps them in on frame change.
+
+        Args:
+            surfaces (list): The vertices and faces of each level.
+            start (int): The first frame.
+            indices (list[int]): The surface of each frame.
+        """
+        self._remove_sweep()
+        old = self.blender_object.data
+        smooth = len(old.polygons) > 0 and old.polygons[0].use_smooth
+
+        remesh = Preset.get("isosurface.remesh")
+        meshes = []
+        for i, (vertices, faces) in enumerate(surfaces):
+            # Decimated on the mesh data, without evaluating modifiers
+            if remesh and Preset.get("isosurface.remesh.collapse"):
+                vertices, faces = decimate_surface(vertices, faces)
+            mesh = outward_mesh(f"{old.name} - {i}", vertices, faces)
+            if remesh and Preset.get("isosurface.remesh.planar"):
+                dissolve_planar(mesh)
+            for material in old.materials:
+                mesh.materials.append(material)
+            mesh.polygons.foreach_set("use_smooth", [smooth] * len(mesh.polygons))
+            # Only one mesh is used at a time, the others are kept when saving
+            mesh.use_fake_user = True
+            meshes.append(mesh.name)
+
+        self.blender_object.data = bpy.data.meshes[meshes[indices[0]]]
+        if old.users == 0:
+            bpy.data.meshes.remove(old)
+
+        self.blender_object["blentom_sweep"] = [meshes[i] for i in indices]
+        self.blender_object["blentom_sweep_start"] = start
+        register_handlers()
+        _frame_change(bpy.context.scene)
+
+    def _remove_sweep(self):
+        """
+        Removes the meshes of a previous isovalue sweep, except the one in use,
+        and stops following the frame.
+        """
+        names = self.blender_object.get("blentom_sweep")
+        if names is None:
+            return
+
+        current = self.blender_object.data
+        current.use_fake_user = False
+        bpy.data.batch_remove(
+            [
+                bpy.data.meshes[name]
+                for name in set(names)
+                if name in bpy.data.meshes and bpy.data.meshes[name] != current
+            ]
+        )
+        del self.blender_object["blentom_sweep"]
+        del self.blender_object["blentom_sweep_start"]
+
     def update(self):
         """
-        Updates the isosurface object.
+        Updates the isosurface object. A running isovalue sweep is removed.
         """
+        self._remove_sweep()
         name = self.name
         material = self.material
         self._unlink()
@@ -227,6 +388,8 @@ class VaspIsosurface:
         name (str): The name of the isosurface object.
         level (float, optional): The isosurface level.
         repetitions (tuple, optional): The repetitions in each direction.
+        scale (float, optional): Increases density grid.
+        create (bool, optional): Whether to create the mesh right away. Otherwise `compute` and `_create_mesh` are left to the caller, e.g. to extract the isosurface in a background thread.
 
     Attributes:
         name (str): The name of the isosurface object.
@@ -237,24 +400,45 @@ class VaspIsosurface:
         blender_object (object): The Blender object associated with the isosurface.
 
     Methods:
+        compute(): Extracts the isosurface without accessing Blender.
         _create_mesh(): Creates the mesh for the isosurface.
     """
 
-    def __init__(self, filename, name, level=None, repetitions=(0, 0, 0), scale=1.0):
+    def __init__(
+        self,
+        filename,
+        name,
+        level=None,
+        repetitions=(0, 0, 0),
+        scale=1.0,
+        create=True,
+    ):
         self.name = name
         self.level = level
         self.repetitions = repetitions
-        self.density = VaspChargeDensity(filename).chg[-1]
-        self.max = max(self.density)
-        self.unit_cell = VaspChargeDensity(filename).atoms[-1].cell
-        self.blender_object = self._create_mesh()
+        # Delayed import to keep the registration of the add-on fast
+        from ase.calculators.vasp import VaspChargeDensity
+
+        vasp = VaspChargeDensity(filename)
+        self.density = vasp.chg[-1].astype(float32)
+        self.unit_cell = vasp.atoms[-1].cell
+        if scale != 1.0:
+            # Vertices are mapped onto the unit cell via the grid shape
+            self.density, _ = scale_density(
+                self.density, self.unit_cell, scale=scale, periodic=True
+            )
+        self.max = self.density.max()
+        self.blender_object = self._create_mesh() if create else None
 
-    def _create_mesh(self):
+    def compute(self, progress=None):
         """
-        Creates the mesh for the isosurface.
+        Extracts the isosurface. Does not access Blender.
+
+        Args:
+            progress (callable, optional): Called with the fraction of extracted blocks after every block.
 
         Returns:
-            object: The Blender object representing the isosurface.
+            (numpy.ndarray, numpy.ndarray): The vertices and faces of the isosurface.
         """
         if self.repetitions != (0, 0, 0):
             repetitions = tuple([repetition + 1 for repetition in self.repetitions])
@@ -263,7 +447,33 @@ class VaspIsosurface:
 
         if self.level is None:
             self.level = self.max / 10
-        return marching_cubes_VASP(self.density, self.unit_cell, self.name, self.level)
+        return isosurface_VASP(self.density, self.unit_cell, self.level, progress)
+
+    def sweep(self, levels, workers=None):
+        """
+        Extracts the isosurfaces of many levels. Does not access Blender.
+
+        Args:
+            levels (list[float]): The isosurface levels.
+            workers (int, optional): Number of worker processes. Default: Preset value.
+
+        Returns:
+            list: The vertices and faces of each level.
+        """
+        return isosurfaces_VASP(self.density, self.unit_cell, levels, workers)
+
+    def _create_mesh(self, surface=None):
+        """
+        Creates the mesh for the isosurface.
+
+        Args:
+            surface (tuple, optional): The result of `compute`. Default: Computed now.
+
+        Returns:
+            object: The Blender object representing the isosurface.
+        """
+        vertices, faces = self.compute() if surface is None else surface
+        return mesh_object(self.name, vertices, faces)
 
 
 class CubeIsosurface:
@@ -276,6 +486,8 @@ class CubeIsosurface:
         level (float, optional): The isosurface level.
         repetitions (tuple, optional): The repetitions in each direction.
         scale (float, optional): Increases density grid.
+        adaptive (bool, optional): Only refine the density grid around the isosurface. Default: Preset value.
+        create (bool, optional): Whether to create the mesh right away. Otherwise `compute` and `_create_mesh` are left to the caller, e.g. to extract the isosurface in a background thread.
 
     Attributes:
         name (str): The name of the isosurface object.
@@ -284,30 +496,51 @@ class CubeIsosurface:
         density (numpy.ndarray): The charge density.
         origin (numpy.ndarray): The origin of the cube.
         axes (numpy.ndarray): The axes of the cube.
+        scale (float): Factor of the adaptive refinement. 1 if the density was refined as a whole.
         blender_object (object): The Blender object associated with the isosurface.
 
     Methods:
+        compute(): Extracts the isosurface without accessing Blender.
         _create_mesh(): Creates the mesh for the isosurface.
     """
 
-    def __init__(self, filename, name, level=None, repetitions=(0, 0, 0), scale=1.0):
+    def __init__(
+        self,
+        filename,
+        name,
+        level=None,
+        repetitions=(0, 0, 0),
+        scale=1.0,
+        adaptive=None,
+        create=True,
+    ):
         self.name = name
         self.level = level
         self.repetitions = repetitions
+        self.scale = 1
         self.density, self.origin, self.axes, *_ = read_cube(filename)
-        if scale != 1.0:
+        if adaptive is None:
+            adaptive = Preset.get("isosurface.adaptive")
+        if scale != 1.0 and adaptive:
+            # Refined around the isosurface during the mesh creation
+            self.scale = scale
+            self.axes = [axis / scale for axis in self.axes]
+        elif scale != 1.0:
             self.density, self.axes = scale_density(
                 self.density, self.axes, scale=scale
             )
-        self.max = max(self.density)
-        self.blender_object = self._create_mesh(scale)
+        self.max = self.density.max()
+        self.blender_object = self._create_mesh() if create else None
 
-    def _create_mesh(self, scale=1.0):
+    def compute(self, progress=None):
         """
-        Creates the mesh for the isosurface.
+        Extracts the isosurface. Does not access Blender.
+
+        Args:
+            progress (callable, optional): Called with the fraction of extracted blocks after every block.
 
         Returns:
-            object: The Blender object representing the isosurface.
+            (numpy.ndarray, numpy.ndarray): The vertices and faces of the isosurface.
         """
         if self.repetitions != (0, 0, 0):
             repetitions = tuple([repetition + 1 for repetition in self.repetitions])
@@ -316,10 +549,38 @@ class CubeIsosurface:
         if self.level is None:
             self.level = self.max / 10
 
-        return marching_cubes_gaussian(
-            self.density, self.origin, self.axes, self.name, self.level
+        return isosurface_gaussian(
+            self.density, self.origin, self.axes, self.level, self.scale, progress
+        )
+
+    def sweep(self, levels, workers=None):
+        """
+        Extracts the isosurfaces of many levels. Does not access Blender.
+
+        Args:
+            levels (list[float]): The isosurface levels.
+            workers (int, optional): Number of worker processes. Default: Preset value.
+
+        Returns:
+            list: The vertices and faces of each level.
+        """
+        return isosurfaces_gaussian(
+            self.density, self.origin, self.axes, levels, self.scale, workers
         )
 
+    def _create_mesh(self, surface=None):
+        """
+        Creates the mesh for the isosurface.
+
+        Args:
+            surface (tuple, optional): The result of `compute`. Default: Computed now.
+
+        Returns:
+            object: The Blender object representing the isosurface.
+        """
+        vertices, faces = self.compute() if surface is None else surface
+        return mesh_object(self.name, vertices, faces)
+
 
 class ChargeDensity(Isosurface):
     """
@@ -340,12 +601,32 @@ class ChargeDensity(Isosurface):
     """
 
     def __init__(self, *args, **kwargs):
-        self.positive = Isosurface.read(*args, **kwargs)
+        self._assemble(Isosurface.read(*args, **kwargs))
+
+    @classmethod
+    def _from_isosurface(cls, positive):
+        """
+        Creates a charge density from an existing isosurface.
+
+        Args:
+            positive (Isosurface): The isosurface.
+
+        Returns:
+            ChargeDensity: The created ChargeDensity object.
+        """
+        self = cls.__new__(cls)
+        self._assemble(positive)
+
+        return self
+
+    def _assemble(self, positive):
+        self.positive = positive
         self.positive.material = Material(
             f"ChargeDensity - {Preset.get('isosurface.chargedensity.material')}"
         )
 
     @classmethod
+    @bulk_edit("Import isosurface")
     def read(cls, *args, **kwargs):
         """
         Reads an isosurface.
@@ -429,6 +710,16 @@ class ChargeDensity(Isosurface):
         """
         self.positive.repeat(repetitions)
 
+    def sweep(self, *args, **kwargs):
+        """
+        Animates the isosurface level, see `Isosurface.sweep`.
+
+        Args:
+            *args: Variable length arguments.
+            **kwargs: Arbitrary keyword arguments.
+        """
+        self.positive.sweep(*args, **kwargs)
+
 
 class Wavefunction:
     """
@@ -452,17 +743,85 @@ class Wavefunction:
 
     def __init__(self, filename, *args, name=None, scale=1.0, **kwargs):
         name = Path(filename).stem if name is None else name
-        self.collection = Collection(name)
 
-        kwargs["name"] = f"{name} - Positive"
-        self.positive = Isosurface.read(filename, *args, scale=scale, **kwargs)
+        lobes = []
+        for lobe, surface in Wavefunction._extract(
+            filename, name, *args, scale=scale, **kwargs
+        ):
+            lobe.blender_object = lobe._create_mesh(surface)
+            lobes.append(Isosurface(lobe))
+
+        self._assemble(name, *lobes)
+
+    @classmethod
+    def _extract(cls, filename, name, *args, progress=None, **kwargs):
+        """
+        Extracts the positive and negative isosurface. The density is read and
+        interpolated only once and shared by both lobes, which are extracted
+        concurrently. Does not access Blender.
+
+        Args:
+            filename (str): The path to the wavefunction file.
+            name (str): The name of the wavefunction.
+            *args: Variable length arguments of `Isosurface.read`.
+            progress (callable, optional): Called with the fraction of extracted blocks of both lobes.
+            **kwargs: Arbitrary keyword arguments of `Isosurface.read`.
+
+        Returns:
+            list[tuple]: The positive and negative isosurface and their vertices and faces.
+        """
+        positive = Isosurface._open(
+            filename, f"{name} - Positive", *args, create=False, **kwargs
+        )
+        if positive.level is None:
+            positive.level = positive.max / 10
+
+        # Shallow copy, the density is shared
+        negative = copy(positive)
+        negative.name = f"{name} - Negative"
+        negative.level = -positive.level
+
+        fractions = [0.0, 0.0]
+
+        def compute(lobe):
+            def report(fraction):
+                fractions[lobe] = fraction
+                if progress is not None:
+                    progress(sum(fractions) / 2)
+
+            return (positive, negative)[lobe].compute(report)
+
+        # Large grids are extracted in a process pool, so the lobes overlap
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            surfaces = list(pool.map(compute, (0, 1)))
+
+        return list(zip((positive, negative), surfaces))
+
+    @classmethod
+    def _from_isosurfaces(cls, name, positive, negative):
+        """
+        Creates a wavefunction from existing isosurfaces.
+
+        Args:
+            name (str): The name of the wavefunction.
+            positive (Isosurface): The positive isosurface.
+            negative (Isosurface): The negative isosurface.
+
+        Returns:
+            Wavefunction: The created Wavefunction object.
+        """
+        self = cls.__new__(cls)
+        self._assemble(name, positive, negative)
+
+        return self
+
+    def _assemble(self, name, positive, negative):
+        self.collection = Collection(name)
+        self.positive = positive
         self.positive.material = Material(
             f"Wavefunction (Positive) - {Preset.get('isosurface.wavefunction.negative.material')}"
         )
-
-        kwargs["name"] = f"{name} - Negative"
-        kwargs["level"] = -self.positive.level
-        self.negative = Isosurface.read(filename, *args, scale=scale, **kwargs)
+        self.negative = negative
         self.negative.material = Material(
             f"Wavefunction (Negative) - {Preset.get('isosurface.wavefunction.negative.material')}"
         )
@@ -473,6 +832,7 @@ class Wavefunction:
         self.collection.add(self.negative)
 
     @classmethod
+    @bulk_edit("Import isosurface")
     def read(cls, *args, **kwargs):
         """
         Reads a wavefunction.
@@ -582,3 +942,390 @@ class Wavefunction:
         """
         self.positive.repeat(repetitions)
         self.negative.repeat(repetitions)
+
+    @bulk_edit("Isovalue sweep")
+    def sweep(self, levels, start=None, workers=None):
+        """
+        Animates the isosurface levels, see `Isosurface.sweep`. The negative
+        isosurface follows at the negated levels. Both are extracted together
+        from the shared density.
+
+        Args:
+            levels (list[float] | dict[int, float]): The levels of the positive isosurface.
+            start (int, optional): The first frame if 'levels' is a list. Default: The start of the scene.
+            workers (int, optional): Number of worker processes. Default: Preset value.
+        """
+        start, unique, indices = _schedule(levels, start)
+        surfaces = self.positive._isosurface_object.sweep(
+            unique + [-level for level in unique], workers
+        )
+        self.positive._animate(surfaces[: len(unique)], start, indices)
+        self.negative._animate(surfaces[len(unique) :], start, indices)
+
+
+class IsosurfaceSequence(Isosurface):
+    """
+    Represents an isosurface changing over time, e.g. of a molecular dynamics
+    run with one density file per frame. A background thread reads, extracts
+    and decimates the current and the following frames. On frame change the
+    prepared mesh is swapped in. A frame that is not ready yet keeps the last
+    shown one until it is, except for renders, which wait for it. The planar
+    dissolve is a modifier evaluated by Blender. Only a bounded number of
+    extracted frames is kept in memory, independent of the length of the
+    sequence.
+
+    Args:
+        pattern (str): Glob pattern of the files, one per frame, e.g. "run/frame_*.cube". Sorted naturally, i.e. "2" before "10".
+        name (str, optional): The name of the isosurface object. Default: The name of the first file.
+        level (float, optional): The isosurface level of all frames. Default: A tenth of the maximum of the first frame.
+        format (str, optional): The file format, see `Isosurface.read`.
+        scale (float, optional): Increase density grid.
+        adaptive (bool, optional): Only refine the density grid around the isosurface (.cube only). Default: Preset value.
+        start (int, optional): The frame of the first file. Default: The start of the scene.
+        cache_size (int, optional): Number of extracted frames kept in memory. Default: Preset value.
+        prefetch (int, optional): Number of following frames prepared in the background. Default: Preset value.
+        collection (Collection, optional): The collection to which the isosurface object belongs.
+
+    Attributes:
+        files (list[Path]): The file of each frame.
+        start (int): The frame of the first file.
+
+    Raises:
+        FileNotFoundError: If no file matches the pattern.
+    """
+
+    sequences = []
+
+    def __init__(
+        self,
+        pattern,
+        name=None,
+        level=None,
+        format=None,
+        scale=1,
+        adaptive=None,
+        start=None,
+        cache_size=None,
+        prefetch=None,
+        collection=None,
+    ):
+        self.files = sorted((Path(file) for file in glob(str(pattern))), key=_natural)
+        if not self.files:
+            raise FileNotFoundError(f"No files match {pattern}.")
+        self.start = bpy.context.scene.frame_start if start is None else start
+
+        if prefetch is None:
+            prefetch = Preset.get("isosurface.sequence.prefetch")
+        if cache_size is None:
+            cache_size = Preset.get("isosurface.sequence.cache_size")
+        self._prefetch = prefetch
+        # The current frame and the prefetched ones must fit
+        self._cache_size = max(cache_size, prefetch + 1)
+        self._arguments = {"format": format, "scale": scale, "adaptive": adaptive}
+        self._cache = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        # Read on the main thread, the background thread only decimates
+        self._triangle_budget = None
+        if Preset.get("isosurface.remesh") and Preset.get("isosurface.remesh.collapse"):
+            self._triangle_budget = Preset.get("isosurface.remesh.triangle_budget")
+        self._waiting = None
+        self._polling = False
+
+        first = Isosurface._open(
+            self.files[0], name, level, create=False, **self._arguments
+        )
+        surface = self._decimate(first.compute())
+        first.blender_object = first._create_mesh(surface)
+        self._store((0, first.level), surface)
+        self._shown = (0, first.level)
+
+        super().__init__(first, collection)
+        IsosurfaceSequence.sequences.append(self)
+        register_handlers()
+        self.show(bpy.context.scene.frame_current)
+
+    @classmethod
+    @bulk_edit("Import isosurface sequence")
+    def read(cls, *args, **kwargs):
+        """
+        Reads an isosurface sequence.
+
+        Args:
+            *args: Variable length arguments.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            IsosurfaceSequence: The created IsosurfaceSequence object.
+        """
+        return IsosurfaceSequence(*args, **kwargs)
+
+    def show(self, frame):
+        """
+        Shows the isosurface of a frame. Frames before the first and after
+        the last file show the first and last file respectively. A frame that
+        is not prepared yet is shown once it is, renders wait for it.
+
+        Args:
+            frame (int): The frame.
+        """
+        index = min(max(frame - self.start, 0), len(self.files) - 1)
+        key = (index, self.level)
+        self._waiting = None
+        if key != self._shown:
+            if bpy.app.background or bpy.app.is_job_running("RENDER"):
+                # Every rendered frame must show its own isosurface
+                self._swap(key, self._surface(key))
+            else:
+                surface = self._ready(key)
+                if surface is None:
+                    self._wait(key)
+                else:
+                    self._swap(key, surface)
+
+        self._prefetch_after(index)
+
+    def remesh(self, triangle_budget=None):
+        """
+        Decimates the frames down to the triangle budget in the background
+        thread, before they are shown. Planar regions are dissolved by a
+        modifier, so frame changes only swap the mesh.
+
+        Args:
+            triangle_budget (int, optional): The maximum number of triangles. Default: The current budget.
+        """
+        if triangle_budget is not None and triangle_budget != self._triangle_budget:
+            self._triangle_budget = triangle_budget
+            self.update()
+
+        modifiers = self.blender_object.modifiers
+        if Preset.get("isosurface.remesh.planar") and "Decimate" not in modifiers:
+            modifier = modifiers.new(name="Decimate", type="DECIMATE")
+            modifier.decimate_type = "DISSOLVE"
+            modifier.angle_limit = radians(Preset.get("isosurface.remesh.planar_angle"))
+        self.make_smooth()
+
+    def update(self):
+        """
+        Updates the isosurface of the current frame, e.g. after a change of
+        the level. Frames extracted at the previous level are discarded.
+        """
+        with self._lock:
+            self._cache.clear()
+        self._shown = None
+        self.show(bpy.context.scene.frame_current)
+
+    def close(self):
+        """
+        Stops the background thread and frees the cached frames. The
+        isosurface no longer follows the frame.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._waiting = None
+        with self._lock:
+            self._cache.clear()
+            self._pending.clear()
+        if self in IsosurfaceSequence.sequences:
+            IsosurfaceSequence.sequences.remove(self)
+
+    def _load(self, key):
+        """
+        Reads and extracts a frame. Does not access Blender.
+
+        Args:
+            key (tuple): The index of the file and the level.
+
+        Returns:
+            (numpy.ndarray, numpy.ndarray): The vertices and faces of the isosurface.
+        """
+        index, level = key
+        isosurface = Isosurface._open(
+            self.files[index],
+            self.files[index].stem,
+            level,
+            create=False,
+            **self._arguments,
+        )
+
+        return self._decimate(isosurface.compute())
+
+    def _decimate(self, surface):
+        # Also runs in the background thread
+        if self._triangle_budget is None:
+            return surface
+        return decimate_surface(*surface, self._triangle_budget)
+
+    def _swap(self, key, surface):
+        """
+        Shows an extracted frame.
+        """
+        vertices, faces = surface
+        mesh = outward_mesh(self.blender_object.data.name, vertices, faces)
+        self._replace_mesh(mesh)
+        self._shown = key
+
+    def _ready(self, key):
+        """
+        Returns the extracted frame from the cache, None if it is not ready.
+        """
+        with self._lock:
+            if key not in self._cache:
+                return None
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+    def _wait(self, key):
+        """
+        Shows a frame once the background thread prepared it. Polled by a
+        timer, as the thread cannot access Blender.
+        """
+        self._waiting = key
+        if not self._polling:
+            self._polling = True
+            bpy.app.timers.register(self._poll, first_interval=0.05)
+
+    def _poll(self):
+        key = self._waiting
+        if key is None or self not in IsosurfaceSequence.sequences:
+            self._polling = False
+            return None
+        with self._lock:
+            future = self._pending.get(key)
+            ready = key in self._cache or (future is not None and future.done())
+        if not ready:
+            return 0.05
+
+        self._waiting = None
+        self._polling = False
+        try:
+            # Raises the error of a failed extraction
+            self._swap(key, self._surface(key))
+        except ReferenceError:
+            # The object was deleted
+            self.close()
+        return None
+
+    def _fetch(self, key):
+        # Runs in the background thread
+        surface = self._load(key)
+        self._store(key, surface)
+
+        return surface
+
+    def _store(self, key, surface):
+        with self._lock:
+            self._pending.pop(key, None)
+            self._cache[key] = surface
+            self._cache.move_to_end(key)
+            # Least recently used frames are dropped first
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+    def _surface(self, key):
+        """
+        Returns the extracted frame from the cache, waits for its prefetch or
+        extracts it right away.
+        """
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            future = self._pending.pop(key, None)
+
+        if future is not None and not future.cancel():
+            return future.result()
+
+        return self._fetch(key)
+
+    def _prefetch_after(self, index):
+        """
+        Prepares the frame 'index' and the following ones in the background,
+        wrapping around for looped playback. Queued frames no longer needed
+        are dropped.
+        """
+        count = len(self.files)
+        keys = {
+            ((index + offset) % count, self.level)
+            for offset in range(min(self._prefetch, count - 1) + 1)
+        }
+        with self._lock:
+            for key, future in list(self._pending.items()):
+                if key not in keys and future.cancel():
+                    del self._pending[key]
+            for key in sorted(keys, key=lambda key: (key[0] - index) % count):
+                if key not in self._cache and key not in self._pending:
+                    self._pending[key] = self._executor.submit(self._fetch, key)
+
+
+def _natural(path):
+    # "frame_2" before "frame_10"
+    return [
+        int(part) if part.isdigit() else part for part in re.split(r"(\d+)", path.name)
+    ]
+
+
+def _schedule(levels, start=None):
+    """
+    Expands a level schedule into one level per frame.
+
+    Args:
+        levels (list[float] | dict[int, float]): One level per frame starting at 'start', or the levels at some frames, each held until the next one.
+        start (int, optional): The first frame if 'levels' is a list. Default: The start of the scene.
+
+    Returns:
+        tuple: The first frame, the distinct levels and the level index of each frame.
+    """
+    if isinstance(levels, dict):
+        frames = sorted(levels)
+        start = frames[0]
+        levels = [
+            levels[max(key for key in frames if key <= frame)]
+            for frame in range(start, frames[-1] + 1)
+        ]
+    elif start is None:
+        start = bpy.context.scene.frame_start
+
+    # Sorting instead of comparing every level with every other one
+    distinct, indices = unique([float(level) for level in levels], return_inverse=True)
+
+    return start, distinct.tolist(), indices.ravel().tolist()
+
+
+@persistent
+def _frame_change(scene, depsgraph=None):
+    """
+    Shows the isosurfaces of the current frame: swaps in the precomputed
+    meshes of the isovalue sweeps and loads the frames of the sequences.
+    """
+    for object in scene.objects:
+        meshes = object.get("blentom_sweep")
+        if meshes is None:
+            continue
+        index = scene.frame_current - object["blentom_sweep_start"]
+        mesh = bpy.data.meshes.get(meshes[min(max(index, 0), len(meshes) - 1)])
+        if mesh is not None and object.data != mesh:
+            object.data = mesh
+
+    for sequence in list(IsosurfaceSequence.sequences):
+        try:
+            sequence.show(scene.frame_current)
+        except ReferenceError:
+            # The object was deleted
+            sequence.close()
+
+
+def register_handlers():
+    """
+    Registers the frame change handler of the animated isosurfaces.
+    """
+    if _frame_change not in bpy.app.handlers.frame_change_pre:
+        bpy.app.handlers.frame_change_pre.append(_frame_change)
+
+
+def unregister_handlers():
+    """
+    Removes the frame change handler of the animated isosurfaces.
+    """
+    if _frame_change in bpy.app.handlers.frame_change_pre:
+        bpy.app.handlers.frame_change_pre.remove(_frame_change)
@@ -11,14 +11,23 @@ class MeshObject(Object):
     A class representing an mesh-like object in Blender. Not intended to be instantiated directly by the user but it is an interface implemented by all mesh-like objects like atoms, bonds and isosurfaces.
     """
 
-    def __init__(self):
+    def __init__(self, mesh=None):
         """
         Initializes a new MeshObject instance.
+
+        Args:
+            mesh (bpy.types.Mesh | None): Creates a new object of this mesh in the active collection. Default: None. Uses the active object.
         """
 
         super().__init__()
         self.modifiers = []
-        self.blender_object = bpy.context.active_object
+        if mesh is None:
+            self.blender_object = bpy.context.active_object
+        else:
+            # Unlike bpy.ops this neither records undo nor updates the view layer
+            self.blender_object = bpy.data.objects.new(mesh.name, mesh)
+            self.blender_object.location = bpy.context.scene.cursor.location
+            bpy.context.collection.objects.link(self.blender_object)
 
     @property
     def scale(self):
@@ -91,6 +100,26 @@ class MeshObject(Object):
             [True] * len(self.blender_object.data.polygons),
         )
 
+    def _replace_mesh(self, mesh):
+        """
+        Replaces the mesh data of the object, keeping its name, materials and shading.
+
+        Args:
+            mesh (bpy.types.Mesh): The new mesh data.
+        """
+        old = self.blender_object.data
+        name = old.name
+        for material in old.materials:
+            mesh.materials.append(material)
+        smooth = len(old.polygons) > 0 and old.polygons[0].use_smooth
+
+        self.blender_object.data = mesh
+        if old.users == 0:
+            bpy.data.meshes.remove(old)
+        mesh.name = name
+        if smooth:
+            self.make_smooth()
+
     def insert_keyframe(self, frame=None):
         """
         Inserts a keyframe for the position, rotation scale of the object at frame.
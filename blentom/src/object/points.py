@@ -0,0 +1,740 @@
+from pathlib import Path
+
+import bpy
+import numpy as np
+
+from .atom import Atom
+from .object import Object
+from ..utils.animation import Animation
+from ..utils.collection import Collection
+from ..utils.material import Material
+from ..utils.periodic_table import PeriodicTable
+from ..utils.preset import Preset
+
+
+class PointAtoms(Object):
+    """
+    Represents a molecule or surface as a single point mesh. The atoms are
+    rendered as points and the bonds are derived by geometry nodes from the
+    distances and covalent radii of the atoms whenever the object is
+    evaluated. Moving or animating the atoms therefore updates the bonds
+    without any bond objects, constraints or Python involved.
+
+    Note:
+        Only atoms in neighbouring cells of a grid with the bond cutoff as
+        cell size are tested against each other, so the evaluation time grows
+        linearly with the number of atoms.
+
+    Attributes:
+        collection (Collection): The collection containing the object.
+        elements (list[str]): The chemical symbols of the elements present, in order of their index.
+    """
+
+    def __init__(self, symbols, positions, name="Atoms"):
+        """
+        Initializes a new PointAtoms instance.
+
+        Args:
+            symbols (list[str]): The chemical symbol of every atom.
+            positions (ndarray): The positions of the atoms.
+            name (str): The name of the object. Default: "Atoms".
+        """
+        super().__init__()
+        self.elements = sorted(set(symbols))
+        self.collection = Collection(name)
+
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+        mesh = bpy.data.meshes.new(name)
+        mesh.vertices.add(len(positions))
+        mesh.vertices.foreach_set("co", positions.ravel())
+
+        index = {element: i for i, element in enumerate(self.elements)}
+        attributes = {
+            "element": ("INT", [index[symbol] for symbol in symbols]),
+            "radius": (
+                "FLOAT",
+                [
+                    PeriodicTable.get(symbol).radius * Atom._get_preset("scale", symbol)
+                    for symbol in symbols
+                ],
+            ),
+            "covalent_radius": (
+                "FLOAT",
+                [PeriodicTable.get(symbol).covalent_radius for symbol in symbols],
+            ),
+        }
+        for attribute, (type_, values) in attributes.items():
+            mesh.attributes.new(attribute, type_, "POINT").data.foreach_set(
+                "value", values
+            )
+        mesh.update()
+
+        self.blender_object = bpy.data.objects.new(name, mesh)
+        self.collection.add(self)
+
+        modifier = self.blender_object.modifiers.new(name="Bonds", type="NODES")
+        modifier.node_group = self._node_group(f"Point Atoms - {name}")
+        self.bond_factor = Preset.get("bonds.factor")
+        self.bond_thickness = Preset.get("bonds.thickness")
+        self.bond_sides = Preset.get("bonds.sides")
+
+    @classmethod
+    def ase(cls, atoms, name=None):
+        """
+        Creates a PointAtoms object from an ASE atoms object.
+
+        Args:
+            atoms (ase.Atoms): The ASE atoms object.
+            name (str | None): The name of the object. Default: None. Chemical formula.
+
+        Returns:
+            PointAtoms: The created object.
+        """
+        name = atoms.get_chemical_formula() if name is None else name
+
+        return PointAtoms(atoms.get_chemical_symbols(), atoms.positions, name)
+
+    @classmethod
+    def read(cls, filename, name=None, format=None):
+        """
+        Reads atoms from a file. All frames of a trajectory (e.g. XDATCAR) are
+        keyframed.
+
+        Args:
+            filename (str): The path to the file.
+            name (str | None): The name of the object. Default: None. Name of the file.
+            format (str | None): The file format. Default: None. Guess format.
+
+        Returns:
+            PointAtoms: The created object.
+
+        Examples:
+            >>> atoms = PointAtoms.read("XDATCAR", format="vasp-xdatcar")
+        """
+        # Delayed import to keep the registration of the add-on fast
+        from ase.io import read as aread
+
+        filename = Path(filename)
+        name = filename.stem if name is None else name
+        if format is None and filename.stem == "XDATCAR":
+            format = "vasp-xdatcar"
+
+        frames = aread(str(filename), format=format, index=":")
+        atoms = PointAtoms.ase(frames[0], name)
+        if len(frames) > 1:
+            animation = Animation()
+            multiplier = Preset.get("animation.frame_multiplier")
+            atoms.insert_keyframes(
+                [aux.positions for aux in frames],
+                [frame * multiplier for frame in range(len(frames))],
+            )
+            animation.final_frame = (len(frames) - 1) * multiplier
+
+        return atoms
+
+    @property
+    def bond_factor(self):
+        """
+        Atoms are bonded if their distance is smaller than this factor times the sum of their covalent radii.
+
+        Returns:
+            float: The factor.
+        """
+        return self._get_input("Bond Factor")
+
+    @bond_factor.setter
+    def bond_factor(self, factor):
+        self._set_input("Bond Factor", factor)
+
+    @property
+    def bond_thickness(self):
+        """
+        The radius of the bonds.
+
+        Returns:
+            float: The radius.
+        """
+        return self._get_input("Bond Thickness")
+
+    @bond_thickness.setter
+    def bond_thickness(self, thickness):
+        self._set_input("Bond Thickness", thickness)
+
+    @property
+    def bond_sides(self):
+        """
+        The number of sides of the bonds.
+
+        Returns:
+            int: The number of sides.
+        """
+        return self._get_input("Bond Sides")
+
+    @bond_sides.setter
+    def bond_sides(self, sides):
+        self._set_input("Bond Sides", sides)
+
+    @property
+    def positions(self):
+        """
+        The positions of the atoms.
+
+        Returns:
+            ndarray: The positions, one row per atom.
+        """
+        mesh = self.blender_object.data
+        positions = np.zeros(3 * len(mesh.vertices), dtype=np.float32)
+        mesh.vertices.foreach_get("co", positions)
+
+        return positions.reshape(-1, 3)
+
+    @positions.setter
+    def positions(self, positions):
+        """
+        Moves the atoms. The bonds follow automatically.
+
+        Args:
+            positions (ndarray): The positions, one row per atom.
+        """
+        mesh = self.blender_object.data
+        positions = np.asarray(positions, dtype=np.float32)
+        mesh.vertices.foreach_set("co", positions.ravel())
+        mesh.update()
+
+    def insert_keyframe(self, positions, frame=None):
+        """
+        Sets the positions of the atoms and inserts a keyframe for them.
+
+        Args:
+            positions (ndarray): The positions, one row per atom.
+            frame (int | None): The frame. Default: None. The current frame.
+        """
+        frame = Animation().current_frame if frame is None else frame
+        self.insert_keyframes([positions], [frame])
+
+    def insert_keyframes(self, trajectory, frames):
+        """
+        Inserts keyframes for the positions of the atoms at many frames at
+        once. The keyframes are written into the F-curves directly, one
+        array per coordinate, instead of one insertion per atom and frame.
+
+        Args:
+            trajectory (ndarray): The positions at every frame, shape (frames, atoms, 3).
+            frames (list[int]): The frames.
+        """
+        # Delayed import to keep the registration of the add-on fast
+        from bpy_extras import anim_utils
+
+        trajectory = np.asarray(trajectory, dtype=np.float32)
+        frames = np.asarray(frames, dtype=np.float32)
+        self.positions = trajectory[0]
+
+        mesh = self.blender_object.data
+        if mesh.animation_data is None:
+            mesh.animation_data_create()
+        animation_data = mesh.animation_data
+        if animation_data.action is None:
+            action = bpy.data.actions.new(f"{mesh.name} - Trajectory")
+            slot = action.slots.new(id_type="MESH", name=mesh.name)
+            animation_data.action = action
+            animation_data.action_slot = slot
+        channelbag = anim_utils.action_ensure_channelbag_for_slot(
+            animation_data.action, animation_data.action_slot
+        )
+
+        interpolation = (
+            bpy.types.Keyframe.bl_rna.properties["interpolation"]
+            .enum_items[bpy.context.preferences.edit.keyframe_new_interpolation_type]
+            .value
+        )
+        points = np.empty((len(frames), 2), dtype=np.float32)
+        points[:, 0] = frames
+        for atom in range(trajectory.shape[1]):
+            data_path = f"vertices[{atom}].co"
+            for axis in range(3):
+                fcurve = channelbag.fcurves.find(data_path, index=axis)
+                if fcurve is None:
+                    fcurve = channelbag.fcurves.new(data_path, index=axis)
+                points[:, 1] = trajectory[:, atom, axis]
+                _add_keyframes(fcurve, points, interpolation)
+
+    def _get_input(self, name):
+        identifier = self._modifier.node_group.interface.items_tree[name].identifier
+        return self._modifier[identifier]
+
+    def _set_input(self, name, value):
+        identifier = self._modifier.node_group.interface.items_tree[name].identifier
+        self._modifier[identifier] = value
+        self.blender_object.update_tag()
+
+    @property
+    def _modifier(self):
+        return self.blender_object.modifiers["Bonds"]
+
+    def _node_group(self, name):
+        """
+        Builds the geometry nodes turning the point mesh into atoms and bonds.
+
+        The atoms are sorted into a grid of cells as large as the longest
+        possible bond. Every atom is paired with the atoms of its own and the
+        26 neighbouring cells. Pairs closer than the bond factor times the sum
+        of the covalent radii, and not excluded by the "bonds.no_bonds"
+        preset, are turned into two half bonds taking the material of their
+        atom.
+
+        Args:
+            name (str): The name of the node group.
+
+        Returns:
+            bpy.types.GeometryNodeTree: The node group.
+        """
+        tree = bpy.data.node_groups.new(name, "GeometryNodeTree")
+        tree.interface.new_socket(
+            "Geometry", in_out="INPUT", socket_type="NodeSocketGeometry"
+        )
+        tree.interface.new_socket(
+            "Bond Factor", in_out="INPUT", socket_type="NodeSocketFloat"
+        )
+        tree.interface.new_socket(
+            "Bond Thickness", in_out="INPUT", socket_type="NodeSocketFloat"
+        )
+        tree.interface.new_socket(
+            "Bond Sides", in_out="INPUT", socket_type="NodeSocketInt"
+        )
+        tree.interface.new_socket(
+            "Geometry", in_out="OUTPUT", socket_type="NodeSocketGeometry"
+        )
+        nodes = _Nodes(tree)
+        group_input = nodes.new("NodeGroupInput")
+        group_output = nodes.new("NodeGroupOutput")
+        geometry = group_input.outputs["Geometry"]
+
+        # Atoms
+        atoms = nodes.new("GeometryNodeMeshToPoints", Mesh=geometry)
+        nodes.link(nodes.attribute("radius", "FLOAT"), atoms.inputs["Radius"])
+
+        # Atoms sorted into a grid of cells as large as the longest possible
+        # bond, so bonded atoms are in the same or neighbouring cells
+        longest = nodes.new(
+            "GeometryNodeAttributeStatistic",
+            Geometry=geometry,
+            Attribute=nodes.attribute("covalent_radius", "FLOAT"),
+        )
+        size = nodes.math(
+            "MAXIMUM",
+            nodes.math(
+                "MULTIPLY",
+                nodes.math("MULTIPLY", nodes._socket(longest.outputs, "Max"), 2),
+                group_input.outputs["Bond Factor"],
+            ),
+            1e-3,
+        )
+        bounds = nodes.new("GeometryNodeBoundBox", Geometry=geometry)
+        # Shifted by one, so the neighbours of every cell have valid coordinates
+        cell = nodes.vector_math(
+            "ADD",
+            nodes.vector_math(
+                "FLOOR",
+                nodes.vector_math(
+                    "SCALE",
+                    nodes.vector_math(
+                        "SUBTRACT", nodes.position(), bounds.outputs["Min"]
+                    ),
+                    nodes.math("DIVIDE", 1, size),
+                ),
+            ),
+            (1, 1, 1),
+        )
+        cells = nodes.vector_math(
+            "ADD",
+            nodes.vector_math(
+                "FLOOR",
+                nodes.vector_math(
+                    "SCALE",
+                    nodes.vector_math(
+                        "SUBTRACT", bounds.outputs["Max"], bounds.outputs["Min"]
+                    ),
+                    nodes.math("DIVIDE", 1, size),
+                ),
+            ),
+            (3, 3, 3),
+        )
+        key = nodes.cell_key(cell, cells)
+        sorted_ = nodes.new("GeometryNodeSortElements", Geometry=geometry)
+        sorted_.domain = "POINT"
+        nodes.link(key, sorted_.inputs["Sort Key"])
+        sorted_ = nodes.store("cell", "INT", sorted_.outputs["Geometry"], key)
+        sorted_ = nodes.store(
+            "atom", "INT", sorted_, nodes.new("GeometryNodeInputIndex").outputs[0]
+        )
+        # The atoms of a cell are consecutive, every atom stores the range
+        occupancy = nodes.new("GeometryNodeAccumulateField")
+        occupancy.data_type = "INT"
+        occupancy.domain = "POINT"
+        value, group = [socket for socket in occupancy.inputs if socket.enabled]
+        nodes.set(value, 1)
+        nodes.set(group, nodes.attribute("cell", "INT"))
+        sorted_ = nodes.store(
+            "first",
+            "INT",
+            sorted_,
+            nodes.math(
+                "ADD",
+                nodes.math(
+                    "SUBTRACT",
+                    nodes.attribute("atom", "INT"),
+                    nodes._socket(occupancy.outputs, "Leading"),
+                ),
+                1,
+            ),
+        )
+        sorted_ = nodes.store(
+            "count", "INT", sorted_, nodes._socket(occupancy.outputs, "Total")
+        )
+        # Cells are looked up by their key as position on the x-axis
+        lookup = nodes.new(
+            "GeometryNodeSetPosition",
+            Geometry=sorted_,
+            Position=nodes.new(
+                "ShaderNodeCombineXYZ", X=nodes.attribute("cell", "INT")
+            ).outputs[0],
+        ).outputs["Geometry"]
+
+        # One query per atom and neighbouring cell
+        queries = nodes.new(
+            "GeometryNodeDuplicateElements", Geometry=sorted_, Amount=27
+        )
+        queries.domain = "POINT"
+        neighbour = queries.outputs["Duplicate Index"]
+        offset = nodes.new(
+            "ShaderNodeCombineXYZ",
+            X=nodes.math("MODULO", neighbour, 3),
+            Y=nodes.math(
+                "MODULO", nodes.math("FLOOR", nodes.math("DIVIDE", neighbour, 3)), 3
+            ),
+            Z=nodes.math("FLOOR", nodes.math("DIVIDE", neighbour, 9)),
+        ).outputs[0]
+        target = nodes.cell_key(
+            nodes.vector_math(
+                "SUBTRACT", nodes.vector_math("ADD", cell, offset), (1, 1, 1)
+            ),
+            cells,
+        )
+        nearest = nodes.new("GeometryNodeSampleNearest", Geometry=lookup)
+        nearest.domain = "POINT"
+        nodes.link(
+            nodes.new("ShaderNodeCombineXYZ", X=target).outputs[0],
+            nearest.inputs["Sample Position"],
+        )
+        found = nearest.outputs["Index"]
+        occupied = nodes.compare(
+            "EQUAL",
+            "INT",
+            nodes.sample(lookup, nodes.attribute("cell", "INT"), found, "INT"),
+            target,
+        )
+        queries = nodes.store(
+            "first",
+            "INT",
+            queries.outputs["Geometry"],
+            nodes.sample(lookup, nodes.attribute("first", "INT"), found, "INT"),
+        )
+
+        # Every atom paired with the atoms of its neighbouring cells, stored as
+        # one point per pair
+        pairs = nodes.new(
+            "GeometryNodeDuplicateElements",
+            Geometry=queries,
+            Amount=nodes.math(
+                "MULTIPLY",
+                nodes.sample(lookup, nodes.attribute("count", "INT"), found, "INT"),
+                occupied,
+            ),
+        )
+        pairs.domain = "POINT"
+        pairs = nodes.store(
+            "partner",
+            "INT",
+            pairs.outputs["Geometry"],
+            nodes.math(
+                "ADD", nodes.attribute("first", "INT"), pairs.outputs["Duplicate Index"]
+            ),
+        )
+
+        partner = nodes.attribute("partner", "INT")
+        partner_position = nodes.sample(
+            sorted_, nodes.position(), partner, "FLOAT_VECTOR"
+        )
+        partner_radius = nodes.sample(
+            sorted_, nodes.attribute("covalent_radius", "FLOAT"), partner, "FLOAT"
+        )
+        partner_element = nodes.sample(
+            sorted_, nodes.attribute("element", "INT"), partner, "INT"
+        )
+
+        distance = nodes.vector_math("DISTANCE", nodes.position(), partner_position)
+        cutoff = nodes.math(
+            "MULTIPLY",
+            nodes.math(
+                "ADD", nodes.attribute("covalent_radius", "FLOAT"), partner_radius
+            ),
+            group_input.outputs["Bond Factor"],
+        )
+        keep = nodes.boolean(
+            "AND",
+            nodes.compare("LESS_EQUAL", "FLOAT", distance, cutoff),
+            nodes.compare(
+                "GREATER_THAN", "INT", partner, nodes.attribute("atom", "INT")
+            ),
+        )
+
+        # Pairs of elements without bonds
+        elements = len(self.elements)
+        pair_code = nodes.math(
+            "ADD",
+            nodes.math("MULTIPLY", nodes.attribute("element", "INT"), elements),
+            partner_element,
+        )
+        for a, b in Preset.get("bonds.no_bonds"):
+            if a in self.elements and b in self.elements:
+                for i, j in ((a, b), (b, a)):
+                    code = self.elements.index(i) * elements + self.elements.index(j)
+                    excluded = nodes.compare("EQUAL", "FLOAT", pair_code, code)
+                    keep = nodes.boolean("AND", keep, nodes.boolean("NOT", excluded))
+
+        bonded = nodes.new(
+            "GeometryNodeSeparateGeometry", Geometry=pairs, Selection=keep
+        )
+        bonded.domain = "POINT"
+        bonded = nodes.store(
+            "pair",
+            "INT",
+            bonded.outputs["Selection"],
+            nodes.new("GeometryNodeInputIndex").outputs[0],
+        )
+
+        # Four points per bond: start and end of the two halves
+        ends = nodes.new("GeometryNodeDuplicateElements", Geometry=bonded, Amount=4)
+        ends.domain = "POINT"
+        corner = ends.outputs["Duplicate Index"]
+        half = nodes.math("FLOOR", nodes.math("DIVIDE", corner, 2))
+        end = nodes.math("MODULO", corner, 2)
+
+        start = nodes.position()
+        direction = nodes.vector_math("SUBTRACT", partner_position, start)
+        offset = nodes.vector_math(
+            "SCALE",
+            direction,
+            nodes.math("MULTIPLY", nodes.math("ADD", half, end), 0.5),
+        )
+        moved = nodes.new(
+            "GeometryNodeSetPosition",
+            Geometry=ends.outputs["Geometry"],
+            Position=nodes.vector_math("ADD", start, offset),
+        )
+        own_element = nodes.attribute("element", "INT")
+        element = nodes.math(
+            "ADD",
+            own_element,
+            nodes.math(
+                "MULTIPLY", half, nodes.math("SUBTRACT", partner_element, own_element)
+            ),
+        )
+        moved = nodes.store("element", "INT", moved.outputs["Geometry"], element)
+
+        curves = nodes.new(
+            "GeometryNodePointsToCurves",
+            Points=moved,
+            Weight=end,
+        )
+        nodes.link(
+            nodes.math(
+                "ADD", nodes.math("MULTIPLY", nodes.attribute("pair", "INT"), 2), half
+            ),
+            curves.inputs["Curve Group ID"],
+        )
+        profile = nodes.new(
+            "GeometryNodeCurvePrimitiveCircle",
+            Resolution=group_input.outputs["Bond Sides"],
+            Radius=group_input.outputs["Bond Thickness"],
+        )
+        bonds = nodes.new(
+            "GeometryNodeCurveToMesh",
+            Curve=curves.outputs["Curves"],
+            **{"Profile Curve": profile.outputs["Curve"]},
+        )
+        bonds = nodes.new("GeometryNodeSetShadeSmooth", Geometry=bonds.outputs["Mesh"])
+
+        joined = nodes.new("GeometryNodeJoinGeometry")
+        nodes.link(bonds.outputs["Geometry"], joined.inputs["Geometry"])
+        nodes.link(atoms.outputs["Points"], joined.inputs["Geometry"])
+        geometry = joined.outputs["Geometry"]
+
+        # Materials by element
+        for i, symbol in enumerate(self.elements):
+            material = Material(
+                f"{PeriodicTable.get(symbol).name} - {Atom._get_preset('material', symbol)}"
+            )
+            selection = nodes.compare(
+                "EQUAL", "INT", nodes.attribute("element", "INT"), i
+            )
+            geometry = nodes.new(
+                "GeometryNodeSetMaterial",
+                Geometry=geometry,
+                Selection=selection,
+                Material=material.material,
+            ).outputs["Geometry"]
+
+        nodes.link(geometry, group_output.inputs["Geometry"])
+
+        return tree
+
+
+class _Nodes:
+    """
+    Helper building a geometry node tree. Inputs can be sockets or values.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+
+    def new(self, type_, **inputs):
+        node = self.tree.nodes.new(type_)
+        for name, value in inputs.items():
+            self.set(self._socket(node.inputs, name), value)
+
+        return node
+
+    def link(self, output, input):
+        self.tree.links.new(output, input)
+
+    def set(self, input, value):
+        if isinstance(value, bpy.types.NodeSocket):
+            self.link(value, input)
+        else:
+            input.default_value = value
+
+    def attribute(self, name, data_type):
+        node = self.tree.nodes.new("GeometryNodeInputNamedAttribute")
+        node.data_type = data_type
+        node.inputs["Name"].default_value = name
+
+        return self._socket(node.outputs, "Attribute")
+
+    def store(self, name, data_type, geometry, value):
+        node = self.tree.nodes.new("GeometryNodeStoreNamedAttribute")
+        node.data_type = data_type
+        node.domain = "POINT"
+        node.inputs["Name"].default_value = name
+        self.set(node.inputs["Geometry"], geometry)
+        self.set(self._socket(node.inputs, "Value"), value)
+
+        return node.outputs["Geometry"]
+
+    def position(self):
+        return self.tree.nodes.new("GeometryNodeInputPosition").outputs["Position"]
+
+    def sample(self, geometry, value, index, data_type):
+        node = self.tree.nodes.new("GeometryNodeSampleIndex")
+        node.data_type = data_type
+        node.domain = "POINT"
+        self.set(node.inputs["Geometry"], geometry)
+        self.set(self._socket(node.inputs, "Value"), value)
+        self.set(node.inputs["Index"], index)
+
+        return self._socket(node.outputs, "Value")
+
+    def math(self, operation, a, b=None):
+        node = self.tree.nodes.new("ShaderNodeMath")
+        node.operation = operation
+        self.set(node.inputs[0], a)
+        if b is not None:
+            self.set(node.inputs[1], b)
+
+        return node.outputs[0]
+
+    def vector_math(self, operation, a, b=None):
+        node = self.tree.nodes.new("ShaderNodeVectorMath")
+        node.operation = operation
+        self.set(node.inputs[0], a)
+        if b is not None:
+            # The scale operation takes a float as second input
+            self.set(
+                node.inputs["Scale"] if operation == "SCALE" else node.inputs[1], b
+            )
+
+        return node.outputs["Value" if operation == "DISTANCE" else "Vector"]
+
+    def cell_key(self, cell, cells):
+        # Index of a cell in a grid of 'cells' cells along each axis
+        x, y, z = self.new("ShaderNodeSeparateXYZ", Vector=cell).outputs
+        nx, ny, _ = self.new("ShaderNodeSeparateXYZ", Vector=cells).outputs
+
+        return self.math(
+            "ADD",
+            x,
+            self.math(
+                "MULTIPLY", nx, self.math("ADD", y, self.math("MULTIPLY", ny, z))
+            ),
+        )
+
+    def compare(self, operation, data_type, a, b):
+        node = self.tree.nodes.new("FunctionNodeCompare")
+        node.data_type = data_type
+        node.operation = operation
+        inputs = [socket for socket in node.inputs if socket.enabled]
+        self.set(inputs[0], a)
+        self.set(inputs[1], b)
+
+        return node.outputs["Result"]
+
+    def boolean(self, operation, a, b=None):
+        node = self.tree.nodes.new("FunctionNodeBooleanMath")
+        node.operation = operation
+        self.set(node.inputs[0], a)
+        if b is not None:
+            self.set(node.inputs[1], b)
+
+        return node.outputs["Boolean"]
+
+    @staticmethod
+    def _socket(sockets, name):
+        # Some nodes have a socket of the same name for every data type
+        return next(
+            socket for socket in sockets if socket.name == name and socket.enabled
+        )
+
+
+def _add_keyframes(fcurve, points, interpolation):
+    """
+    Adds keyframes to an F-curve in one go, replacing existing keyframes at
+    the same frames like `keyframe_insert`.
+
+    Args:
+        fcurve (bpy.types.FCurve): The F-curve.
+        points (ndarray): The frame and value of every keyframe, shape (n, 2).
+        interpolation (int): The value of the interpolation type.
+    """
+    keyframes = fcurve.keyframe_points
+    existing = np.empty(2 * len(keyframes), dtype=np.float32)
+    keyframes.foreach_get("co", existing)
+    replaced = np.isin(existing[::2], points[:, 0])
+    for point in reversed(np.flatnonzero(replaced)):
+        keyframes.remove(keyframes[int(point)], fast=True)
+
+    count = len(keyframes)
+    co = np.empty(2 * count, dtype=np.float32)
+    keyframes.foreach_get("co", co)
+    interpolations = np.empty(count, dtype=np.int32)
+    keyframes.foreach_get("interpolation", interpolations)
+
+    keyframes.add(len(points))
+    keyframes.foreach_set("co", np.concatenate((co, points.ravel())))
+    keyframes.foreach_set(
+        "interpolation",
+        np.concatenate((interpolations, np.full(len(points), interpolation))).astype(
+            np.int32
+        ),
+    )
+    # Sorts the keyframes and updates their handles
+    fcurve.update()
@@ -0,0 +1,258 @@
+from pathlib import Path
+from uuid import uuid4
+
+import bpy
+import numpy as np
+
+from .object import Object
+from ..utils.collection import Collection
+from ..utils.lib import VASP_grid, gaussian_grid, read_cube
+from ..utils.material import Material
+from ..utils.preset import Preset
+from .. import __user_directory__
+
+
+class Volume(Object):
+    """
+    Represents a density stored as native Blender volume (OpenVDB).
+
+    The isosurfaces are meshes driven by "Volume to Mesh" modifiers, i.e. they
+    are created by Blender itself. Changing the level only changes the
+    threshold of the modifiers and requires no mesh extraction in Python.
+
+    Attributes:
+        collection (Collection): The collection containing the volume and its isosurfaces.
+        positive (Object): The isosurface of the positive lobe.
+        negative (Object | None): The isosurface of the negative lobe.
+        max (float): The maximum absolute value of the density.
+    """
+
+    volume_directory = __user_directory__ / "volumes"
+
+    def __init__(self, density, origin, axes, name, level=None, negative=False):
+        """
+        Initializes a new Volume instance.
+
+        Args:
+            density (ndarray): The density data.
+            origin (tuple | Vector): The position of the first grid point.
+            axes (ndarray): The matrix placing grid point p at p @ axes + origin, see `VASP_grid` and `gaussian_grid`.
+            name (str): The name of the volume.
+            level (float, optional): The isosurface level. Default: A tenth of the maximum.
+            negative (bool): Whether to create an isosurface for the negative lobe as well.
+        """
+        super().__init__()
+        self.max = float(np.abs(density).max())
+        self.collection = Collection(name)
+
+        filepath = Volume._write(density, origin, axes, negative)
+        volume = bpy.data.volumes.new(name)
+        volume.filepath = str(filepath)
+        self.blender_object = bpy.data.objects.new(name, volume)
+        self.blender_object.hide_render = True
+        self.collection.add(self)
+
+        self.positive = self._isosurface(f"{name} - Positive", "density")
+        self.negative = None
+        if negative:
+            self.negative = self._isosurface(f"{name} - Negative", "negative")
+            self.positive.blender_object.active_material = Material(
+                f"Wavefunction (Positive) - {Preset.get('isosurface.wavefunction.positive.material')}"
+            ).material
+            self.negative.blender_object.active_material = Material(
+                f"Wavefunction (Negative) - {Preset.get('isosurface.wavefunction.negative.material')}"
+            ).material
+        else:
+            self.positive.blender_object.active_material = Material(
+                f"ChargeDensity - {Preset.get('isosurface.chargedensity.material')}"
+            ).material
+
+        self.level = self.max / 10 if level is None else level
+
+    @classmethod
+    def read(cls, filename, name=None, level=None, format=None, negative=None):
+        """
+        Reads a density from a file into a volume.
+
+        Args:
+            filename (str): The path to the file.
+            name (str, optional): The name of the volume. Default: Name of the file.
+            level (float, optional): The isosurface level.
+            format (str, optional): The file format. Default: Guess from the filename.
+            negative (bool, optional): Whether to create an isosurface for the negative lobe. Default: True for .cube files.
+
+        Returns:
+            Volume: The created Volume object.
+
+        Raises:
+            ValueError: If the file format is not supported.
+        """
+        filename = Path(filename)
+        if name is None:
+            name = filename.stem
+
+        if format is None:
+            format = filename.suffix if filename.suffix else filename.stem
+
+        if format == ".cube":
+            density, origin, axes, *_ = read_cube(filename)
+            origin, axes = gaussian_grid(origin, axes)
+            negative = True if negative is None else negative
+        elif format.lower() in ("parchg", "chgcar", "vasp", ".vasp"):
+            # Delayed import to keep the registration of the add-on fast
+            from ase.calculators.vasp import VaspChargeDensity
+
+            vasp = VaspChargeDensity(str(filename))
+            density = vasp.chg[-1]
+            origin, axes = VASP_grid(vasp.atoms[-1].cell[:], density.shape)
+            negative = False if negative is None else negative
+        else:
+            raise ValueError(f"Unsupported file format: {format}")
+
+        return Volume(density, origin, axes, name, level=level, negative=negative)
+
+    @property
+    def level(self):
+        """
+        The isosurface level.
+
+        Returns:
+            float: The isosurface level.
+        """
+        return self.positive.blender_object.modifiers["Volume to Mesh"].threshold
+
+    @level.setter
+    def level(self, level):
+        """
+        Sets the isosurface level. The negative lobe uses the negative level.
+
+        Args:
+            level (float): The isosurface level.
+        """
+        for isosurface in (self.positive, self.negative):
+            if isosurface is not None:
+                isosurface.blender_object.modifiers["Volume to Mesh"].threshold = abs(
+                    level
+                )
+
+    @property
+    def name(self):
+        """
+        The name of the volume.
+
+        Returns:
+            str: The name of the volume.
+        """
+        return self.collection.name
+
+    @name.setter
+    def name(self, name):
+        """
+        Sets the name of the volume.
+
+        Args:
+            name (str): The name of the volume.
+        """
+        self.collection.name = name
+        self.blender_object.name = name
+        self.positive.name = f"{name} - Positive"
+        if self.negative is not None:
+            self.negative.name = f"{name} - Negative"
+
+    def delete(self):
+        """
+        Deletes the volume, its isosurfaces and the file written for it.
+        """
+        for isosurface in (self.positive, self.negative):
+            if isosurface is not None:
+                isosurface.delete()
+
+        volume = self.blender_object.data if self.blender_object else None
+        super().delete()
+        if volume is not None:
+            Volume.remove([volume])
+
+    @classmethod
+    def remove(cls, volumes):
+        """
+        Removes volume datablocks together with the files `Volume` wrote for
+        them. Files elsewhere are kept.
+
+        Args:
+            volumes (list[bpy.types.Volume]): The volumes to remove.
+        """
+        directory = cls.volume_directory.resolve()
+        filepaths = [Path(bpy.path.abspath(volume.filepath)) for volume in volumes]
+        bpy.data.batch_remove(volumes)
+
+        for filepath in filepaths:
+            if filepath.parent.resolve() == directory:
+                filepath.unlink(missing_ok=True)
+
+    def _isosurface(self, name, grid):
+        """
+        Creates a mesh object generating the isosurface of a grid of the volume.
+
+        Args:
+            name (str): The name of the isosurface.
+            grid (str): The name of the grid in the volume.
+
+        Returns:
+            Object: The isosurface.
+        """
+        isosurface = Object(bpy.data.objects.new(name, bpy.data.meshes.new(name)))
+        self.collection.add(isosurface)
+
+        modifier = isosurface.blender_object.modifiers.new(
+            name="Volume to Mesh", type="VOLUME_TO_MESH"
+        )
+        modifier.object = self.blender_object
+        modifier.grid_name = grid
+        modifier.resolution_mode = "GRID"
+        modifier.use_smooth_shade = Preset.get("isosurface.smooth")
+
+        return isosurface
+
+    @classmethod
+    def _write(cls, density, origin, axes, negative=False):
+        """
+        Writes the density into a new .vdb file inside the `volume_directory`.
+        Every volume gets a file of its own, also volumes of the same name.
+
+        Args:
+            density (ndarray): The density data.
+            origin (tuple | Vector): The position of the first grid point.
+            axes (ndarray): The matrix placing grid point p at p @ axes + origin.
+            negative (bool): Whether to store the negated density as grid "negative" as well.
+
+        Returns:
+            Path: The path to the written file.
+        """
+        try:
+            import openvdb
+        except ImportError:
+            # Name of the module before Blender 4.4
+            import pyopenvdb as openvdb
+
+        # OpenVDB transforms row vectors, the translation is the last row
+        matrix = np.zeros((4, 4))
+        matrix[:3, :3] = [list(axis) for axis in axes]
+        matrix[3, :3] = list(origin)
+        matrix[3, 3] = 1
+        transform = openvdb.createLinearTransform(matrix.tolist())
+
+        grids = []
+        for grid_name, values in (("density", density), ("negative", -density)):
+            if grid_name == "negative" and not negative:
+                continue
+            grid = openvdb.FloatGrid()
+            grid.copyFromArray(np.ascontiguousarray(values, dtype=np.float32))
+            grid.name = grid_name
+            grid.transform = transform
+            grids.append(grid)
+
+        cls.volume_directory.mkdir(parents=True, exist_ok=True)
+        filepath = cls.volume_directory / f"{uuid4().hex}.vdb"
+        openvdb.write(str(filepath), grids=grids)
+
+        return filepath
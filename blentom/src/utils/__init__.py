@@ -1,6 +1,8 @@
 # Expose functionality
 from .animation import Animation
+from .bulk import bulk_edit
 from .collection import Collection
 from .lib import *
 from .material import Material
 from .preset import Preset
+from .profiling import profile, span
@@ -0,0 +1,212 @@
+import logging
+from copy import deepcopy
+from json import dumps as jdumps
+from json import load as jload
+from pathlib import Path
+from time import perf_counter
+
+import bpy
+
+from .animation import Animation
+from .lib import reset
+from .preset import Preset
+from .utils import deep_dict_update
+from ..object.atom import Atoms
+from ..object.camera import Camera
+from ..object.isosurface import ChargeDensity, Wavefunction
+
+CAMERA_SETTINGS = (
+    "position",
+    "rotation",
+    "resolution",
+    "lens",
+    "focuslength",
+    "orthographic_scale",
+)
+
+
+def run_batch(manifest):
+    """
+    Renders all jobs of a manifest one after another in the running Blender
+    process. Loaded materials and node groups are kept between the jobs, only
+    the objects of the previous job are removed. Consecutive jobs of the same
+    input (e.g. other frames or views) reuse the imported scene. The add-on
+    is registered first if Blender did not, see `register_headless`.
+
+    The manifest is a JSON file (or the equivalent dictionary) of the form:
+
+        {
+            "defaults": {"preset": "default", "quality": "high"},
+            "jobs": [
+                {
+                    "input": "POSCAR",
+                    "output": "poscar.png",
+                    "camera": {"position": [0, 0, 20], "resolution": [1920, 1080]}
+                },
+                {
+                    "input": "benzene.cube",
+                    "output": "benzene.png",
+                    "format": "cube",
+                    "isosurface": {"level": 0.01}
+                }
+            ]
+        }
+
+    Every job takes "input", "output" and optionally "name", "format",
+    "preset", "quality", "frame", "camera" (Camera properties: position, rotation,
+    resolution, lens, focuslength, orthographic_scale) and "isosurface"
+    (true or the arguments of Wavefunction.read/ChargeDensity.read plus
+    "type": "wavefunction" | "chargedensity"). "defaults" are used for every
+    job not setting them itself. Relative paths are relative to the manifest.
+
+    Args:
+        manifest (str | Path | dict): The manifest file or its content.
+
+    Returns:
+        list[dict]: One entry per job with "input", "output", "status" ("done" | "failed"), "error" and the "timings" (s) of each stage.
+    """
+    register_headless()
+    if isinstance(manifest, dict):
+        directory = Path.cwd()
+    else:
+        directory = Path(manifest).resolve().parent
+        with open(manifest) as file:
+            manifest = jload(file)
+
+    jobs = manifest["jobs"]
+    results = []
+    scene = None
+    start = perf_counter()
+    for i, job in enumerate(jobs):
+        job = deep_dict_update(deepcopy(manifest.get("defaults", {})), job)
+        result = {
+            "input": job["input"],
+            "output": job["output"],
+            "status": "done",
+            "error": None,
+            "timings": {},
+        }
+        try:
+            scene = _run_job(job, directory, result["timings"], scene)
+        except Exception as error:
+            logging.exception(f"Job {i + 1}/{len(jobs)} ({job['input']}) failed.")
+            scene = None
+            result["status"] = "failed"
+            result["error"] = repr(error)
+
+        timings = ", ".join(f"{k}: {v:.2f}s" for k, v in result["timings"].items())
+        logging.info(
+            f"Job {i + 1}/{len(jobs)} {result['status']} ({job['input']}) {timings}"
+        )
+        results.append(result)
+
+    failed = sum(result["status"] == "failed" for result in results)
+    logging.info(
+        f"{len(jobs) - failed}/{len(jobs)} jobs done in {perf_counter() - start:.2f}s."
+    )
+
+    return results
+
+
+def register_headless():
+    """
+    Registers the add-on in a Blender process that imported it as a plain
+    package, e.g. a script run with `blender --background --python`. Jobs
+    need its operators and the frame change handlers of animated
+    isosurfaces. Does nothing if the add-on is registered already.
+    """
+    if hasattr(bpy.types.Scene, "item_panel_isosurfaces"):
+        return
+
+    # Delayed import, the package imports this module
+    from ... import register
+
+    register()
+
+
+def _run_job(job, directory, timings, scene=None):
+    """
+    Imports, renders and writes a single job of a manifest.
+
+    Args:
+        job (dict): The job.
+        directory (Path): The directory relative paths are relative to.
+        timings (dict): Is filled with the time (s) of each stage.
+        scene (str | None): Key of the currently loaded scene. The import is skipped if the job has the same.
+
+    Returns:
+        str: Key of the loaded scene.
+    """
+
+    def stage(name, function, *args, **kwargs):
+        start = perf_counter()
+        result = function(*args, **kwargs)
+        timings[name] = perf_counter() - start
+
+        return result
+
+    filename = directory / job["input"]
+    output = directory / job["output"]
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    key = _scene_key(job)
+    if key != scene:
+        stage("reset", _reset_scene, job.get("preset", Preset.preset))
+        stage(
+            "import",
+            Atoms.read,
+            filename,
+            name=job.get("name"),
+            format=job.get("format"),
+        )
+
+        isosurface = job.get("isosurface", False)
+        if isosurface:
+            options = {} if isosurface is True else dict(isosurface)
+            kind = options.pop("type", None)
+            if kind is None:
+                kind = "wavefunction" if filename.suffix == ".cube" else "chargedensity"
+            read = Wavefunction.read if kind == "wavefunction" else ChargeDensity.read
+            stage("isosurface", read, str(filename), **options)
+
+    if "frame" in job:
+        Animation().current_frame = job["frame"]
+
+    # Reuse the scene camera with default settings
+    Camera.first = True
+    camera = Camera()
+    for setting, value in job.get("camera", {}).items():
+        if setting not in CAMERA_SETTINGS:
+            raise ValueError(f"Unknown camera setting: {setting}")
+        setattr(camera, setting, value)
+
+    stage("render", camera.render, output, quality=job.get("quality"), show=False)
+    timings["total"] = sum(timings.values())
+
+    return key
+
+
+def _scene_key(job):
+    """
+    Identifies the scene a job imports.
+
+    Args:
+        job (dict): The job.
+
+    Returns:
+        str: The key, equal for jobs importing the same scene.
+    """
+    settings = ("input", "name", "format", "preset", "isosurface")
+
+    return jdumps({setting: job.get(setting) for setting in settings}, sort_keys=True)
+
+
+def _reset_scene(preset):
+    """
+    Removes all objects of the previous job but keeps materials and node
+    groups loaded.
+
+    Args:
+        preset (str): The preset of the next job.
+    """
+    reset(preset=preset, keep_materials=True)
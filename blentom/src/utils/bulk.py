@@ -0,0 +1,66 @@
+from contextlib import ContextDecorator
+
+import bpy
+
+
+class BulkEdit(ContextDecorator):
+    """
+    Groups many edits of the scene, e.g. the creation of all objects of an
+    import, into a single undo step. Edits through bpy.data record no undo
+    steps of their own, so a single step is pushed at the end of the session,
+    unless it has no message or the session failed. The view layer is updated
+    at its end. Sessions can be nested, only the outermost one takes effect.
+    Neither the undo preferences nor the undo stack are modified, so there is
+    nothing to restore if the session fails. A helper class not meant to be
+    used directly, see `bulk_edit`.
+
+    Attributes:
+        message (str | None): The name of the undo step. None for no undo step.
+    """
+
+    _depth = 0
+
+    def __init__(self, message):
+        self.message = message
+
+    def __enter__(self):
+        BulkEdit._depth += 1
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if BulkEdit._depth > 1 or exc_type is not None:
+                return False
+
+            bpy.context.view_layer.update()
+            # Background sessions have no undo stack
+            if (
+                self.message is not None
+                and bpy.context.preferences.edit.use_global_undo
+                and not bpy.app.background
+            ):
+                bpy.ops.ed.undo_push(message=self.message)
+        finally:
+            BulkEdit._depth -= 1
+
+        return False
+
+
+def bulk_edit(message="blentom"):
+    """
+    Returns a session grouping many edits of the scene into a single undo
+    step. Used by all importers, also usable as decorator.
+
+    Args:
+        message (str | None): The name of the undo step, None for no undo step, e.g. if the caller is an operator pushing its own. Default: "blentom".
+
+    Returns:
+        BulkEdit: The session.
+
+    Examples:
+        >>> with bulk_edit("Build slab"):
+        >>>     for position in positions:
+        >>>         atoms += Atom("Cu")
+    """
+    return BulkEdit(message)
@@ -0,0 +1,270 @@
+import numpy as np
+from scipy import fft
+from scipy.interpolate import BSpline, RegularGridInterpolator, make_interp_spline
+
+
+def upsample(
+    density, shape, method="auto", periodic=False, order=5, memory_budget=None
+):
+    """
+    Interpolates the 'density' onto a regular grid of 'shape'.
+
+    Parameters:
+    - density (ndarray): The density data.
+    - shape (tuple): The shape of the finer grid.
+    - method (str): {"auto", "fft", "spline", "quintic"}. "auto" uses "fft" for
+      periodic and "spline" for non-periodic densities.
+    - periodic (bool): Whether the density is periodic (e.g. VASP grids).
+    - order (int): Order of the B-spline for the "spline" method.
+    - memory_budget (float | None): Memory budget in bytes. The finer grid is
+      computed in blocks fitting into the budget. None computes it at once.
+
+    Returns:
+    - ndarray: The interpolated single precision density.
+
+    Raises:
+    - ValueError: If the method is unknown.
+    """
+    if method == "auto":
+        method = "fft" if periodic else "spline"
+
+    if method == "fft":
+        return fourier_upsample(density, shape, memory_budget=memory_budget)
+    elif method == "spline":
+        return spline_upsample(density, shape, order=order, memory_budget=memory_budget)
+    elif method == "quintic":
+        return quintic_upsample(density, shape, memory_budget=memory_budget)
+    else:
+        raise ValueError(f"Unknown interpolation method: {method}")
+
+
+def fourier_upsample(density, shape, memory_budget=None):
+    """
+    Interpolates a periodic density by zero-padding its Fourier transform. The
+    original grid points are part of the finer grid for integer factors and
+    keep their values.
+
+    Parameters:
+    - density (ndarray): The periodic density data sampled at i / N.
+    - shape (tuple): The shape of the finer grid.
+    - memory_budget (float | None): Memory budget in bytes. Each axis is
+      transformed in slabs fitting into the budget. None transforms it at once.
+
+    Returns:
+    - ndarray: The interpolated single precision density.
+    """
+    density = np.asarray(density, dtype=np.float32)
+    # Tensor product of 1D Fourier interpolations, one axis at a time
+    for axis, size in enumerate(shape):
+        n = density.shape[axis]
+        if size == n:
+            continue
+
+        scaled_shape = list(density.shape)
+        scaled_shape[axis] = size
+        scaled = np.empty(scaled_shape, dtype=np.float32)
+        other, slabs = _slabs(density, scaled, axis, memory_budget)
+        for slab in slabs:
+            index = [slice(None)] * density.ndim
+            index[other] = slab
+            index = tuple(index)
+
+            # Single precision input keeps the transform in single precision
+            spectrum = fft.rfft(density[index], axis=axis)
+            padded_shape = list(spectrum.shape)
+            padded_shape[axis] = size // 2 + 1
+            padded = np.zeros(padded_shape, dtype=spectrum.dtype)
+            kept = [slice(None)] * density.ndim
+            kept[axis] = slice(0, min(n // 2, size // 2) + 1)
+            padded[tuple(kept)] = spectrum[tuple(kept)]
+            if n % 2 == 0 and size > n:
+                # Nyquist component is split between positive and negative frequency
+                nyquist = [slice(None)] * density.ndim
+                nyquist[axis] = n // 2
+                padded[tuple(nyquist)] /= 2
+
+            scaled[index] = fft.irfft(padded, n=size, axis=axis) * (size / n)
+        density = scaled
+
+    return density
+
+
+def spline_upsample(density, shape, order=5, memory_budget=None):
+    """
+    Interpolates a non-periodic density with a separable tensor-product
+    B-spline (not-a-knot boundary conditions). The corner points of both grids
+    coincide. For order 5 this is the interpolant the "quintic" method
+    approximates. That one solves for the spline coefficients iteratively, so
+    both differ by its solver tolerance (about 1e-4 of the maximum). Here the
+    coefficients are solved exactly, axis by axis.
+
+    Parameters:
+    - density (ndarray): The density data.
+    - shape (tuple): The shape of the finer grid.
+    - order (int): Order of the B-spline.
+    - memory_budget (float | None): Memory budget in bytes. Each axis is
+      interpolated in slabs fitting into the budget. None interpolates it at
+      once.
+
+    Returns:
+    - ndarray: The interpolated single precision density.
+    """
+    density = np.asarray(density, dtype=np.float32)
+    for axis, size in enumerate(shape):
+        n = density.shape[axis]
+        if size == n:
+            continue
+
+        scaled_shape = list(density.shape)
+        scaled_shape[axis] = size
+        scaled = np.empty(scaled_shape, dtype=np.float32)
+        other, slabs = _slabs(density, scaled, axis, memory_budget)
+        for slab in slabs:
+            index = [slice(None)] * density.ndim
+            index[other] = slab
+            index = tuple(index)
+
+            # The lines along 'axis' are independent of each other
+            spline = make_interp_spline(
+                np.linspace(-1, 1, n), density[index], k=order, axis=axis
+            )
+            scaled[index] = spline(np.linspace(-1, 1, size))
+        density = scaled
+
+    return density
+
+
+def _slabs(density, scaled, axis, memory_budget, bytes_per_point=24):
+    """
+    Splits the interpolation along 'axis' into slabs along the longest other
+    axis, such that the temporary arrays of a slab fit into what is left of
+    the memory budget next to the input and output arrays.
+
+    Parameters:
+    - density (ndarray): The input of the interpolation along 'axis'.
+    - scaled (ndarray): The output of the interpolation along 'axis'.
+    - axis (int): The interpolated axis.
+    - memory_budget (float | None): Memory budget in bytes. None for one slab.
+    - bytes_per_point (int): Temporary bytes per point of input and output,
+      e.g. the double precision spline coefficients and values.
+
+    Returns:
+    - (int, list): The axis along which is split and the slabs along it.
+    """
+    other = max(
+        (a for a in range(density.ndim) if a != axis), key=lambda a: density.shape[a]
+    )
+    count = density.shape[other]
+    if memory_budget is None:
+        return other, [slice(0, count)]
+
+    left = max(memory_budget - density.nbytes - scaled.nbytes, 0)
+    per_row = bytes_per_point * (density.size + scaled.size) / count
+    rows = int(min(max(left // per_row, 1), count))
+
+    return other, [
+        slice(start, min(start + rows, count)) for start in range(0, count, rows)
+    ]
+
+
+def spline_coefficients(density, order=5):
+    """
+    Fits the separable tensor-product B-spline of 'spline_upsample' to the
+    density without evaluating it.
+
+    Parameters:
+    - density (ndarray): The density data.
+    - order (int): Order of the B-spline.
+
+    Returns:
+    - (list, ndarray): The knots along each axis and the coefficients.
+    """
+    knots, coefficients = [], density
+    for axis, n in enumerate(density.shape):
+        spline = make_interp_spline(
+            np.linspace(-1, 1, n), coefficients, k=order, axis=axis
+        )
+        knots.append(spline.t)
+        # BSpline keeps the interpolation axis first
+        coefficients = np.moveaxis(spline.c, 0, axis)
+
+    return knots, coefficients
+
+
+def spline_evaluate(knots, coefficients, coordinates, order=5):
+    """
+    Evaluates a tensor-product B-spline on the regular grid spanned by
+    'coordinates'. Only the coefficients supporting the grid are used, so
+    evaluating a small part of a large grid is cheap. The same point always
+    yields the same value, independent of the rest of the grid.
+
+    Parameters:
+    - knots (list): The knots along each axis.
+    - coefficients (ndarray): The coefficients of the B-spline.
+    - coordinates (list): Increasing coordinates along each axis.
+    - order (int): Order of the B-spline.
+
+    Returns:
+    - ndarray: The values on the grid.
+    """
+    windows = []
+    for t, x, n in zip(knots, coordinates, coefficients.shape):
+        first, last = np.clip(
+            np.searchsorted(t, (x[0], x[-1]), side="right") - 1, order, n - 1
+        )
+        windows.append(slice(first - order, last + 1))
+
+    values = coefficients[tuple(windows)]
+    for axis, (t, x, window) in enumerate(zip(knots, coordinates, windows)):
+        spline = BSpline(
+            t[window.start : window.stop + order + 1],
+            np.moveaxis(values, axis, 0),
+            order,
+        )
+        values = np.moveaxis(spline(x), 0, axis)
+
+    return values
+
+
+def quintic_upsample(density, shape, memory_budget=None):
+    """
+    Interpolates a non-periodic density with scipy's quintic
+    RegularGridInterpolator. Slow, kept as reference.
+
+    Parameters:
+    - density (ndarray): The density data.
+    - shape (tuple): The shape of the finer grid.
+    - memory_budget (float | None): Memory budget in bytes. The finer grid is
+      evaluated in blocks fitting into the budget. None evaluates it at once.
+
+    Returns:
+    - ndarray: The interpolated single precision density.
+    """
+    # Actual range of density grid unimportant, assume -1 to 1 symmetric around 0 for simplicity
+    x = np.linspace(-1, 1, density.shape[0])
+    y = np.linspace(-1, 1, density.shape[1])
+    z = np.linspace(-1, 1, density.shape[2])
+    interp = RegularGridInterpolator((x, y, z), density, method="quintic")
+    x = np.linspace(-1, 1, shape[0])
+    y = np.linspace(-1, 1, shape[1])
+    z = np.linspace(-1, 1, shape[2])
+    scaled = np.empty(shape, dtype=np.float32)
+
+    # The rest of the budget is spent on the points of each block (three
+    # float64 coordinates plus the float64 result)
+    if memory_budget is None:
+        rows = len(x)
+    else:
+        block_points = max(memory_budget - scaled.nbytes, 0) // 32
+        rows = int(min(max(block_points // (len(y) * len(z)), 1), len(x)))
+
+    Y, Z = np.meshgrid(y, z, indexing="ij")
+    for start in range(0, len(x), rows):
+        stop = min(start + rows, len(x))
+        points = np.empty((stop - start, len(y), len(z), 3))
+        points[..., 0] = x[start:stop, None, None]
+        points[..., 1] = Y
+        points[..., 2] = Z
+        scaled[start:stop] = interp(points.reshape(-1, 3)).reshape(points.shape[:3])
+
+    return scaled
@@ -1,17 +1,22 @@
-import _console_python
+import logging
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from inspect import currentframe
+from itertools import product
+from math import hypot, radians
+from os import cpu_count
 
 import bpy
 import bmesh
-from mathutils import Vector
+from bpy_extras.object_utils import world_to_camera_view
+from mathutils import Matrix, Vector
 
 import numpy as np
-from ase.io.cube import read_cube_data
-from scipy.interpolate import RegularGridInterpolator
-from skimage import measure
 
 from .preset import Preset
 from .animation import Animation
+from .profiling import span
 from .units import ANGSTROM, BOHR
 from ..object.camera import Camera
 
@@ -21,18 +26,36 @@ def reset(preset=None, keep_materials=False):
     Resets Blender to an original state. Intended use is at the beginning of a
     script to clean changes made by previous execution of the script.
 
+    All objects except the default camera and the lights, all collections and
+    all data left without users are removed in batches, as are the instances
+    of the Python registries.
+
     Args:
         preset (str | None): The name of a preset to be loaded. Certain Blender
         settings like renderer will be chosen based on this. Default: Currently
         loaded preset.
-        keep_materials  (bool): Whether to keep materials defined in Blender.
+        keep_materials  (bool): Whether to keep materials and node groups defined in Blender.
     """
+    # Delayed import to avoid circular import
+    from ..object.atom import Atom
+    from ..object.isosurface import Isosurface, IsosurfaceSequence
+
     remove_cameras()
     remove_meshes()
+    remove_volumes()
     remove_collections()
     reset_frame()
     if not keep_materials:
         remove_materials()
+    purge_orphans(keep_materials=keep_materials)
+
+    Atom._atoms.clear()
+    Isosurface.items.clear()
+    for sequence in list(IsosurfaceSequence.sequences):
+        sequence.close()
+    # Only registered together with the user interface
+    if hasattr(bpy.context.scene, "item_panel_isosurfaces"):
+        bpy.context.scene.item_panel_isosurfaces.clear()
 
     if preset is not None:
         Preset.preset = preset
@@ -44,9 +67,13 @@ def remove_cameras():
     """
     Removes all excess cameras from the Blender scene.
     """
-    for object in bpy.data.objects:
-        if object.type == "CAMERA" and object.name != "Camera":
-            bpy.data.objects.remove(object)
+    bpy.data.batch_remove(
+        [
+            object
+            for object in bpy.data.objects
+            if object.type == "CAMERA" and object.name != "Camera"
+        ]
+    )
 
     Camera.first = True
 
@@ -75,32 +102,72 @@ def remove_materials():
     """
     Removes all materials from the Blender scene.
     """
-    for material in bpy.data.materials:
-        bpy.data.materials.remove(material)
+    bpy.data.batch_remove(list(bpy.data.materials))
 
 
 def remove_collections():
     """
     Removes all collections, except the scene collection, from the Blender scene.
     """
-    for collection in bpy.data.collections:
-        if collection.name != "Collection":
-            bpy.data.collections.remove(collection)
+    bpy.data.batch_remove(
+        [
+            collection
+            for collection in bpy.data.collections
+            if collection.name != "Collection"
+        ]
+    )
 
 
 def remove_meshes():
     """
-    Removes all mesh objects from the Blender scene.
+    Removes all mesh objects and their meshes from the Blender scene, as well
+    as empties (e.g. the periodic images of atoms) and curves.
     """
     set_mode("OBJECT")
-    bpy.ops.object.select_all(action="DESELECT")
+    bpy.data.batch_remove(
+        [
+            object
+            for object in bpy.data.objects
+            if object.type in ("MESH", "EMPTY", "CURVE", "CURVES", "POINTCLOUD")
+        ]
+    )
+    bpy.data.batch_remove(list(bpy.data.meshes))
 
-    for object in bpy.context.scene.objects:
-        if object.type == "MESH":
-            bpy.data.objects.remove(object)
 
-    for mesh in bpy.data.meshes:
-        bpy.data.meshes.remove(mesh)
+def remove_volumes():
+    """
+    Removes all volume objects and their volumes from the Blender scene, as
+    well as the files written for them by `Volume`.
+    """
+    # Delayed import to avoid circular import
+    from ..object.volume import Volume
+
+    bpy.data.batch_remove(
+        [object for object in bpy.data.objects if object.type == "VOLUME"]
+    )
+    Volume.remove(list(bpy.data.volumes))
+
+
+def purge_orphans(keep_materials=False):
+    """
+    Removes all data without users recursively, i.e. also the data only
+    used by removed data.
+
+    Args:
+        keep_materials (bool): Whether to keep unused materials, node groups and images.
+    """
+    if not keep_materials:
+        bpy.data.orphans_purge(do_local_ids=True, do_recursive=True)
+        return
+
+    kinds = ("objects", "collections", "meshes", "curves", "cameras", "lights")
+    while orphans := [
+        id
+        for kind in kinds
+        for id in getattr(bpy.data, kind)
+        if id.users == 0 and not id.use_fake_user
+    ]:
+        bpy.data.batch_remove(orphans)
 
 
 def set_mode(mode):
@@ -205,16 +272,285 @@ def set_wireframe(wireframe):
                             space.overlay.show_wireframes = True
 
 
-def marching_cubes(density, level):
+@span("marching_cubes")
+def marching_cubes(density, level, workers=None, scale=1, progress=None):
     """
     Uses scikit-image to generate the isosurface.
+
+    Large grids are split into overlapping blocks which are extracted in a
+    process pool. The blocks are stitched back together into a single mesh
+    identical to the one of a serial extraction.
+
+    If 'scale' is not 1, the density is refined adaptively: only the blocks
+    around the isosurface are interpolated onto the finer grid. The vertices
+    are then given in units of the finer grid.
+
+    Parameters:
+    - density (ndarray): The density data.
+    - level (float): The isosurface level.
+    - workers (int | None): Number of worker processes. None uses the preset
+      value, 0 all available cores and 1 disables the parallel extraction.
+    - scale (float): Scaling factor of the adaptive refinement.
+    - progress (callable | None): Called with the fraction of extracted blocks
+      after every block. Exceptions raised by it stop the extraction.
+
+    Returns:
+    - (ndarray, ndarray): The vertices and faces of the isosurface.
     """
-    # spacing is set to (1, 1, 1) to match your current logic;
-    # scaling is handled by your existing matrix math.
-    verts, faces, normals, values = measure.marching_cubes(
-        density, level=level, spacing=(1, 1, 1)
-    )
-    return verts, faces
+    # Delayed import to keep the registration of the add-on fast
+    from skimage import measure
+
+    if workers is None:
+        workers = Preset.get("isosurface.parallel.workers")
+    if workers == 0:
+        workers = cpu_count() or 1
+
+    if scale != 1:
+        offsets, blocks = _refine_blocks(density, level, scale)
+    elif workers == 1 or density.size < Preset.get("isosurface.parallel.min_size"):
+        # spacing is set to (1, 1, 1) to match your current logic;
+        # scaling is handled by your existing matrix math.
+        verts, faces, normals, values = measure.marching_cubes(
+            density, level=level, spacing=(1, 1, 1)
+        )
+        if progress is not None:
+            progress(1.0)
+        return verts, faces
+    else:
+        offsets, blocks = [], []
+        for offset, block in _split_blocks(
+            density, Preset.get("isosurface.parallel.block_size")
+        ):
+            # Blocks not crossing the level contain no surface
+            if block.min() <= level <= block.max():
+                offsets.append(offset)
+                blocks.append(block)
+
+    if not blocks:
+        raise ValueError("Surface level must be within volume data range.")
+
+    return _stitch_blocks(_extract_blocks(offsets, blocks, level, workers, progress))
+
+
+@span("marching_cubes_sweep")
+def marching_cubes_sweep(density, levels, workers=None, scale=1):
+    """
+    Uses scikit-image to generate the isosurfaces of many levels of the same
+    density.
+
+    The levels are distributed over a process pool, every worker receives the
+    density only once. Adaptively refined densities are extracted level by
+    level, each one in parallel blocks.
+
+    Parameters:
+    - density (ndarray): The density data.
+    - levels (list): The isosurface levels.
+    - workers (int | None): Number of worker processes. None uses the preset
+      value, 0 all available cores and 1 disables the parallel extraction.
+    - scale (float): Scaling factor of the adaptive refinement.
+
+    Returns:
+    - list: The vertices and faces of each level. Empty for levels outside of
+      the range of the density.
+    """
+    from skimage import measure
+
+    if workers is None:
+        workers = Preset.get("isosurface.parallel.workers")
+    if workers == 0:
+        workers = cpu_count() or 1
+
+    empty = (np.zeros((0, 3), dtype=np.float32), np.zeros((0, 3), dtype=np.int32))
+    minimum, maximum = density.min(), density.max()
+    inside = [level for level in levels if minimum < level < maximum]
+
+    if scale != 1 or workers == 1 or len(inside) < 2:
+        results = [marching_cubes(density, level, workers, scale) for level in inside]
+    else:
+        # Only the scikit-image function itself is sent to the workers as the
+        # add-on can not be imported outside of Blender
+        extract = partial(measure.marching_cubes, density, spacing=(1, 1, 1))
+        workers = min(workers, len(inside))
+        # One chunk of levels per worker, so the density is sent only once
+        chunksize = -(-len(inside) // workers)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = [
+                (verts, faces)
+                for verts, faces, *_ in executor.map(
+                    extract, inside, chunksize=chunksize
+                )
+            ]
+
+    results = iter(results)
+    return [next(results) if minimum < level < maximum else empty for level in levels]
+
+
+def _extract_blocks(offsets, blocks, level, workers, progress=None):
+    """
+    Runs the marching cubes algorithm on each block, in a process pool if
+    more than one worker is requested.
+
+    Parameters:
+    - offsets (list): The offset of each block.
+    - blocks (list): The density blocks.
+    - level (float): The isosurface level.
+    - workers (int): Number of worker processes.
+    - progress (callable | None): Called with the fraction of extracted blocks
+      after every block. If it raises, the blocks not started yet are dropped.
+
+    Returns:
+    - list: Tuples of block offset, vertices and faces.
+    """
+    from skimage import measure
+
+    # Only the scikit-image function itself is sent to the workers as the
+    # add-on can not be imported outside of Blender
+    extract = partial(measure.marching_cubes, level=level, spacing=(1, 1, 1))
+
+    results = []
+    if workers == 1 or len(blocks) == 1:
+        for offset, block in zip(offsets, blocks):
+            verts, faces, *_ = extract(block)
+            results.append((offset, verts, faces))
+            if progress is not None:
+                progress(len(results) / len(blocks))
+        return results
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(blocks))) as executor:
+        futures = [executor.submit(extract, block) for block in blocks]
+        try:
+            for offset, future in zip(offsets, futures):
+                verts, faces, *_ = future.result()
+                results.append((offset, verts, faces))
+                if progress is not None:
+                    progress(len(results) / len(blocks))
+        except BaseException:
+            # Only the blocks already running are finished
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    return results
+
+
+def _refine_blocks(density, level, scale):
+    """
+    Interpolates the blocks of the density containing cells close to the
+    level onto a grid finer by a factor of 'scale'. The finer grid is the same
+    as the one of 'scale_density' using the "spline" method.
+
+    Parameters:
+    - density (ndarray): The density data.
+    - level (float): The isosurface level.
+    - scale (float): Scaling factor.
+
+    Returns:
+    - (list, list): The offset of each block on the finer grid and the blocks.
+    """
+    from .interpolation import spline_coefficients, spline_evaluate
+
+    order = Preset.get("isosurface.interpolation.order")
+    shape = [int(n * scale // 1) for n in density.shape]
+    ratios = [(m - 1) / (n - 1) for m, n in zip(shape, density.shape)]
+    coordinates = [np.linspace(-1, 1, m) for m in shape]
+    knots, coefficients = spline_coefficients(density, order=order)
+
+    active = _active_cells(density, level)
+    block_size = max(2, int(Preset.get("isosurface.parallel.block_size") // scale))
+
+    offsets, blocks = [], []
+    starts = [range(0, n - 1, block_size) for n in density.shape]
+    for start in product(*starts):
+        if not active[tuple(slice(s, s + block_size) for s in start)].any():
+            continue
+
+        # Neighbouring blocks share a plane of the finer grid
+        fine = [
+            slice(round(s * ratio), round(min(s + block_size, n - 1) * ratio) + 1)
+            for s, ratio, n in zip(start, ratios, density.shape)
+        ]
+        block = spline_evaluate(
+            knots,
+            coefficients,
+            [x[f] for x, f in zip(coordinates, fine)],
+            order=order,
+        ).astype(np.float32)
+
+        if block.min() <= level <= block.max():
+            offsets.append(np.array([f.start for f in fine], dtype=np.float64))
+            blocks.append(block)
+
+    return offsets, blocks
+
+
+def _active_cells(density, level):
+    """
+    Finds the cells of the density whose corners enclose the level. The
+    neighbours of these cells are included as well, as the interpolation may
+    cross the level between grid points close to it.
+
+    Parameters:
+    - density (ndarray): The density data.
+    - level (float): The isosurface level.
+
+    Returns:
+    - ndarray: Boolean array with one entry per cell.
+    """
+    from scipy.ndimage import binary_dilation
+
+    low = high = density[:-1, :-1, :-1]
+    for shift in product((0, 1), repeat=3):
+        corner = density[
+            tuple(slice(s, n - 1 + s) for s, n in zip(shift, density.shape))
+        ]
+        low = np.minimum(low, corner)
+        high = np.maximum(high, corner)
+
+    return binary_dilation((low <= level) & (level <= high), np.ones((3, 3, 3)))
+
+
+def _split_blocks(density, block_size):
+    """
+    Splits the density into blocks of 'block_size' cells. Neighbouring blocks
+    overlap by one grid plane so that no cell is lost.
+
+    Parameters:
+    - density (ndarray): The density data.
+    - block_size (int): Number of cells along each axis of a block.
+
+    Returns:
+    - generator: Tuples of the block offset (ndarray) and the block (ndarray).
+    """
+    starts = [range(0, max(n - 1, 1), block_size) for n in density.shape]
+    for start in product(*starts):
+        block = tuple(
+            slice(s, min(s + block_size, n - 1) + 1)
+            for s, n in zip(start, density.shape)
+        )
+        yield np.array(start, dtype=np.float64), density[block]
+
+
+def _stitch_blocks(results):
+    """
+    Stitches the meshes of individual blocks into one mesh. Vertices on shared
+    block faces are generated by both neighbouring blocks with identical
+    coordinates and are merged.
+
+    Parameters:
+    - results (list): Tuples of block offset, vertices and faces.
+
+    Returns:
+    - (ndarray, ndarray): The vertices and faces of the stitched mesh.
+    """
+    vertices, faces, count = [], [], 0
+    for offset, verts, block_faces in results:
+        vertices.append(verts.astype(np.float64) + offset)
+        faces.append(block_faces + count)
+        count += len(verts)
+
+    vertices, inverse = np.unique(np.concatenate(vertices), axis=0, return_inverse=True)
+    faces = inverse.reshape(-1)[np.concatenate(faces)]
+
+    return vertices.astype(np.float32), faces.astype(np.int32)
 
 
 def marching_cubes_VASP(density, unit_cell, name, level=None):
@@ -230,47 +566,269 @@ def marching_cubes_VASP(density, unit_cell, name, level=None):
     Returns:
     - object: The generated mesh object.
     """
-    vertices, faces, *_ = marching_cubes(density, level)
-    vertices = np.dot((vertices - 1), unit_cell) / density.shape
-    edges = [[face[i], face[(i + 1) % 3]] for face in faces for i in range(3)]
+    return mesh_object(name, *isosurface_VASP(density, unit_cell, level))
 
+
+def isosurface_VASP(density, unit_cell, level=None, progress=None):
+    """
+    Extracts the isosurface of VASP density data. Does not access Blender and
+    can run outside of the main thread.
+
+    Parameters:
+    - density (ndarray): The density data.
+    - unit_cell (tuple): The unit cell dimensions.
+    - level (float): The isosurface level. If None, the default level will be used.
+    - progress (callable | None): Reports the progress, see `marching_cubes`.
+
+    Returns:
+    - (ndarray, ndarray): The vertices (cartesian) and faces of the isosurface.
+    """
+    vertices, faces = marching_cubes(density, level, progress=progress)
+
+    return _VASP_vertices(vertices, unit_cell, density.shape), faces
+
+
+def isosurfaces_VASP(density, unit_cell, levels, workers=None):
+    """
+    Extracts the isosurfaces of many levels of VASP density data, see
+    `marching_cubes_sweep`. Does not access Blender.
+
+    Parameters:
+    - density (ndarray): The density data.
+    - unit_cell (tuple): The unit cell dimensions.
+    - levels (list): The isosurface levels.
+    - workers (int | None): Number of worker processes. Default: Preset value.
+
+    Returns:
+    - list: The vertices (cartesian) and faces of each level.
+    """
+    return [
+        (_VASP_vertices(vertices, unit_cell, density.shape), faces)
+        for vertices, faces in marching_cubes_sweep(density, levels, workers)
+    ]
+
+
+def VASP_grid(unit_cell, shape):
+    """
+    Places the points of VASP density data in space. Isosurfaces and volumes
+    of the same density share this placement.
+
+    Parameters:
+    - unit_cell (tuple): The unit cell dimensions.
+    - shape (tuple): The shape of the density data.
+
+    Returns:
+    - (ndarray, ndarray): The origin and the matrix placing grid point p at
+      p @ matrix + origin.
+    """
+    # Grid point p is at (p - 1) @ unit_cell / shape
+    matrix = np.asarray(unit_cell, dtype=np.float64) / np.asarray(shape)
+
+    return -matrix.sum(axis=0), matrix
+
+
+def _VASP_vertices(vertices, unit_cell, shape):
+    origin, matrix = VASP_grid(unit_cell, shape)
+
+    return vertices @ matrix + origin
+
+
+def mesh_object(name, vertices, faces):
+    """
+    Creates a mesh object from vertices and triangular faces.
+
+    Parameters:
+    - name (str): The name of the mesh object.
+    - vertices (ndarray): The vertices, shape (n, 3).
+    - faces (ndarray): The vertex indices of the triangles, shape (m, 3).
+
+    Returns:
+    - object: The generated mesh object.
+    """
     mesh = bpy.data.meshes.new(name=name)
-    mesh.from_pydata(vertices, edges, faces)
+    # Edges are derived from the faces
+    mesh.from_pydata(vertices, [], faces)
     mesh.update()
     return bpy.data.objects.new(name, mesh)
 
 
-def scale_density(density, axes, scale):
+def outward_mesh(name, vertices, faces):
+    """
+    Creates a mesh from vertices and triangular faces with consistent normals
+    pointing outwards, like `flip_normals` but without operators.
+
+    Parameters:
+    - name (str): The name of the mesh.
+    - vertices (ndarray): The vertices, shape (n, 3).
+    - faces (ndarray): The vertex indices of the triangles, shape (m, 3).
+
+    Returns:
+    - bpy.types.Mesh: The generated mesh.
+    """
+    mesh = bpy.data.meshes.new(name=name)
+    mesh.from_pydata(vertices, [], faces)
+
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
+    bm.to_mesh(mesh)
+    bm.free()
+    mesh.update()
+
+    return mesh
+
+
+@span("decimate_surface")
+def decimate_surface(vertices, faces, triangle_budget=None):
+    """
+    Reduces a triangle mesh to the triangle budget by vertex clustering: the
+    vertices within a cell of a regular grid are merged into their mean and
+    the degenerate triangles are dropped. Works on arrays only, so it can run
+    outside of the main thread and needs no depsgraph evaluation like the
+    Decimate modifier does.
+
+    Parameters:
+    - vertices (ndarray): The vertices, shape (n, 3).
+    - faces (ndarray): The vertex indices of the triangles, shape (m, 3).
+    - triangle_budget (int | None): The maximum number of triangles. Default:
+      Preset value.
+
+    Returns:
+    - (ndarray, ndarray): The vertices and faces of the decimated mesh.
+    """
+    if triangle_budget is None:
+        triangle_budget = Preset.get("isosurface.remesh.triangle_budget")
+
+    vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    if len(faces) <= triangle_budget:
+        return vertices, faces
+
+    # The number of triangles falls with the square of the cell size
+    edges = vertices[faces] - vertices[np.roll(faces, 1, axis=1)]
+    size = np.linalg.norm(edges, axis=2).mean() * np.sqrt(len(faces) / triangle_budget)
+    minimum = vertices.min(axis=0)
+    while True:
+        cells = np.floor((vertices - minimum) / size).astype(np.int64)
+        keys = np.ravel_multi_index(cells.T, cells.max(axis=0) + 1)
+        _, labels = np.unique(keys, return_inverse=True)
+        clustered = labels.ravel()[faces]
+        clustered = clustered[
+            (clustered[:, 0] != clustered[:, 1])
+            & (clustered[:, 1] != clustered[:, 2])
+            & (clustered[:, 2] != clustered[:, 0])
+        ]
+        # Triangles collapsed onto the same vertices are kept once
+        _, first = np.unique(np.sort(clustered, axis=1), axis=0, return_index=True)
+        clustered = clustered[np.sort(first)]
+        if len(clustered) <= triangle_budget:
+            break
+        size *= max(np.sqrt(len(clustered) / triangle_budget), 1.1)
+
+    used, faces = np.unique(clustered, return_inverse=True)
+    counts = np.bincount(labels.ravel(), minlength=used.max() + 1)
+    means = np.zeros((len(counts), 3))
+    np.add.at(means, labels.ravel(), vertices)
+    means /= np.maximum(counts, 1)[:, None]
+
+    return means[used], faces.reshape(-1, 3)
+
+
+def dissolve_planar(mesh, angle=None):
+    """
+    Dissolves the edges between nearly coplanar faces of a mesh, like the
+    planar Decimate modifier but directly on the mesh data.
+
+    Parameters:
+    - mesh (bpy.types.Mesh): The mesh.
+    - angle (float | None): The angle limit in degrees. Default: Preset value.
+    """
+    if angle is None:
+        angle = Preset.get("isosurface.remesh.planar_angle")
+
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    bmesh.ops.dissolve_limit(
+        bm, angle_limit=radians(angle), verts=bm.verts[:], edges=bm.edges[:]
+    )
+    bm.to_mesh(mesh)
+    bm.free()
+    mesh.update()
+
+
+@span("scale_density")
+def scale_density(density, axes, scale, memory_budget=None, periodic=False):
     """
     Interpolates the 'density' onto a finer grid by a factor of 'scale'.
 
+    The interpolation method is taken from the preset. By default periodic
+    densities are interpolated via Fourier zero-padding and non-periodic ones
+    with a separable quintic B-spline. If the finer grid would not fit into the
+    memory budget, the scaling factor is reduced accordingly.
+
     Parameters:
     - density (ndarray): The density data.
     - axes (tuple): The axes vectors of the density data.
     - scale (float): Scaling factor.
+    - memory_budget (float | None): Memory budget in MB. Default: Preset value.
+    - periodic (bool): Whether the density is periodic (e.g. VASP grids).
 
     Returns:
     - (ndarray, tuple): Scaled density and axes.
     """
-    # Actual range of density grid unimportant, assume -1 to 1 symmetric around 0 for simplicity
-    x = np.linspace(-1, 1, density.shape[0])
-    y = np.linspace(-1, 1, density.shape[1])
-    z = np.linspace(-1, 1, density.shape[2])
-    # Tests gave better results for quintic interpolation
-    interp = RegularGridInterpolator((x, y, z), density, method="quintic")
-    x = np.linspace(-1, 1, int(density.shape[0] * scale // 1))
-    y = np.linspace(-1, 1, int(density.shape[1] * scale // 1))
-    z = np.linspace(-1, 1, int(density.shape[2] * scale // 1))
-    X, Y, Z = np.meshgrid(x, y, z, indexing="ij")
-    points = np.stack((X.flatten(), Y.flatten(), Z.flatten()), axis=-1)
-    density = interp(points).reshape((len(x), len(y), len(z)))
+    if memory_budget is None:
+        memory_budget = Preset.get("isosurface.memory_budget")
+    memory_budget = memory_budget * 2**20
+
+    scale = _cap_scale(density.shape, scale, memory_budget)
+    if scale == 1:
+        return (density, axes)
+
+    from .interpolation import upsample
+
+    shape = tuple(int(n * scale // 1) for n in density.shape)
+    density = upsample(
+        density,
+        shape,
+        method=Preset.get("isosurface.interpolation.method"),
+        periodic=periodic,
+        order=Preset.get("isosurface.interpolation.order"),
+        memory_budget=memory_budget,
+    )
     # Axes need to be scaled down accordingly
     axes = [axis / scale for axis in axes]
 
     return (density, axes)
 
 
-def marching_cubes_gaussian(density, origin, axes, name, level=None):
+def _cap_scale(shape, scale, memory_budget):
+    """
+    Reduces the scaling factor such that the scaled single precision density
+    takes at most half of the memory budget.
+
+    Parameters:
+    - shape (tuple): The shape of the density data.
+    - scale (float): Requested scaling factor.
+    - memory_budget (float): Memory budget in bytes.
+
+    Returns:
+    - float: The (possibly reduced) scaling factor. At least 1.
+    """
+    size = 4 * np.prod([int(n * scale // 1) for n in shape], dtype=np.float64)
+    if size <= memory_budget / 2:
+        return scale
+
+    capped = (memory_budget / 2 / (4 * np.prod(shape, dtype=np.float64))) ** (1 / 3)
+    capped = max(1, np.floor(capped * 10) / 10)
+    logging.warning(
+        f"Interpolation by a factor of {scale} exceeds the memory budget of "
+        f"{memory_budget / 2**20:.0f} MB. Using a factor of {capped} instead."
+    )
+
+    return capped
+
+
+def marching_cubes_gaussian(density, origin, axes, name, level=None, scale=1):
     """
     Generates a mesh using the marching cubes algorithm from Gaussian density data.
 
@@ -280,21 +838,85 @@ def marching_cubes_gaussian(density, origin, axes, name, level=None):
     - axes (tuple): The axes vectors of the density data.
     - name (str): The name of the mesh object.
     - level (float): The isosurface level. If None, the default level will be used.
+    - scale (float): Refines the density adaptively around the isosurface by
+      this factor. 'axes' are the ones of the refined grid.
 
     Returns:
     - object: The generated mesh object.
     """
+    return mesh_object(
+        name, *isosurface_gaussian(density, origin, axes, level, scale=scale)
+    )
+
+
+def isosurface_gaussian(density, origin, axes, level=None, scale=1, progress=None):
+    """
+    Extracts the isosurface of Gaussian density data. Does not access Blender
+    and can run outside of the main thread.
 
-    vertices, faces, *_ = marching_cubes(density, level)
-    vertices = [
-        [Vector(vertex).dot(Vector(axes[i])) + origin[i] for i in range(3)]
-        for vertex in vertices
+    Parameters:
+    - density (ndarray): The density data.
+    - origin (Vector): The origin of the density data.
+    - axes (tuple): The axes vectors of the density data.
+    - level (float): The isosurface level. If None, the default level will be used.
+    - scale (float): Refines the density adaptively around the isosurface by
+      this factor. 'axes' are the ones of the refined grid.
+    - progress (callable | None): Reports the progress, see `marching_cubes`.
+
+    Returns:
+    - (ndarray, ndarray): The vertices (cartesian) and faces of the isosurface.
+    """
+    vertices, faces = marching_cubes(density, level, scale=scale, progress=progress)
+
+    return _gaussian_vertices(vertices, origin, axes), faces
+
+
+def isosurfaces_gaussian(density, origin, axes, levels, scale=1, workers=None):
+    """
+    Extracts the isosurfaces of many levels of Gaussian density data, see
+    `marching_cubes_sweep`. Does not access Blender.
+
+    Parameters:
+    - density (ndarray): The density data.
+    - origin (Vector): The origin of the density data.
+    - axes (tuple): The axes vectors of the density data.
+    - levels (list): The isosurface levels.
+    - scale (float): Refines the density adaptively around the isosurface by
+      this factor. 'axes' are the ones of the refined grid.
+    - workers (int | None): Number of worker processes. Default: Preset value.
+
+    Returns:
+    - list: The vertices (cartesian) and faces of each level.
+    """
+    return [
+        (_gaussian_vertices(vertices, origin, axes), faces)
+        for vertices, faces in marching_cubes_sweep(density, levels, workers, scale)
     ]
-    edges = [[face[i], face[(i + 1) % 3]] for face in faces for i in range(3)]
-    mesh = bpy.data.meshes.new(name=name)
-    mesh.from_pydata(vertices, edges, faces)
-    mesh.update()
-    return bpy.data.objects.new(name, mesh)
+
+
+def gaussian_grid(origin, axes):
+    """
+    Places the points of Gaussian density data in space. Isosurfaces and
+    volumes of the same density share this placement.
+
+    Parameters:
+    - origin (Vector): The origin of the density data.
+    - axes (tuple): The axes vectors of the density data.
+
+    Returns:
+    - (ndarray, ndarray): The origin and the matrix placing grid point p at
+      p @ matrix + origin.
+    """
+    # Component i of a grid point is its dot product with axes[i]
+    matrix = np.array([list(axis) for axis in axes], dtype=np.float64).T
+
+    return np.array(list(origin), dtype=np.float64), matrix
+
+
+def _gaussian_vertices(vertices, origin, axes):
+    origin, matrix = gaussian_grid(origin, axes)
+
+    return vertices @ matrix + origin
 
 
 def _vertex_transform(vertex, unit_cell, shape):
@@ -318,6 +940,276 @@ def _vertex_transform(vertex, unit_cell, shape):
     return new
 
 
+def uv_sphere_mesh(name, segments, rings):
+    """
+    Creates the mesh of a uv sphere with radius 1, the same as created by
+    'bpy.ops.mesh.primitive_uv_sphere_add', including its UV map.
+
+    Args:
+        name (str): The name of the mesh.
+        segments (int): Number of segments.
+        rings (int): Number of rings.
+
+    Returns:
+        bpy.types.Mesh: The mesh.
+    """
+    bm = bmesh.new()
+    bm.loops.layers.uv.new("UVMap")
+    bmesh.ops.create_uvsphere(
+        bm, u_segments=segments, v_segments=rings, radius=1, calc_uvs=True
+    )
+    mesh = bpy.data.meshes.new(name)
+    bm.to_mesh(mesh)
+    bm.free()
+
+    return mesh
+
+
+def bond_mesh(name, sides):
+    """
+    Creates the mesh of a bond: A cylinder with radius 1 along the y-axis
+    from 0 to 2 with an edge loop at 1 separating the two halves. It has the
+    UV map of 'bpy.ops.mesh.primitive_cylinder_add'.
+
+    Args:
+        name (str): The name of the mesh.
+        sides (int): Number of sides of the cylinder.
+
+    Returns:
+        bpy.types.Mesh: The mesh.
+    """
+    bm = bmesh.new()
+    bm.loops.layers.uv.new("UVMap")
+    bmesh.ops.create_cone(
+        bm,
+        cap_ends=True,
+        segments=sides,
+        radius1=1,
+        radius2=1,
+        depth=2,
+        calc_uvs=True,
+    )
+    bmesh.ops.rotate(bm, verts=bm.verts, matrix=Matrix.Rotation(radians(90), 3, "X"))
+    bmesh.ops.translate(bm, verts=bm.verts, vec=(0, 1, 0))
+    bmesh.ops.bisect_plane(
+        bm,
+        geom=bm.verts[:] + bm.edges[:] + bm.faces[:],
+        plane_co=(0, 1, 0),
+        plane_no=(0, 1, 0),
+    )
+    mesh = bpy.data.meshes.new(name)
+    bm.to_mesh(mesh)
+    bm.free()
+
+    return mesh
+
+
+def render_triangles(object):
+    """
+    Estimates the number of triangles of an object at render time, including
+    its Subsurface modifiers.
+
+    Args:
+        object (bpy.types.Object): The object.
+
+    Returns:
+        int: The number of triangles.
+    """
+    sides = np.zeros(len(object.data.polygons), dtype=np.int64)
+    object.data.polygons.foreach_get("loop_total", sides)
+    levels = sum(
+        modifier.render_levels
+        for modifier in object.modifiers
+        if modifier.type == "SUBSURF" and modifier.show_render
+    )
+
+    if levels == 0:
+        return int((sides - 2).sum())
+    # The first subdivision turns every n-gon into n quads, every further one
+    # each quad into four
+    return int(2 * sides.sum() * 4 ** (levels - 1))
+
+
+def level_of_detail(atoms=None, mode="screen", camera=None):
+    """
+    Lowers the resolution of atoms and bonds where it is not visible. The
+    level of each object is either chosen by its projected size in pixels for
+    the camera ("screen") or for all objects by the number of atoms
+    ("count"). The resolutions and thresholds of the levels are set in the
+    preset ("lod").
+
+    Args:
+        atoms (list[Atom] | Atoms | None): The atoms, their bonds are included. Default: None. All atoms.
+        mode (str): How to choose the levels. {"screen", "count"} Default: "screen".
+        camera (Camera | None): The camera for the "screen" mode. Default: None. The active scene camera.
+
+    Returns:
+        dict: The number of render triangles "before" and "after", the "saved" triangles and the number of objects per level ("levels").
+
+    Raises:
+        ValueError: If the mode is unknown.
+
+    Examples:
+        >>> atoms = Atoms.read("POSCAR")
+        >>> camera = Camera(position=(0, 0, 50))
+        >>> level_of_detail(atoms, camera=camera)["saved"]
+    """
+    atoms = _atom_list(atoms)
+    bonds = list({id(bond): bond for atom in atoms for bond in atom.bonds}.values())
+    levels = Preset.get("lod.levels")
+
+    if mode == "count":
+        level = sum(len(atoms) <= count for count in Preset.get("lod.counts"))
+
+        def choose(position, radius):
+            return level
+
+    elif mode == "screen":
+        pixels = Preset.get("lod.pixels")
+        camera = bpy.context.scene.camera if camera is None else camera.blender_object
+
+        def choose(position, radius):
+            return bisect_right(pixels, _projected_radius(position, radius, camera))
+
+    else:
+        raise ValueError(f"Unknown level of detail mode: {mode}")
+
+    report = {"before": 0, "after": 0, "saved": 0, "levels": [0] * len(levels)}
+    for atom in atoms:
+        report["before"] += render_triangles(atom.blender_object)
+        level = choose(Vector(atom.position), max(atom.blender_object.dimensions) / 2)
+        atom.set_resolution(
+            levels[level]["segments"],
+            levels[level]["rings"],
+            levels[level]["subdivision"],
+        )
+        report["after"] += render_triangles(atom.blender_object)
+        report["levels"][level] += 1
+
+    for bond in bonds:
+        report["before"] += render_triangles(bond.blender_object)
+        center = (Vector(bond.atom_a.position) + Vector(bond.atom_b.position)) / 2
+        level = choose(center, bond.thickness)
+        bond.set_resolution(levels[level]["sides"])
+        report["after"] += render_triangles(bond.blender_object)
+        report["levels"][level] += 1
+
+    report["saved"] = report["before"] - report["after"]
+    logging.info(
+        f"Level of detail: {report['before']} -> {report['after']} triangles "
+        f"({report['saved']} saved)."
+    )
+
+    return report
+
+
+def occluded(centers, depths, radii, pixel_radii, shape, shrink=0.95):
+    """
+    Finds the spheres fully hidden behind other spheres. The front surfaces of
+    all spheres are rasterized into a depth buffer and a sphere is occluded if
+    every pixel it covers holds a depth in front of its nearest point. The
+    test is conservative: occluders are shrunk (also by a pixel at their rim)
+    and the tested spheres are enlarged by a pixel. Spheres not covering any
+    pixel of the buffer are never occluded.
+
+    Parameters:
+    - centers (ndarray): The projected centers in pixels, shape (n, 2).
+    - depths (ndarray): The distances of the centers along the view direction.
+    - radii (ndarray): The radii of the spheres.
+    - pixel_radii (ndarray): The projected radii in pixels.
+    - shape (tuple): The shape (height, width) of the depth buffer.
+    - shrink (float): Factor applied to the occluders, accounts for the
+      facets of low resolution spheres.
+
+    Returns:
+    - ndarray: Whether each sphere is occluded.
+    """
+    height, width = shape
+    buffer = np.full(shape, np.inf)
+
+    def window(center, radius):
+        x_0, y_0 = np.maximum(np.floor(center - radius).astype(int), 0)
+        x_1, y_1 = np.ceil(center + radius).astype(int) + 1
+        x_1, y_1 = min(x_1, width), min(y_1, height)
+        # Squared distances of the pixel centers in units of the radius
+        dx = (np.arange(x_0, x_1) + 0.5 - center[0]) / radius
+        dy = (np.arange(y_0, y_1) + 0.5 - center[1]) / radius
+        distances = dx[None, :] ** 2 + dy[:, None] ** 2
+
+        return (slice(y_0, y_1), slice(x_0, x_1)), distances
+
+    for center, depth, radius, pixels in zip(centers, depths, radii, pixel_radii):
+        pixels = pixels * shrink
+        if pixels <= 1:
+            continue
+        area, distances = window(center, pixels)
+        covered = distances < ((pixels - 1) / pixels) ** 2
+        surface = depth - shrink * radius * np.sqrt(np.clip(1 - distances, 0, None))
+        np.minimum(buffer[area], np.where(covered, surface, np.inf), out=buffer[area])
+
+    hidden = np.zeros(len(centers), dtype=bool)
+    for i, (center, depth, radius, pixels) in enumerate(
+        zip(centers, depths, radii, pixel_radii)
+    ):
+        area, distances = window(center, pixels + 1)
+        depth_buffer = buffer[area][distances <= 1]
+        hidden[i] = depth_buffer.size > 0 and np.all(depth_buffer < depth - radius)
+
+    return hidden
+
+
+def _atom_list(atoms):
+    """
+    The atoms to work on, without the periodic images.
+
+    Args:
+        atoms (list[Atom] | Atoms | None): The atoms. None for all atoms.
+
+    Returns:
+        list[Atom]: The atoms.
+    """
+    # Delayed import to avoid circular import
+    from ..object.atom import Atom, Atoms
+
+    if atoms is None:
+        atoms = Atom.get("all")
+    elif isinstance(atoms, Atoms):
+        atoms = atoms.get("all")
+
+    return [atom for atom in atoms if isinstance(atom, Atom)]
+
+
+def _projected_radius(position, radius, camera):
+    """
+    Calculates the radius of a sphere in pixels of the rendered image.
+
+    Args:
+        position (Vector): The center of the sphere.
+        radius (float): The radius of the sphere.
+        camera (bpy.types.Object): The camera.
+
+    Returns:
+        float: The radius in pixels. 0 if the sphere is not in view.
+    """
+    scene = bpy.context.scene
+    width = scene.render.resolution_x * scene.render.resolution_percentage / 100
+    height = scene.render.resolution_y * scene.render.resolution_percentage / 100
+
+    right = (camera.matrix_world.to_3x3() @ Vector((1, 0, 0))).normalized()
+    center = world_to_camera_view(scene, camera, position)
+    edge = world_to_camera_view(scene, camera, position + radius * right)
+    if center.z <= 0:
+        # Behind the camera
+        return 0
+
+    pixels = hypot((edge.x - center.x) * width, (edge.y - center.y) * height)
+    x, y = center.x * width, center.y * height
+    if not (-pixels <= x <= width + pixels and -pixels <= y <= height + pixels):
+        return 0
+
+    return pixels
+
+
 def flip_normals(object):
     """
     Flips the normals of a mesh object.
@@ -341,6 +1233,7 @@ def flip_normals(object):
         bpy.ops.object.mode_set(mode="OBJECT")
 
 
+@span("read_cube")
 def read_cube(filename):
     """
     Reads a Gaussian cube file and returns the density data, origin, axes, and unit cell.
@@ -361,7 +1254,11 @@ def read_cube(filename):
         aux[i] = Vector([float(i) * units for i in axis])
 
     origin, x, y, z = aux
+    from ase.io.cube import read_cube_data
+
     data, atoms = read_cube_data(filename)
+    # Cube files store five significant digits, single precision is sufficient
+    data = data.astype(np.float32)
 
     return data, origin, (x, y, z), atoms.cell
 
@@ -416,6 +1313,8 @@ def get_console():
     Returns:
     - object: The Blender Python console object.
     """
+    import _console_python
+
     for window in bpy.context.window_manager.windows:
         for area in window.screen.areas:
             if area.type == "CONSOLE":
@@ -5,6 +5,7 @@ import bpy
 
 from ..utils import append_asset
 from .periodic_table import PeriodicTable
+from .profiling import span
 from .. import __default_directory__, __user_directory__
 
 
@@ -237,6 +238,7 @@ class Material:
         return bpy.data.materials.get(material) is not None
 
     @classmethod
+    @span("Material.load")
     def load(cls, name):
         """
         Load a material from material files. User file is preferred.
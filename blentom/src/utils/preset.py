@@ -1,3 +1,4 @@
+import logging
 from shutil import copy
 from os.path import exists
 from json import dump as jdump
@@ -14,13 +15,13 @@ class Preset:
 
     Attributes:
         preset (str): The currently selected preset.
-        presets (dict): A dictionary containing loaded presets.
+        presets (dict | None): A dictionary containing loaded presets. None until first used.
         presets_default_file (Path): The file with the default presets.
         presets_user_file (Path): The file containing the user presets.
     """
 
     preset = None
-    presets = {}
+    presets = None
     presets_default_file = __default_directory__ / "presets.json"
     presets_user_file = __user_directory__ / "presets_user.json"
 
@@ -31,7 +32,27 @@ class Preset:
         """
 
         cls.presets = Preset._read(user=False)
-        cls.presets = deep_dict_update(cls.presets, Preset._read(user=True))
+        user_presets = Preset._read(user=True)
+        cls._warn_renamed(user_presets)
+        cls.presets = deep_dict_update(cls.presets, user_presets)
+
+    @classmethod
+    def _warn_renamed(cls, presets):
+        """
+        Warns about settings of older versions that are no longer read.
+
+        Args:
+            presets (dict): The user presets.
+        """
+        for name, preset in presets.items():
+            remesh = preset.get("isosurface", {}).get("remesh")
+            if isinstance(remesh, dict) and "collapse_ratio" in remesh:
+                # A ratio of triangles has no fixed number of triangles
+                logging.warning(
+                    f'Preset "{name}": isosurface.remesh.collapse_ratio is ignored. '
+                    "Set isosurface.remesh.triangle_budget, the maximum number of "
+                    "triangles of an isosurface, instead."
+                )
 
     @classmethod
     def _read(cls, user=True):
@@ -74,7 +95,9 @@ class Preset:
             >>> Preset.get("camera.resolution", preset="default")
         """
         preset = Preset.preset if preset is None else preset
-        # Preset._reload_presets()
+        # Preset files are read on first use instead of on import
+        if Preset.presets is None:
+            Preset.reload()
 
         # Use default as backup if a property is not defined
         aux = Preset.presets["default"]
@@ -165,5 +188,4 @@ class Preset:
             copy(cls.presets_default_file, cls.presets_user_file)
 
 
-Preset.reload()
 Preset.preset = "default"
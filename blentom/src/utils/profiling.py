@@ -0,0 +1,315 @@
+import cProfile
+import threading
+import tracemalloc
+from contextlib import ContextDecorator
+from os import environ
+from time import perf_counter
+
+from .preset import Preset
+
+
+class Profiler:
+    """
+    Collects the wall time, call count and optionally the tracemalloc peak of
+    the profiling spans. A helper class not meant to be used directly, see
+    `span` and `profile`.
+
+    Profiling is enabled by the preset setting "profile.enabled" or the
+    environment variable BLENTOM_PROFILE ("1" or "memory"). Memory tracking is
+    enabled by "profile.memory" or BLENTOM_PROFILE=memory.
+
+    Every thread has its own stack of running spans. Spans of a background
+    thread, e.g. of a modal import, are children of the spans started in that
+    thread only. The memory peaks are process wide though.
+
+    Attributes:
+        enabled (bool | None): Overrides the preset and environment variable if not None.
+        memory (bool | None): Overrides the preset and environment variable if not None.
+        root (_Node): Root of the tree of collected spans.
+    """
+
+    enabled = None
+    memory = None
+    root = None
+    _local = threading.local()
+    _lock = threading.Lock()
+
+    @classmethod
+    def is_enabled(cls):
+        """
+        Whether spans are collected.
+
+        Returns:
+            bool: True if profiling is enabled.
+        """
+        if cls.enabled is not None:
+            return cls.enabled
+
+        return environ.get("BLENTOM_PROFILE", "0") not in ("", "0") or Preset.get(
+            "profile.enabled"
+        )
+
+    @classmethod
+    def tracks_memory(cls):
+        """
+        Whether the tracemalloc peak of the spans is collected.
+
+        Returns:
+            bool: True if memory tracking is enabled.
+        """
+        if cls.memory is not None:
+            return cls.memory
+
+        return environ.get("BLENTOM_PROFILE") == "memory" or Preset.get(
+            "profile.memory"
+        )
+
+    @classmethod
+    def reset(cls):
+        """
+        Discards all collected spans.
+        """
+        cls.root = _Node("Total")
+        # Fresh stacks for all threads
+        cls._local = threading.local()
+
+    @classmethod
+    def _stack(cls):
+        """
+        The running spans of the current thread.
+
+        Returns:
+            list: The running spans, the innermost last.
+        """
+        if not hasattr(cls._local, "stack"):
+            cls._local.stack = []
+
+        return cls._local.stack
+
+    @classmethod
+    def enter(cls, name):
+        """
+        Starts a span as child of the currently running span.
+
+        Args:
+            name (str): The name of the span.
+        """
+        stack = cls._stack()
+        if not stack:
+            if not cls.is_enabled():
+                # Keeps nested spans consistent if profiling is toggled
+                stack.append(None)
+                return
+            if cls.root is None:
+                cls.reset()
+                stack = cls._stack()
+            memory = cls.tracks_memory()
+            if memory and not tracemalloc.is_tracing():
+                tracemalloc.start()
+            parent = cls.root
+        elif stack[-1] is None:
+            stack.append(None)
+            return
+        else:
+            parent = stack[-1].node
+            memory = stack[-1].memory is not None
+
+        with cls._lock:
+            node = parent.child(name)
+        stack.append(_Frame(node, memory))
+
+    @classmethod
+    def exit(cls):
+        """
+        Ends the currently running span.
+        """
+        stack = cls._stack()
+        # Empty if the spans were reset while this one was running
+        frame = stack.pop() if stack else None
+        if frame is None:
+            return
+
+        elapsed = perf_counter() - frame.start
+        with cls._lock:
+            frame.node.calls += 1
+            frame.node.time += elapsed
+        if frame.memory is not None:
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, frame.peak)
+            frame.node.peak = max(frame.node.peak, peak - frame.memory)
+            if stack and stack[-1] is not None:
+                # Peak of the parent is lost by resetting it for this span
+                stack[-1].peak = max(stack[-1].peak, peak)
+
+
+class _Frame:
+    """
+    A running span.
+    """
+
+    def __init__(self, node, memory):
+        self.node = node
+        self.memory = None
+        self.peak = 0
+        if memory:
+            self.memory, self.peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+        self.start = perf_counter()
+
+
+class _Node:
+    """
+    Accumulated measurements of a span at one place of the span hierarchy.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.time = 0
+        self.peak = 0
+        self.children = {}
+
+    def child(self, name):
+        if name not in self.children:
+            self.children[name] = _Node(name)
+
+        return self.children[name]
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "time": self.time,
+            "peak": self.peak,
+            "children": {
+                name: child.as_dict() for name, child in self.children.items()
+            },
+        }
+
+
+class span(ContextDecorator):
+    """
+    Measures a block of code or, used as decorator, every call of a function
+    if profiling is enabled. Spans started inside other spans are reported as
+    their children.
+
+    Examples:
+        >>> with span("Bonds"):
+        >>>     atoms.create_bonds()
+        >>> @span("Atom")
+        >>> def __init__(self, element="X"):
+    """
+
+    def __init__(self, name):
+        """
+        Args:
+            name (str): The name of the span in the report.
+        """
+        self.name = name
+
+    def __enter__(self):
+        Profiler.enter(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        Profiler.exit()
+        return False
+
+
+class Report:
+    """
+    Hierarchical report of the collected profiling spans.
+
+    Used as context manager, profiling is enabled inside the block, the
+    previously collected spans are discarded and the report is printed at the
+    end.
+    """
+
+    def __init__(self, filename=None, memory=None):
+        """
+        Args:
+            filename (str | Path | None): If given, a cProfile of the block is written to this file.
+            memory (bool | None): Whether to collect tracemalloc peaks inside the block. Default: Preset value.
+        """
+        self.filename = filename
+        self.memory = memory
+        self._profile = None
+        self._previous = None
+
+    def __enter__(self):
+        self._previous = (Profiler.enabled, Profiler.memory, tracemalloc.is_tracing())
+        Profiler.reset()
+        Profiler.enabled = True
+        Profiler.memory = self.memory
+        if self.filename is not None:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+        return self
+
+    def __exit__(self, *exc):
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile.dump_stats(str(self.filename))
+            self._profile = None
+        Profiler.enabled, Profiler.memory, tracing = self._previous
+        if not tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        print(self)
+
+        return False
+
+    @property
+    def data(self):
+        """
+        The collected spans.
+
+        Returns:
+            dict: Nested dictionary with "calls", "time" (s), "peak" (bytes) and "children" per span.
+        """
+        if Profiler.root is None:
+            return {}
+
+        return Profiler.root.as_dict()["children"]
+
+    def __str__(self):
+        lines = [
+            f"{'Span':<40}{'Calls':>8}{'Total [s]':>12}{'Own [s]':>12}{'Peak [MB]':>12}"
+        ]
+        nodes = [] if Profiler.root is None else list(Profiler.root.children.values())
+        stack = [(node, 0) for node in reversed(nodes)]
+        while stack:
+            node, depth = stack.pop()
+            own = node.time - sum(child.time for child in node.children.values())
+            peak = f"{node.peak / 2**20:>12.1f}" if node.peak else ""
+            lines.append(
+                f"{'  ' * depth + node.name:<40}{node.calls:>8}"
+                f"{node.time:>12.3f}{own:>12.3f}{peak}"
+            )
+            stack.extend((child, depth + 1) for child in reversed(node.children.values()))
+
+        return "\n".join(lines)
+
+
+def profile(filename=None, memory=None):
+    """
+    Returns the report of the profiling spans around the import pipeline
+    (parsing, atom and bond creation, material loading, isosurfaces).
+
+    Spans are only collected if profiling is enabled via the preset setting
+    "profile.enabled" or the environment variable BLENTOM_PROFILE. Used as
+    context manager, profiling is enabled for the block.
+
+    Args:
+        filename (str | Path | None): Context manager only. Writes a cProfile of the block to this file.
+        memory (bool | None): Context manager only. Whether to collect tracemalloc peaks. Default: Preset value.
+
+    Returns:
+        Report: The report. Printing it shows the hierarchy of spans.
+
+    Examples:
+        >>> with profile("import.prof"):
+        >>>     Atoms.read("POSCAR")
+        >>> # Report of everything collected so far
+        >>> print(profile())
+    """
+    return Report(filename, memory)
@@ -0,0 +1,407 @@
+import logging
+import os
+import subprocess
+import threading
+from copy import deepcopy
+from json import dump as jdump
+from json import load as jload
+from os import cpu_count, getpid
+from pathlib import Path
+from socket import gethostname
+from tempfile import mkdtemp
+from time import perf_counter, sleep, time, time_ns
+from uuid import uuid4
+
+import bpy
+
+from .batch import _run_job, register_headless
+from .utils import deep_dict_update
+
+
+class RenderQueue:
+    """
+    A work queue of render jobs shared through the filesystem. Every item is a
+    JSON file moving between the directories "pending", "claimed", "done" and
+    "failed". Items are claimed by renaming them, which is atomic, so any
+    number of workers, also on different machines sharing the directory, can
+    work on the same queue. Workers refresh the modification time of their
+    claims as heartbeat, claims not refreshed for too long can be expired.
+
+    Attributes:
+        directory (Path): The directory of the queue.
+    """
+
+    states = ("pending", "claimed", "done", "failed")
+
+    def __init__(self, directory):
+        """
+        Opens the queue, creating its directories if necessary.
+
+        Args:
+            directory (str | Path): The directory of the queue.
+        """
+        self.directory = Path(directory)
+        for state in RenderQueue.states:
+            (self.directory / state).mkdir(parents=True, exist_ok=True)
+
+    def put(self, job, retries=2):
+        """
+        Adds a job to the pending items.
+
+        Args:
+            job (dict): The job, see `run_batch`. Paths should be absolute.
+            retries (int): How often the job is retried after failing.
+
+        Returns:
+            str: The name of the item.
+        """
+        # Sorting by name processes the items in order of insertion
+        name = f"{time_ns():020d}-{uuid4().hex[:8]}.json"
+        item = {"job": job, "retries": retries, "attempts": 0, "errors": []}
+        self._write(self.directory / "pending" / name, item)
+
+        return name
+
+    def items(self, state):
+        """
+        The items of a state.
+
+        Args:
+            state (str): One of "pending", "claimed", "done" and "failed".
+
+        Returns:
+            list[Path]: The items in order of insertion.
+        """
+        return sorted(
+            (self.directory / state).glob("*.json"), key=lambda p: self._name(p)
+        )
+
+    def claim(self, worker):
+        """
+        Claims the oldest pending item for a worker.
+
+        Args:
+            worker (str): The name of the worker.
+
+        Returns:
+            Path | None: The claimed item or None if no item is pending.
+        """
+        for path in self.items("pending"):
+            claimed = self.directory / "claimed" / f"{worker}~{path.name}"
+            try:
+                os.rename(path, claimed)
+            except FileNotFoundError:
+                # Claimed by another worker in the meantime
+                continue
+            # Renaming keeps the time the item was put
+            self.refresh(claimed)
+
+            return claimed
+
+        return None
+
+    def refresh(self, claimed):
+        """
+        Refreshes the heartbeat of a claimed item.
+
+        Args:
+            claimed (Path): The claimed item.
+        """
+        try:
+            os.utime(claimed)
+        except FileNotFoundError:
+            # Expired in the meantime
+            pass
+
+    def finish(self, claimed, result):
+        """
+        Moves a claimed item to the done items. Nothing happens if the claim
+        expired in the meantime, the item is then handled again.
+
+        Args:
+            claimed (Path): The claimed item.
+            result (dict): Information about the execution, e.g. timings.
+        """
+        try:
+            item = RenderQueue.read(claimed)
+        except FileNotFoundError:
+            logging.warning(f"The claim {claimed.name} expired.")
+            return
+        item["result"] = result
+        self._write(self.directory / "done" / self._name(claimed), item)
+        claimed.unlink()
+
+    def fail(self, claimed, error):
+        """
+        Moves a claimed item back to the pending items or, if it has no
+        retries left, to the failed items. Nothing happens if the claim
+        expired in the meantime.
+
+        Args:
+            claimed (Path): The claimed item.
+            error (str): Description of the failure.
+        """
+        try:
+            item = RenderQueue.read(claimed)
+        except FileNotFoundError:
+            logging.warning(f"The claim {claimed.name} expired.")
+            return
+        item["attempts"] += 1
+        item["errors"].append(error)
+        state = "pending" if item["attempts"] <= item["retries"] else "failed"
+        self._write(self.directory / state / self._name(claimed), item)
+        claimed.unlink(missing_ok=True)
+
+    def release(self, worker):
+        """
+        Fails all items claimed by a worker, e.g. after it crashed.
+
+        Args:
+            worker (str): The name of the worker.
+        """
+        for claimed in self.items("claimed"):
+            if claimed.name.split("~", 1)[0] == worker:
+                self.fail(claimed, f"Worker {worker} exited unexpectedly.")
+
+    def expire(self, timeout, alive=()):
+        """
+        Fails all claims whose heartbeat is older than 'timeout', e.g. of a
+        worker that died on another machine or of an earlier aborted run.
+
+        Args:
+            timeout (float): Time (s) after which a claim expires.
+            alive (Iterable[str]): Workers known to be running, their claims never expire.
+        """
+        now = time()
+        for claimed in self.items("claimed"):
+            worker = claimed.name.split("~", 1)[0]
+            if worker in alive:
+                continue
+            try:
+                age = now - claimed.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if age > timeout:
+                self.fail(claimed, f"Claim of {worker} expired after {age:.0f}s.")
+
+    @classmethod
+    def read(cls, path):
+        """
+        Reads an item.
+
+        Args:
+            path (Path): The item.
+
+        Returns:
+            dict: The item with "job", "retries", "attempts", "errors" and, if done, "result".
+        """
+        with open(path) as file:
+            return jload(file)
+
+    def _write(self, path, item):
+        # Written next to the queue and moved, so no item is ever seen half written
+        temporary = self.directory / f".{uuid4().hex}.tmp"
+        with open(temporary, "w") as file:
+            jdump(item, file, indent=4)
+        os.replace(temporary, path)
+
+    @classmethod
+    def _name(cls, path):
+        return path.name.split("~", 1)[-1]
+
+
+def work(directory, threads=0, worker=None, heartbeat=30):
+    """
+    Renders the items of a queue until no item is pending. Consecutive items
+    of the same input reuse the imported scene. The add-on is registered
+    first if Blender did not, like in `run_batch`.
+
+    The claimed item is refreshed every 'heartbeat' seconds from a
+    background thread. Python threads are paused while Blender runs an
+    operator, so a render itself does not refresh it.
+
+    Args:
+        directory (str | Path): The directory of the queue.
+        threads (int): Number of Cycles CPU threads. Default: 0. Automatic detection by Blender.
+        worker (str | None): The name of the worker. Default: Host name and process id.
+        heartbeat (float): Interval (s) of the heartbeat. Default: 30.
+
+    Returns:
+        int: The number of rendered items.
+    """
+    register_headless()
+    queue = RenderQueue(directory)
+    worker = f"{gethostname()}-{getpid()}" if worker is None else worker
+    if threads:
+        bpy.context.scene.render.threads_mode = "FIXED"
+        bpy.context.scene.render.threads = threads
+
+    count = 0
+    scene = None
+    while (claimed := queue.claim(worker)) is not None:
+        job = RenderQueue.read(claimed)["job"]
+        timings = {}
+        stop = threading.Event()
+        threading.Thread(
+            target=_heartbeat, args=(queue, claimed, stop, heartbeat), daemon=True
+        ).start()
+        try:
+            scene = _run_job(job, Path(), timings, scene)
+        except Exception as error:
+            logging.exception(f"{worker}: {job['input']} failed.")
+            scene = None
+            queue.fail(claimed, repr(error))
+            continue
+        finally:
+            stop.set()
+
+        logging.info(f"{worker}: {job['output']} done in {timings['total']:.2f}s.")
+        queue.finish(claimed, {"worker": worker, "timings": timings})
+        count += 1
+
+    return count
+
+
+def _heartbeat(queue, claimed, stop, interval):
+    while not stop.wait(interval):
+        queue.refresh(claimed)
+
+
+def render_pool(
+    manifest, workers=2, threads=None, queue=None, retries=2, claim_timeout=3600
+):
+    """
+    Renders the jobs of a manifest with several background Blender processes
+    working on a shared file-based queue. Crashed workers are replaced and
+    their items retried. Items claimed by other workers, e.g. on other
+    machines or left behind by an earlier aborted run in the same queue, are
+    retried once their claim expires.
+
+    Jobs may set "frames": [first, last] to render every frame of an
+    animation as an item of its own. "{frame}" in the output is replaced by
+    the frame number, otherwise it is appended to the file name.
+
+    Further workers, e.g. on other machines sharing the queue directory under
+    the same path, can join with `work` or
+    "blentom_batch.py -- --worker --queue DIRECTORY".
+
+    Args:
+        manifest (str | Path | dict): The manifest file or its content, see `run_batch`.
+        workers (int): Number of Blender processes. Default: 2.
+        threads (int | None): Cycles CPU threads per worker. Default: None. The cores divided by the workers.
+        queue (str | Path | None): The directory of the queue. Default: None. A temporary directory.
+        retries (int): How often a failing item is retried. Default: 2.
+        claim_timeout (float): Time (s) without heartbeat after which a claim of a worker not started by this pool expires. Must exceed the longest render of an item. Default: 3600.
+
+    Returns:
+        list[dict]: The done and failed items, see `RenderQueue.read`.
+    """
+    if isinstance(manifest, dict):
+        directory = Path.cwd()
+    else:
+        directory = Path(manifest).resolve().parent
+        with open(manifest) as file:
+            manifest = jload(file)
+
+    if threads is None:
+        threads = max(1, (cpu_count() or 1) // workers)
+    queue = RenderQueue(mkdtemp(prefix="blentom_queue_") if queue is None else queue)
+    (queue.directory / "logs").mkdir(exist_ok=True)
+
+    for job in manifest["jobs"]:
+        job = deep_dict_update(deepcopy(manifest.get("defaults", {})), job)
+        job["input"] = str(directory / job["input"])
+        job["output"] = str(directory / job["output"])
+        for item in _expand_frames(job):
+            queue.put(item, retries=retries)
+
+    start = perf_counter()
+    processes = {}
+    while True:
+        for name, process in list(processes.items()):
+            if process.poll() is not None:
+                del processes[name]
+                if process.returncode != 0:
+                    logging.warning(f"Worker {name} exited with {process.returncode}.")
+                    queue.release(name)
+        queue.expire(claim_timeout, alive=processes)
+
+        pending = len(queue.items("pending"))
+        if not pending and not processes and not queue.items("claimed"):
+            break
+
+        while len(processes) < min(workers, pending):
+            name = f"{gethostname()}-{getpid()}-{uuid4().hex[:8]}"
+            processes[name] = _start_worker(queue.directory, threads, name)
+        sleep(0.5)
+
+    done = [RenderQueue.read(path) for path in queue.items("done")]
+    failed = [RenderQueue.read(path) for path in queue.items("failed")]
+    logging.info(
+        f"{len(done)}/{len(done) + len(failed)} items done in "
+        f"{perf_counter() - start:.2f}s with {workers} workers."
+    )
+
+    return done + failed
+
+
+def _expand_frames(job):
+    """
+    Splits a job with "frames" into one job per frame.
+
+    Args:
+        job (dict): The job.
+
+    Returns:
+        list[dict]: The jobs.
+    """
+    if "frames" not in job:
+        return [job]
+
+    first, last = job.pop("frames")
+    jobs = []
+    for frame in range(first, last + 1):
+        output = Path(job["output"])
+        if "{frame" in job["output"]:
+            output = job["output"].format(frame=frame)
+        else:
+            output = output.with_name(f"{output.stem}_{frame:04d}{output.suffix}")
+        jobs.append({**job, "frame": frame, "output": str(output)})
+
+    return jobs
+
+
+def _start_worker(directory, threads, name):
+    """
+    Starts a background Blender process working on a queue.
+
+    Args:
+        directory (Path): The directory of the queue.
+        threads (int): Number of Cycles CPU threads.
+        name (str): The name of the worker.
+
+    Returns:
+        Popen: The process.
+    """
+    # The add-on is importable from the parent directory of its package
+    root = Path(__file__).resolve().parents[3]
+    package = __package__.rsplit(".src", 1)[0]
+    expression = (
+        f"import sys; sys.path.insert(0, {str(root)!r}); import logging; "
+        f"logging.basicConfig(level=logging.INFO, force=True); "
+        f"from {package}.src.utils.render_pool import work; "
+        f"work({str(directory)!r}, threads={threads}, worker={name!r})"
+    )
+    with open(directory / "logs" / f"{name}.log", "w") as log:
+        return subprocess.Popen(
+            [
+                bpy.app.binary_path,
+                "--background",
+                "--python-exit-code",
+                "1",
+                "--python-expr",
+                expression,
+            ],
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
@@ -0,0 +1,82 @@
+"""
+Headless batch rendering driven by a job manifest.
+
+Run with:
+    blender --background --python blentom_batch.py -- manifest.json [options]
+
+All jobs of the manifest are rendered in this single Blender process. See
+`blentom.run_batch` for the format of the manifest. With --workers the jobs
+are rendered by several background Blender processes instead, see
+`blentom.render_pool`.
+
+Options:
+    --report FILE       Write the status and timings of every job as JSON.
+    --quiet             Only log failed jobs.
+    --workers INT       Number of Blender worker processes.
+    --threads INT       Cycles CPU threads per worker. Default: Cores divided by workers.
+    --queue DIR         Directory of the work queue. Default: A temporary directory.
+    --retries INT       How often a failing job is retried by the workers. Default: 2
+    --claim-timeout S   Time after which a job claimed by a vanished worker is retried. Default: 3600
+    --worker            Only work on the existing queue given by --queue.
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from blentom import render_pool, run_batch, work  # noqa: E402
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="blentom_batch.py")
+    parser.add_argument("manifest", type=Path, nargs="?")
+    parser.add_argument("--report", type=Path, default=None)
+    parser.add_argument("--quiet", action="store_true")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--queue", type=Path, default=None)
+    parser.add_argument("--retries", type=int, default=2)
+    parser.add_argument("--claim-timeout", type=float, default=3600)
+    parser.add_argument("--worker", action="store_true")
+    args = parser.parse_args(argv)
+    if args.worker and args.queue is None:
+        parser.error("--worker requires --queue")
+    if not args.worker and args.manifest is None:
+        parser.error("the manifest is required")
+
+    logging.basicConfig(
+        level=logging.WARNING if args.quiet else logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s",
+        force=True,
+    )
+
+    if args.worker:
+        work(args.queue, threads=args.threads or 0)
+        return 0
+
+    if args.workers is None:
+        results = run_batch(args.manifest)
+        failed = any(result["status"] == "failed" for result in results)
+    else:
+        results = render_pool(
+            args.manifest,
+            workers=args.workers,
+            threads=args.threads,
+            queue=args.queue,
+            retries=args.retries,
+            claim_timeout=args.claim_timeout,
+        )
+        failed = any("result" not in item for item in results)
+
+    if args.report is not None:
+        args.report.write_text(json.dumps(results, indent=4))
+
+    return int(failed)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []))
@@ -0,0 +1,28 @@
+from pathlib import Path
+
+import pytest
+
+bpy = pytest.importorskip("bpy")
+
+import blentom  # noqa: E402
+
+DATA = Path(__file__).resolve().parent.parent / "demo" / "data"
+
+
+def test_cube_job(tmp_path):
+    # Like in blentom_batch.py, the add-on is imported but not registered
+    output = tmp_path / "benzene.png"
+    job = {
+        "input": str(DATA / "benzene_HOMO-6.cube"),
+        "output": str(output),
+        "format": "cube",
+        "quality": "medium",
+        "camera": {"resolution": [32, 32]},
+        "isosurface": {"level": 0.02},
+    }
+
+    (result,) = blentom.run_batch({"jobs": [job]})
+
+    assert result["status"] == "done", result["error"]
+    assert "isosurface" in result["timings"]
+    assert output.is_file()
@@ -0,0 +1,81 @@
+import importlib.util
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+CUBE = ROOT / "demo" / "data" / "benzene_HOMO-6.cube"
+
+# Loaded from its file, so Blender is not required
+spec = importlib.util.spec_from_file_location(
+    "cache", ROOT / "blentom" / "src" / "io" / "cache.py"
+)
+cache = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(cache)
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        content = self.server.files.get(self.path)
+        if content is None:
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    # Like the download links of a database, without file suffix
+    server.files = {"/download?id=7": CUBE.read_bytes()}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cached(server, tmp_path):
+    url = f"http://127.0.0.1:{server.server_address[1]}/download?id=7"
+    return cache.DownloadCache(tmp_path).get(url)
+
+
+def test_url_without_suffix(cached):
+    assert cached.suffix == ""
+    assert cached.read_bytes() == CUBE.read_bytes()
+
+
+def test_url_without_suffix_needs_format(cached):
+    ase_io = pytest.importorskip("ase.io")
+
+    # The format cannot be guessed from the name of the cached file
+    with pytest.raises(Exception):
+        ase_io.read(cached)
+    atoms = ase_io.read(cached, format="cube")
+    assert atoms.get_chemical_formula() == ase_io.read(CUBE).get_chemical_formula()
+
+
+def test_url_without_suffix_prepared(cached):
+    pytest.importorskip("bpy")
+    from blentom.src.io.modal import prepare_cube
+
+    # The arguments DatabaseImport passes for the density
+    atoms, surfaces = prepare_cube(
+        lambda fraction, text: None,
+        str(cached),
+        "benzene",
+        density={"level": 0.02, "format": ".cube"},
+    )
+
+    assert len(atoms["frames"][0]) == 12
+    assert len(surfaces) == 2
@@ -0,0 +1,57 @@
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pytest
+from scipy.interpolate import RegularGridInterpolator
+from scipy.sparse.linalg import spsolve
+
+# Loaded from its file, so Blender is not required
+spec = importlib.util.spec_from_file_location(
+    "interpolation",
+    Path(__file__).parent.parent / "blentom" / "src" / "utils" / "interpolation.py",
+)
+interpolation = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(interpolation)
+
+SHAPE = (23, 19, 27)
+
+
+@pytest.fixture
+def density():
+    x, y, z = np.meshgrid(
+        np.linspace(-1, 1, 12),
+        np.linspace(-1, 1, 10),
+        np.linspace(-1, 1, 14),
+        indexing="ij",
+    )
+    return np.exp(-3 * (x**2 + 2 * y**2 + z**2)) * np.cos(4 * x + y)
+
+
+def quintic(density, shape, **kwargs):
+    axes = [np.linspace(-1, 1, n) for n in density.shape]
+    points = np.meshgrid(*[np.linspace(-1, 1, n) for n in shape], indexing="ij")
+    interpolator = RegularGridInterpolator(axes, density, method="quintic", **kwargs)
+    return interpolator(np.stack(points, axis=-1))
+
+
+def test_spline_is_the_exactly_solved_quintic_interpolant(density):
+    scaled = interpolation.spline_upsample(density, SHAPE, order=5)
+
+    reference = quintic(density, SHAPE, solver=spsolve)
+    assert np.abs(scaled - reference).max() < 1e-6
+
+
+def test_quintic_differs_by_its_solver_tolerance(density):
+    scaled = interpolation.spline_upsample(density, SHAPE, order=5)
+
+    difference = np.abs(scaled - interpolation.quintic_upsample(density, SHAPE))
+    assert difference.max() < 1e-3 * np.abs(density).max()
+
+
+@pytest.mark.parametrize("method", ["fft", "spline", "quintic"])
+def test_memory_budget_keeps_the_result(density, method):
+    unlimited = interpolation.upsample(density, SHAPE, method=method)
+    limited = interpolation.upsample(density, SHAPE, method=method, memory_budget=1)
+
+    np.testing.assert_array_equal(limited, unlimited)
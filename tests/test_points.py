@@ -0,0 +1,47 @@
+from time import perf_counter
+
+import numpy as np
+import pytest
+
+bpy = pytest.importorskip("bpy")
+
+from blentom import PointAtoms  # noqa: E402
+
+
+def bond_count(atoms):
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    evaluated = atoms.blender_object.evaluated_get(depsgraph)
+    mesh = evaluated.to_mesh()
+    # Every bond is made of two tubes with two rings of vertices each
+    count = len(mesh.vertices) // (4 * atoms.bond_sides)
+    evaluated.to_mesh_clear()
+
+    return count
+
+
+def test_large_structure_bonds():
+    # Simple cubic carbon with only the nearest neighbours within the cutoff
+    n = 22
+    grid = np.stack(np.meshgrid(*[np.arange(n)] * 3, indexing="ij"), axis=-1)
+    positions = 1.4 * grid.reshape(-1, 3)
+    atoms = PointAtoms(["C"] * len(positions), positions, name="Lattice")
+    atoms.bond_sides = 4
+
+    start = perf_counter()
+    count = bond_count(atoms)
+    duration = perf_counter() - start
+
+    assert count == 3 * n**2 * (n - 1)
+    # Testing every pair of the 10648 atoms takes minutes
+    assert duration < 30
+
+
+def test_bonds_follow_positions():
+    atoms = PointAtoms(["H", "H", "O"], [[0, 0, 0], [0.7, 0, 0], [5, 0, 0]])
+    assert bond_count(atoms) == 1
+
+    atoms.positions = [[0, 0, 0], [5, 0, 0], [5.9, 0, 0]]
+    assert bond_count(atoms) == 1
+
+    atoms.positions = [[0, 0, 0], [3, 0, 0], [6, 0, 0]]
+    assert bond_count(atoms) == 0